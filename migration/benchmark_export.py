@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+[제품표준서 분석 성능 측정 도구]
+
+synthetic_workbooks.py로 만든 합성 워크북으로 export_to_csv.py의 분석 성능을 측정합니다.
+실제 제품표준서 없이도 분석기 변경 전후의 성능을 비교할 수 있습니다.
+
+측정 항목 (파일 수별):
+- files/s, MB/s (분석 + CSV 저장 전체 기준)
+- 파일별 분석 시간 p50 / p99 (parse_excel_to_dict 한 번의 시간)
+- 최대 메모리 사용량 (peak RSS)
+
+파일 수마다 별도 프로세스에서 측정하므로 최대 메모리 사용량이 서로 섞이지 않습니다.
+캐시(매니페스트/워크북 캐시)는 사용하지 않고 매번 엑셀을 직접 분석합니다.
+
+사용법:
+    python benchmark_export.py
+    python benchmark_export.py --sizes 100 1000 10000 --data-dir bench_data --output bench.json
+"""
+
+import argparse
+import json
+import math
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic_workbooks import generate_corpus
+
+DEFAULT_SIZES = [100, 1000, 10000]
+
+
+def percentile(values: list, pct: float) -> float:
+    """정렬된 값 목록의 백분위수 (nearest-rank 방식)"""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 메모리 사용량(MB). 측정할 수 없으면 None."""
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS는 바이트, Linux는 KB 단위
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def run_one(files: list) -> dict:
+    """
+    현재 프로세스에서 파일 목록을 분석하고 CSV로 저장하며 측정한 결과를 반환합니다.
+    export_to_csv를 여기서 불러오므로 측정 대상 코드는 항상 현재 작업 트리의 것입니다.
+    """
+    import export_to_csv
+
+    total_bytes = sum(path.stat().st_size for path in files)
+    latencies = []
+    all_data = []
+    errors = 0
+
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    for path in files:
+        t0 = time.perf_counter()
+        try:
+            all_data.append(export_to_csv.parse_excel_to_dict(str(path)))
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - t0)
+
+    normal_data, duplicate_data = export_to_csv.split_duplicates(all_data)
+    with tempfile.TemporaryDirectory() as tmp:
+        export_to_csv.export_to_csv(normal_data, Path(tmp))
+        export_to_csv.export_to_csv(duplicate_data, Path(tmp), prefix="duplicates_")
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+
+    latencies.sort()
+    peak = peak_rss_mb()
+    return {
+        "files": len(files),
+        "errors": errors,
+        "megabytes": round(total_bytes / (1024 * 1024), 2),
+        "elapsed_s": round(elapsed, 3),
+        "cpu_s": round(cpu, 3),
+        "files_per_s": round(len(files) / elapsed, 1) if elapsed else None,
+        "mb_per_s": round(total_bytes / (1024 * 1024) / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "peak_rss_mb": round(peak, 1) if peak is not None else None,
+    }
+
+
+def print_table(results: list):
+    header = f"{'files':>7} {'files/s':>9} {'MB/s':>7} {'p50 ms':>8} {'p99 ms':>8} {'peak MB':>8} {'errors':>6}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        peak = f"{r['peak_rss_mb']:.1f}" if r["peak_rss_mb"] is not None else "-"
+        print(
+            f"{r['files']:>7} {r['files_per_s']:>9} {r['mb_per_s']:>7} "
+            f"{r['p50_ms']:>8} {r['p99_ms']:>8} {peak:>8} {r['errors']:>6}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="제품표준서 분석 성능 측정 도구")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="측정할 파일 수 목록 (기본 100 1000 10000)",
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=str,
+        default="bench_data",
+        help="합성 워크북 폴더 (없는 파일만 새로 생성)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="합성 워크북 seed")
+    parser.add_argument("--output", type=str, help="측정 결과를 저장할 JSON 파일")
+    # 내부용: 파일 수 하나를 별도 프로세스에서 측정
+    parser.add_argument("--run-one", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+
+    if args.run_one:
+        files = sorted(data_dir.glob("*.xls"))[: args.run_one]
+        print(json.dumps(run_one(files)))
+        return
+
+    print(f"합성 워크북 준비 중: {data_dir.absolute()} ({max(args.sizes)}개)")
+    generate_corpus(data_dir, max(args.sizes), fmt="xls", seed=args.seed)
+
+    results = []
+    for size in args.sizes:
+        print(f"측정 중: {size}개 파일...")
+        proc = subprocess.run(
+            [
+                sys.executable,
+                str(Path(__file__).resolve()),
+                "--run-one",
+                str(size),
+                "--data-dir",
+                str(data_dir.absolute()),
+            ],
+            cwd=str(Path(__file__).resolve().parent),
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+        )
+        if proc.returncode != 0:
+            print(proc.stderr)
+            sys.exit(proc.returncode)
+        # 분석 중 로그가 섞일 수 있으므로 마지막 줄(JSON)만 사용
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print()
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
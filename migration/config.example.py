@@ -10,3 +10,8 @@ OUTPUT_DIR = "csv_output"
 
 # 로그 파일 경로
 LOG_FILE = "csv_export.log"
+
+# 공유 워크북 캐시 폴더 (선택, 기본값: 사용자 폴더의 ~/.cache/riselab/workbook_cache)
+# 원본 워크북 내용이 그대로 저장되므로 저장소 밖의 폴더를 지정하세요.
+# extract_product_standard_fields.py 등 다른 도구와 같은 캐시를 쓰려면 같은 폴더를 지정하세요.
+# WORKBOOK_CACHE_DIR = r"C:\Users\<사용자>\.cache\riselab\workbook_cache"
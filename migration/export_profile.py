@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+[변환 성능 계측 모듈]
+
+export_to_csv.py --profile 실행 시 파일별/단계별 경과시간(wall)과 CPU 시간을 기록하고,
+가장 느린 파일 목록과 단계별 합계를 담은 보고서(JSON/CSV)를 만듭니다.
+
+단계:
+    open           : 워크북 열기, '입력란' 시트 읽기
+    input_sheet    : '입력란' 기본 정보/BOM/QC 추출
+    allergen       : 알러젠 검색 (고정 위치에 없으면 시트 전체 라벨 검색)
+    standard_sheet : '제품표준서' 시트 읽기 및 추출
+    csv_write      : CSV 기록 (스트리밍 모드는 파일별, 기본 모드는 전체 합계만)
+
+allergen_fallback은 알러젠이 고정 위치에 없어 시트 전체 라벨 검색이 일어났는지 여부입니다.
+"""
+
+import csv
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PHASES = ["open", "input_sheet", "allergen", "standard_sheet", "csv_write"]
+
+PROFILE_JSON_FILENAME = "export_profile.json"
+PROFILE_CSV_FILENAME = "export_profile.csv"
+
+
+class PhaseTimer:
+    """단계별 wall/CPU 시간을 누적합니다. 프로세스 풀 작업자에서도 사용합니다."""
+
+    enabled = True
+
+    def __init__(self):
+        self.phases = {}
+        self.allergen_fallback = False
+
+    @contextmanager
+    def phase(self, name: str):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = self.phases.get(name, (0.0, 0.0))
+            self.phases[name] = (
+                wall + time.perf_counter() - wall_start,
+                cpu + time.process_time() - cpu_start,
+            )
+
+    def record(self) -> dict:
+        """작업자 프로세스에서 메인 프로세스로 넘길 수 있는 단순한 dict로 변환합니다."""
+        return {
+            "phases": dict(self.phases),
+            "allergen_fallback": self.allergen_fallback,
+        }
+
+
+class _NullTimer:
+    """계측을 하지 않을 때 사용하는 빈 타이머"""
+
+    enabled = False
+    allergen_fallback = False
+
+    @contextmanager
+    def phase(self, name: str):
+        yield
+
+
+NULL_TIMER = _NullTimer()
+
+
+class ProfileReport:
+    """파일별 계측 결과를 모아 보고서를 만듭니다."""
+
+    def __init__(self, top: int = 20):
+        self.top = top
+        self.files = []
+        # 특정 파일에 속하지 않는 단계 (예: 기본 모드의 CSV 일괄 저장)
+        self.batch = PhaseTimer()
+
+    def add(
+        self,
+        filename: str,
+        record: dict = None,
+        from_cache: bool = False,
+        error: str = None,
+    ):
+        """파일 하나의 계측 결과를 추가합니다. (캐시 사용 파일은 단계 시간이 없음)"""
+        phases = dict(record["phases"]) if record else {}
+        self.files.append(
+            {
+                "file": filename,
+                "from_cache": from_cache,
+                "error": error,
+                "allergen_fallback": bool(record and record["allergen_fallback"]),
+                "phases": phases,
+            }
+        )
+
+    @contextmanager
+    def file_phase(self, name: str):
+        """마지막으로 추가한 파일에 단계 시간을 더합니다. (예: 스트리밍 모드 CSV 기록)"""
+        timer = PhaseTimer()
+        with timer.phase(name):
+            yield
+        phases = self.files[-1]["phases"]
+        wall, cpu = timer.phases[name]
+        old_wall, old_cpu = phases.get(name, (0.0, 0.0))
+        phases[name] = (old_wall + wall, old_cpu + cpu)
+
+    @staticmethod
+    def _total(phases: dict) -> tuple:
+        return (
+            sum(wall for wall, _ in phases.values()),
+            sum(cpu for _, cpu in phases.values()),
+        )
+
+    def summary(self) -> dict:
+        """단계별 합계와 비율, 알러젠 전체 검색 건수 등 요약"""
+        totals = {name: [0.0, 0.0] for name in PHASES}
+        for entry in self.files + [{"phases": self.batch.phases}]:
+            for name, (wall, cpu) in entry["phases"].items():
+                total = totals.setdefault(name, [0.0, 0.0])
+                total[0] += wall
+                total[1] += cpu
+        grand_wall = sum(wall for wall, _ in totals.values())
+        return {
+            "files": len(self.files),
+            "parsed": sum(1 for f in self.files if not f["from_cache"]),
+            "from_cache": sum(1 for f in self.files if f["from_cache"]),
+            "errors": sum(1 for f in self.files if f["error"]),
+            "allergen_fallback": sum(1 for f in self.files if f["allergen_fallback"]),
+            "wall_s": round(grand_wall, 4),
+            "phases": {
+                name: {
+                    "wall_s": round(wall, 4),
+                    "cpu_s": round(cpu, 4),
+                    "share": round(wall / grand_wall, 4) if grand_wall else 0.0,
+                }
+                for name, (wall, cpu) in totals.items()
+            },
+        }
+
+    def _rows(self) -> list:
+        rows = []
+        for entry in self.files:
+            wall, cpu = self._total(entry["phases"])
+            row = {
+                "file": entry["file"],
+                "from_cache": entry["from_cache"],
+                "error": entry["error"] or "",
+                "allergen_fallback": entry["allergen_fallback"],
+                "wall_s": round(wall, 6),
+                "cpu_s": round(cpu, 6),
+            }
+            for name in PHASES:
+                phase_wall, phase_cpu = entry["phases"].get(name, (0.0, 0.0))
+                row[f"{name}_wall_s"] = round(phase_wall, 6)
+                row[f"{name}_cpu_s"] = round(phase_cpu, 6)
+            rows.append(row)
+        return rows
+
+    def slowest(self, rows: list = None) -> list:
+        """전체 소요 시간이 가장 긴 파일 top개의 행"""
+        rows = self._rows() if rows is None else rows
+        return sorted(rows, key=lambda row: row["wall_s"], reverse=True)[: self.top]
+
+    def write(self, output_dir: Path) -> tuple:
+        """
+        export_profile.json(요약 + 느린 파일 N개 + 전체)과 export_profile.csv(파일별)를 저장합니다.
+        Returns: (JSON 경로, CSV 경로)
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        rows = self._rows()
+        slowest = self.slowest(rows)
+
+        json_path = output_dir / PROFILE_JSON_FILENAME
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"summary": self.summary(), "slowest": slowest, "files": rows},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+
+        csv_path = output_dir / PROFILE_CSV_FILENAME
+        with open(csv_path, "w", newline="", encoding="utf-8-sig") as f:
+            fieldnames = list(rows[0]) if rows else ["file"]
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+
+        return json_path, csv_path
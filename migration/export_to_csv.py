@@ -18,17 +18,37 @@
     2. python export_to_csv.py                    # 전체 파일 변환
     3. python export_to_csv.py --file "파일명.xls" # 특정 파일 하나만 테스트
     4. python export_to_csv.py --dry-run          # 파일 생성 없이 검증만 수행
+    5. python export_to_csv.py --workers 4        # 4개 프로세스로 병렬 분석
+    6. python export_to_csv.py --full             # 캐시를 무시하고 전체 파일 재분석
+    7. python export_to_csv.py --stream           # 파일별 즉시 CSV 기록 (메모리 사용 일정)
+    8. python export_to_csv.py --format parquet   # 중간 파일을 Parquet으로 저장 (pyarrow 필요)
+
+증분 처리:
+    OUTPUT_DIR에 파일별 크기/수정시각/내용 해시를 기록한 매니페스트
+    (export_manifest.json)와 분석 결과 캐시(.export_cache/)를 저장합니다.
+    다음 실행부터는 변경되지 않은 파일은 캐시에서 읽고,
+    새로 추가되거나 수정된 파일만 다시 분석합니다.
 """
 
-import xlrd
 from pathlib import Path
+import json
 import logging
+import os
+import re
 import sys
 import io
 import csv
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack, nullcontext
 from datetime import datetime
 from tqdm import tqdm
 
+from export_profile import NULL_TIMER, PhaseTimer, ProfileReport
+from layout_engine import SheetRows, compile_layout
+from table_io import FORMATS, TableWriter
+from workbook_access import load_sheet
+from workbook_cache import WorkbookCache, file_sha256, open_cached_workbook
+
 # 설정 파일(config.py) 불러오기 시도
 try:
     import config
@@ -36,11 +56,13 @@ try:
     SOURCE_DIR = config.SOURCE_DIR
     OUTPUT_DIR = config.OUTPUT_DIR
     LOG_FILE = getattr(config, "LOG_FILE", "csv_export.log")
+    WORKBOOK_CACHE_DIR = getattr(config, "WORKBOOK_CACHE_DIR", None)
 except ImportError:
     # 설정 파일이 없는 경우 기본값 사용 (주의 메시지 출력)
     SOURCE_DIR = "excel_files"
     OUTPUT_DIR = "csv_output"
     LOG_FILE = "csv_export.log"
+    WORKBOOK_CACHE_DIR = None
     print("[경고] config.py 파일을 찾을 수 없어 기본 설정을 사용합니다.")
 
 # Windows 콘솔에서 한글 깨짐 방지를 위한 인코딩 설정
@@ -58,313 +80,826 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def get_cell_value(sheet, row: int, col: int):
-    """
-    Excel 시트에서 특정 셀의 값을 안전하게 가져옵니다.
-    - 빈 셀, 숫자, 문자열 등 타입에 따라 적절히 처리합니다.
-    - 범위를 벗어난 접근 시 빈 문자열을 반환합니다.
-    """
-    try:
-        cell = sheet.cell(row, col)
-        value = cell.value
-
-        if cell.ctype == xlrd.XL_CELL_EMPTY:
-            return ""
-        elif cell.ctype == xlrd.XL_CELL_NUMBER:
-            # 숫자인 경우 소수점 포함 그대로 반환
-            return value
-        else:
-            # 문자열인 경우 앞뒤 공백 제거 후 반환
-            return str(value).strip() if value else ""
-    except IndexError:
-        return ""
+# ---------------------------------------------------------------------------
+# 제품표준서 양식 배치 정의 (행/열 번호는 0부터 시작)
+# 양식이 바뀌면 이 설정만 고치면 됩니다. (항목 유형은 layout_engine 모듈 참고)
+# ---------------------------------------------------------------------------
+
+# '입력란' 시트: 기본 정보, 알러젠, BOM, QC 규격
+INPUT_SHEET_LAYOUT = {
+    # 1. 제품 기본 정보 (B3~B11)
+    "basic_info": {
+        "type": "cells",
+        "cells": {
+            "국문제품명": (2, 1),
+            "영문제품명": (3, 1),
+            "관리번호": (4, 1),
+            "작성일자": (5, 1),
+            "제품코드": (6, 1),
+            "성상": (7, 1),
+            "포장단위": (8, 1),
+            "작성자": (9, 1),
+            "사용법": (10, 1),
+        },
+    },
+    # 알러젠: 고정 위치(F42/F47) 라벨 아래 셀, 없으면 시트 라벨 인덱스로 검색
+    # (기존 전체 시트 검색과 같은 규칙: 라벨 텍스트를 그대로 포함한 셀만, 값이 빈 라벨은 건너뜀)
+    "allergen_kr": {
+        "type": "label",
+        "label": "Allergen(국문)",
+        "normalize": False,
+        "skip_empty": True,
+        "fixed": (41, 5),
+        "offset": (1, 0),
+        "convert": "text",
+    },
+    "allergen_en": {
+        "type": "label",
+        "label": "Allergen(영문)",
+        "normalize": False,
+        "skip_empty": True,
+        "fixed": (46, 5),
+        "offset": (1, 0),
+        "convert": "text",
+    },
+    # 2. BOM (14행부터 원료코드가 없을 때까지, 최대 100행)
+    "bom": {
+        "type": "rows",
+        "rows": (13, 100),
+        "key": 1,
+        "stop_when_empty": True,
+        "columns": {"순번": 0, "원료코드": 1, "함량": 2},
+    },
+    # 3. 반제품 QC (3~7행), 항목이 있는 행만
+    "qc_semi": {
+        "type": "rows",
+        "rows": (2, 7),
+        "key": 5,
+        "columns": {"순번": 4, "항목": 5, "시험기준": 6, "시험방법": 8},
+    },
+    # 완제품 QC (9~40행), 항목이 있는 행만
+    "qc_finished": {
+        "type": "rows",
+        "rows": (8, 40),
+        "key": 5,
+        "columns": {"순번": 4, "항목": 5, "시험기준": 6, "시험방법": 8},
+    },
+}
+
+# '제품표준서' 시트: 저장방법, 사용기한, 개정 이력
+STANDARD_SHEET_LAYOUT = {
+    # 저장방법 (D18), 사용기한 (D19)
+    "storage_method": {"type": "cell", "cell": (17, 3)},
+    "shelf_life": {"type": "cell", "cell": (18, 3)},
+    # 화장품 유형 / 재활용등급 (상단 30행 안의 A열 라벨, D열 값, 값이 빈 라벨은 건너뜀)
+    "cosmetic_type": {
+        "type": "label",
+        "label": "화장품유형",
+        "col": 0,
+        "value_col": 3,
+        "max_row": 30,
+        "skip_empty": True,
+        "convert": "display",
+    },
+    "recycling_grade": {
+        "type": "label",
+        "label": "재활용등급",
+        "col": 0,
+        "value_col": 3,
+        "max_row": 30,
+        "skip_empty": True,
+        "convert": "display",
+    },
+    # 개정 이력 (23~27행), 일련번호가 있는 행만
+    "revisions": {
+        "type": "rows",
+        "rows": (22, 27),
+        "key": 0,
+        "columns": {"일련번호": 0, "개정년월일": 1, "개정사항": 2},
+    },
+}
+
+# 알러젠은 고정 위치에 없을 때 시트 전체 라벨 검색이 일어나므로 별도 계획으로 분리하여 추출
+ALLERGEN_FIELDS = ("allergen_kr", "allergen_en")
+
+INPUT_SHEET_PLAN = compile_layout(
+    {
+        name: spec
+        for name, spec in INPUT_SHEET_LAYOUT.items()
+        if name not in ALLERGEN_FIELDS
+    }
+)
+STANDARD_SHEET_PLAN = compile_layout(STANDARD_SHEET_LAYOUT)
+ALLERGEN_PLAN = compile_layout({name: INPUT_SHEET_LAYOUT[name] for name in ALLERGEN_FIELDS})
 
 
-def extract_allergen(sheet) -> tuple:
+def extract_allergen(sheet, rows: SheetRows = None) -> tuple:
     """
     엑셀 시트에서 알러젠(Allergen) 정보를 찾아 추출합니다.
     1. 먼저 예상되는 고정 위치(F42-F48)를 확인합니다.
-    2. 고정 위치에 없으면 시트 전체를 검색하여 'Allergen(국문/영문)' 키워드를 찾습니다.
+    2. 고정 위치에 없으면 시트 라벨 인덱스에서 'Allergen(국문/영문)' 키워드를 찾습니다.
+       (인덱스는 이때 시트당 한 번만 생성합니다.)
 
     Returns: (알러젠_국문, 알러젠_영문)
     """
-    allergen_kr = ""
-    allergen_en = ""
+    result = ALLERGEN_PLAN.extract(sheet, rows)
+    return (result["allergen_kr"], result["allergen_en"])
 
-    # 1단계: 고정 위치 확인 (속도 최적화)
-    try:
-        # F42 (행 41, 열 5) 위치 확인
-        f42_value = str(get_cell_value(sheet, 41, 5))
-        if "Allergen(국문)" in f42_value:
-            allergen_kr = str(get_cell_value(sheet, 42, 5))  # F43
 
-        # F47 (행 46, 열 5) 위치 확인
-        f47_value = str(get_cell_value(sheet, 46, 5))
-        if "Allergen(영문)" in f47_value:
-            allergen_en = str(get_cell_value(sheet, 47, 5))  # F48
-    except (IndexError, KeyError):
-        pass
+# '제품표준서' 시트 이름 후보 (공백이 붙은 경우 포함)
+STANDARD_SHEET_NAMES = ["제품표준서", "제품표준서 ", " 제품표준서"]
 
-    # 2단계: 고정 위치에 없으면 전체 시트 검색
-    if not allergen_kr or not allergen_en:
-        for row_idx in range(sheet.nrows):
-            for col_idx in range(sheet.ncols):
-                try:
-                    cell_value = str(get_cell_value(sheet, row_idx, col_idx))
 
-                    if "Allergen(국문)" in cell_value and not allergen_kr:
-                        # 키워드 바로 아래 셀의 값을 가져옴
-                        allergen_kr = str(get_cell_value(sheet, row_idx + 1, col_idx))
+def parse_excel_to_dict(
+    filepath: str,
+    workbook_cache: WorkbookCache = None,
+    sha256: str = None,
+    timer: PhaseTimer = None,
+) -> dict:
+    """
+    Excel 파일 하나를 읽어서 딕셔너리 구조로 변환합니다.
+    '입력란' 시트와 '제품표준서' 시트의 데이터를 조합합니다.
+    (셀 위치는 INPUT_SHEET_LAYOUT / STANDARD_SHEET_LAYOUT 설정을 따릅니다.)
+    workbook_cache가 주어지면 공유 워크북 캐시에 저장된 시트 행을 사용합니다.
+    timer가 주어지면 단계별 시간과 알러젠 전체 검색 여부를 기록합니다. (--profile)
+    """
+    timer = timer or NULL_TIMER
+    try:
+        with ExitStack() as stack:
+            # 엑셀 파일 열기 (캐시가 없으면 on_demand 모드: 필요한 두 시트만 읽고 끝나면 해제)
+            with timer.phase("open"):
+                workbook = stack.enter_context(
+                    open_cached_workbook(filepath, workbook_cache, sha256)
+                )
+                input_sheet = load_sheet(workbook, "입력란")
+            if input_sheet is None:
+                raise ValueError("'입력란' 시트를 찾을 수 없습니다.")
+
+            # '입력란' 시트 분석 (기본 정보, BOM, QC 데이터 포함)
+            rows = SheetRows(input_sheet)
+            with timer.phase("input_sheet"):
+                extracted = INPUT_SHEET_PLAN.extract(input_sheet, rows)
+
+            # 알러젠 (같은 행 캐시를 사용하므로 이미 읽은 행은 다시 읽지 않음)
+            with timer.phase("allergen"):
+                allergen_kr, allergen_en = extract_allergen(input_sheet, rows)
+            if timer.enabled:
+                timer.allergen_fallback = rows.label_scanned
+
+            basic_info = dict(extracted["basic_info"])
+            basic_info["Allergen국문"] = allergen_kr
+            basic_info["Allergen영문"] = allergen_en
+
+            # '제품표준서' 시트 분석 (저장방법, 유통기한, 화장품 유형, 재활용등급, 개정 이력)
+            storage_method = ""
+            shelf_life = ""
+            cosmetic_type = ""
+            recycling_grade = ""
+            revisions = []
+
+            try:
+                with timer.phase("standard_sheet"):
+                    # 시트 이름에 공백이 포함된 경우 대응
+                    std_sheet = load_sheet(workbook, STANDARD_SHEET_NAMES)
+
+                    if std_sheet:
+                        standard = STANDARD_SHEET_PLAN.extract(std_sheet)
+                        storage_method = standard["storage_method"]
+                        shelf_life = standard["shelf_life"]
+                        cosmetic_type = standard["cosmetic_type"]
+                        recycling_grade = standard["recycling_grade"]
+                        revisions = standard["revisions"]
+            except Exception as e:
+                logger.warning(f"제품표준서 시트 분석 중 경고 발생: {e}")
+
+            return {
+                "basic_info": basic_info,
+                "storage_method": storage_method,
+                "shelf_life": shelf_life,
+                "cosmetic_type": cosmetic_type,
+                "recycling_grade": recycling_grade,
+                "bom": extracted["bom"],
+                "qc_semi": extracted["qc_semi"],
+                "qc_finished": extracted["qc_finished"],
+                "revisions": revisions,
+                "source_file": Path(filepath).name,
+            }
+
+    except Exception as e:
+        logger.error(f"파일 분석 중 오류 발생 ({filepath}): {e}")
+        raise
 
-                    if "Allergen(영문)" in cell_value and not allergen_en:
-                        # 키워드 바로 아래 셀의 값을 가져옴
-                        allergen_en = str(get_cell_value(sheet, row_idx + 1, col_idx))
 
-                except (IndexError, KeyError):
-                    continue
+# 분석 결과 구조가 바뀌면 이 값을 올려 기존 캐시를 무효화합니다.
+PARSER_VERSION = 4
 
-    return (allergen_kr.strip(), allergen_en.strip())
+MANIFEST_FILENAME = "export_manifest.json"
+CACHE_DIRNAME = ".export_cache"
 
 
-def parse_excel_to_dict(filepath: str) -> dict:
+class ParseCache:
     """
-    Excel 파일 하나를 읽어서 딕셔너리 구조로 변환합니다.
-    '입력란' 시트와 '제품표준서' 시트의 데이터를 조합합니다.
+    파일별 분석 결과 캐시와 매니페스트를 관리합니다.
+
+    - 매니페스트(export_manifest.json): 파일 경로 -> 크기, 수정시각, 내용 해시
+    - 캐시 폴더(.export_cache/): 내용 해시 -> parse_excel_to_dict 결과(JSON)
+
+    크기와 수정시각이 같으면 해시 계산 없이 캐시를 사용하고,
+    둘 중 하나라도 다르면 해시를 다시 계산하여 내용이 실제로 바뀐 경우에만 재분석합니다.
     """
-    try:
-        # 엑셀 파일 열기 (xlrd 라이브러리 사용)
-        workbook = xlrd.open_workbook(filepath, formatting_info=False)
 
-        # '입력란' 시트 분석 (기본 정보, BOM, QC 데이터 포함)
+    def __init__(
+        self,
+        output_dir: Path,
+        source_dir: Path,
+        enabled: bool = True,
+        readonly: bool = False,
+    ):
+        self.manifest_path = output_dir / MANIFEST_FILENAME
+        self.cache_dir = output_dir / CACHE_DIRNAME
+        self.source_dir = source_dir
+        self.enabled = enabled
+        self.readonly = readonly
+        self.entries = {}
+        self.new_entries = {}
+
+        if enabled and self.manifest_path.exists():
+            try:
+                with open(self.manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+                if manifest.get("parser_version") == PARSER_VERSION:
+                    self.entries = manifest.get("files", {})
+                else:
+                    logger.info("분석기 버전이 바뀌어 기존 캐시를 사용하지 않습니다.")
+                    self._drop_records()
+            except (OSError, ValueError) as e:
+                logger.warning(f"매니페스트를 읽을 수 없어 무시합니다: {e}")
+
+    def _drop_records(self):
+        """
+        이전 분석기 버전의 분석 결과를 사용하지 않도록 합니다.
+        결과 파일은 내용 해시로만 찾으므로 지우지 않으면 바뀌지 않은 파일에 그대로 쓰이게 됩니다.
+        (readonly이면 지우지 않고 이번 실행에서만 캐시를 끔)
+        """
+        if self.readonly:
+            self.enabled = False
+            return
+        if self.cache_dir.exists():
+            for record_path in self.cache_dir.glob("*.json"):
+                record_path.unlink()
+
+    def _key(self, filepath: Path) -> str:
         try:
-            input_sheet = workbook.sheet_by_name("입력란")
-        except xlrd.XLRDError:
-            raise ValueError("'입력란' 시트를 찾을 수 없습니다.")
-
-        # 알러젠 정보 추출
-        allergen_kr, allergen_en = extract_allergen(input_sheet)
-
-        # 1. 제품 기본 정보 추출 (고정 셀 위치 사용)
-        basic_info = {
-            "국문제품명": get_cell_value(input_sheet, 2, 1),
-            "영문제품명": get_cell_value(input_sheet, 3, 1),
-            "관리번호": get_cell_value(input_sheet, 4, 1),
-            "작성일자": get_cell_value(input_sheet, 5, 1),
-            "제품코드": get_cell_value(input_sheet, 6, 1),
-            "성상": get_cell_value(input_sheet, 7, 1),
-            "포장단위": get_cell_value(input_sheet, 8, 1),
-            "작성자": get_cell_value(input_sheet, 9, 1),
-            "사용법": get_cell_value(input_sheet, 10, 1),
-            "Allergen국문": allergen_kr,
-            "Allergen영문": allergen_en,
+            return filepath.relative_to(self.source_dir).as_posix()
+        except ValueError:
+            return filepath.as_posix()
+
+    def _record_path(self, sha256: str) -> Path:
+        return self.cache_dir / f"{sha256}.json"
+
+    def lookup(self, filepath: Path):
+        """
+        캐시된 분석 결과가 있으면 반환하고, 없으면 None을 반환합니다.
+        어느 경우든 파일의 최신 지문(크기/수정시각/해시)을 기록해 둡니다.
+        """
+        key = self._key(filepath)
+        stat = filepath.stat()
+        entry = self.entries.get(key)
+
+        if (
+            entry
+            and entry["size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+        ):
+            sha256 = entry["sha256"]
+        else:
+            sha256 = file_sha256(filepath)
+
+        self.new_entries[key] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256,
         }
 
-        # 2. BOM (원료 구성) 추출 (13행부터 원료코드가 없을 때까지)
-        bom = []
-        for row_idx in range(13, 100):  # 최대 100행까지 확인
-            material_code = get_cell_value(input_sheet, row_idx, 1)
-            if not material_code:
-                break
-            bom.append(
-                {
-                    "순번": get_cell_value(input_sheet, row_idx, 0),
-                    "원료코드": material_code,
-                    "함량": get_cell_value(input_sheet, row_idx, 2),
-                }
+        record_path = self._record_path(sha256)
+        if not self.enabled or not record_path.exists():
+            return None
+        try:
+            with open(record_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # 같은 내용의 파일이 이름만 바뀐 경우를 위해 원본파일명은 현재 이름으로 갱신
+        data["source_file"] = filepath.name
+        return data
+
+    def sha256(self, filepath: Path):
+        """lookup()에서 기록한 파일 내용 해시를 반환합니다. (기록이 없으면 None)"""
+        entry = self.new_entries.get(self._key(filepath))
+        return entry["sha256"] if entry else None
+
+    def store(self, filepath: Path, data: dict):
+        """분석 결과를 내용 해시 기준으로 캐시 폴더에 저장합니다."""
+        entry = self.new_entries.get(self._key(filepath))
+        if self.readonly or not entry:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._record_path(entry["sha256"]), "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def forget(self, filepath: Path):
+        """삭제된 파일의 매니페스트 항목을 제거합니다. (다음 save()에서 캐시 파일도 정리)"""
+        key = self._key(filepath)
+        self.entries.pop(key, None)
+        self.new_entries.pop(key, None)
+
+    def save(self, keep_unseen: bool = False) -> set:
+        """
+        매니페스트를 저장하고, 매니페스트에 남은 파일들의 내용 해시 집합을 반환합니다.
+        keep_unseen이 False이면 이번 실행에서 보이지 않은(삭제된) 파일 항목은 제거되고,
+        어떤 항목도 참조하지 않는 캐시 파일도 함께 정리합니다.
+        """
+        files = dict(self.entries) if keep_unseen else {}
+        files.update(self.new_entries)
+
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"parser_version": PARSER_VERSION, "files": files},
+                f,
+                ensure_ascii=False,
+                indent=2,
             )
 
-        # 3. QC 규격 (반제품/완제품) 추출
-        # 반제품 QC (2~6행)
-        qc_semi = []
-        for row_idx in range(2, 7):
-            test_item = get_cell_value(input_sheet, row_idx, 5)
-            if test_item:
-                qc_semi.append(
-                    {
-                        "순번": get_cell_value(input_sheet, row_idx, 4),
-                        "항목": test_item,
-                        "시험기준": get_cell_value(input_sheet, row_idx, 6),
-                        "시험방법": get_cell_value(input_sheet, row_idx, 8),
-                    }
-                )
+        live = {entry["sha256"] for entry in files.values()}
+        if not keep_unseen and self.cache_dir.exists():
+            for record_path in self.cache_dir.glob("*.json"):
+                if record_path.stem not in live:
+                    record_path.unlink()
+        return live
 
-        # 완제품 QC (8~39행)
-        qc_finished = []
-        for row_idx in range(8, 40):
-            test_item = get_cell_value(input_sheet, row_idx, 5)
-            if test_item:
-                qc_finished.append(
-                    {
-                        "순번": get_cell_value(input_sheet, row_idx, 4),
-                        "항목": test_item,
-                        "시험기준": get_cell_value(input_sheet, row_idx, 6),
-                        "시험방법": get_cell_value(input_sheet, row_idx, 8),
-                    }
-                )
 
-        # 4. '제품표준서' 시트 분석 (저장방법, 유통기한, 개정 이력)
-        storage_method = ""
-        shelf_life = ""
-        revisions = []
+def _parse_worker(job: tuple) -> tuple:
+    """
+    파일 하나를 분석하여 (데이터, 오류메시지, 계측기록) 튜플을 반환합니다.
+    job은 (파일경로, 워크북캐시, 내용해시, 계측여부) 튜플이며, 계측하지 않으면 계측기록은 None입니다.
+    프로세스 풀 작업자에서도 실행되므로 예외를 그대로 던지지 않고
+    오류 메시지로 바꾸어 메인 프로세스가 성공/실패를 집계할 수 있게 합니다.
+    """
+    filepath, workbook_cache, sha256, profile = job
+    timer = PhaseTimer() if profile else None
+    try:
+        data, error = parse_excel_to_dict(filepath, workbook_cache, sha256, timer), None
+    except Exception as e:
+        data, error = None, str(e)
+    return data, error, (timer.record() if timer else None)
 
-        try:
-            std_sheet = None
-            # 시트 이름에 공백이 포함된 경우 대응
-            for name in ["제품표준서", "제품표준서 ", " 제품표준서"]:
-                try:
-                    std_sheet = workbook.sheet_by_name(name)
-                    break
-                except xlrd.XLRDError:
-                    continue
-
-            if std_sheet:
-                storage_method = get_cell_value(std_sheet, 17, 3)  # D18
-                shelf_life = get_cell_value(std_sheet, 18, 3)  # D19
-
-                # 개정 이력 (22~26행)
-                for row_idx in range(22, 27):
-                    revision_no = get_cell_value(std_sheet, row_idx, 0)
-                    if revision_no:
-                        revisions.append(
-                            {
-                                "일련번호": revision_no,
-                                "개정년월일": get_cell_value(std_sheet, row_idx, 1),
-                                "개정사항": get_cell_value(std_sheet, row_idx, 2),
-                            }
-                        )
-        except Exception as e:
-            logger.warning(f"제품표준서 시트 분석 중 경고 발생: {e}")
-
-        return {
-            "basic_info": basic_info,
-            "storage_method": storage_method,
-            "shelf_life": shelf_life,
-            "bom": bom,
-            "qc_semi": qc_semi,
-            "qc_finished": qc_finished,
-            "revisions": revisions,
-            "source_file": Path(filepath).name,
-        }
 
-    except Exception as e:
-        logger.error(f"파일 분석 중 오류 발생 ({filepath}): {e}")
-        raise
+def parse_files(
+    files: list,
+    workers: int = 1,
+    workbook_cache: WorkbookCache = None,
+    hashes: dict = None,
+    profile: bool = False,
+):
+    """
+    파일 목록을 분석하여 (파일경로, 데이터, 오류메시지, 계측기록) 튜플을 차례로 생성합니다.
+    - workers가 1이면 현재 프로세스에서 순서대로 분석합니다.
+    - workers가 2 이상이면 프로세스 풀에서 병렬로 분석합니다.
+    - workbook_cache가 주어지면 공유 워크북 캐시를 거쳐 시트 행을 읽습니다.
+      (hashes에 파일별 내용 해시가 있으면 해시를 다시 계산하지 않음)
+    - profile이 True이면 파일별 단계 시간을 계측합니다. (아니면 계측기록은 None)
+    어느 경우든 결과는 입력 파일 순서(정렬 순서) 그대로 반환되므로
+    생성되는 CSV 파일은 직렬 실행 결과와 동일합니다.
+    """
+    hashes = hashes or {}
+    jobs = [
+        (str(filepath), workbook_cache, hashes.get(filepath), profile)
+        for filepath in files
+    ]
+
+    if workers <= 1:
+        for filepath, job in zip(files, jobs):
+            yield (filepath, *_parse_worker(job))
+        return
+
+    # 작업 단위를 적당히 묶어 프로세스 간 통신 비용을 줄임
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_parse_worker, jobs, chunksize=chunksize)
+        for filepath, result in zip(files, results):
+            yield (filepath, *result)
+
+
+def parse_files_cached(
+    files: list,
+    cache: ParseCache,
+    workers: int = 1,
+    workbook_cache: WorkbookCache = None,
+    profile: bool = False,
+):
+    """
+    캐시를 적용하여 (파일경로, 데이터, 오류메시지, 캐시사용여부, 계측기록) 튜플을 파일 순서대로 생성합니다.
+    캐시에 없는 파일만 parse_files()로 분석하고, 분석에 성공한 결과는 캐시에 저장합니다.
+    (캐시를 사용한 파일의 계측기록은 None)
+    """
+    cached = {}
+    misses = []
+    for filepath in files:
+        data = cache.lookup(filepath)
+        if data is None:
+            misses.append(filepath)
+        else:
+            cached[filepath] = data
 
+    hashes = {filepath: cache.sha256(filepath) for filepath in misses}
+    parsed = parse_files(misses, workers, workbook_cache, hashes, profile)
+    for filepath in files:
+        if filepath in cached:
+            yield filepath, cached.pop(filepath), None, True, None
+            continue
 
-def export_to_csv(all_data: list, output_dir: Path, prefix: str = ""):
+        _, data, error, record = next(parsed)
+        if error is None:
+            cache.store(filepath, data)
+        yield filepath, data, error, False, record
+
+
+# 출력 CSV 테이블 정의: (파일명, 헤더)
+PRODUCTS_HEADER = [
+    "국문제품명",
+    "영문제품명",
+    "관리번호",
+    "작성일자",
+    "제품코드",
+    "성상",
+    "포장단위",
+    "작성자",
+    "사용법",
+    "Allergen국문",
+    "Allergen영문",
+    "저장방법",
+    "사용기한",
+    "원본파일",
+    # 나중에 추가된 컬럼은 기존 컬럼 위치가 바뀌지 않도록 끝에 붙임
+    "화장품유형",
+    "재활용등급",
+]
+PRODUCT_CODE_COLUMN = PRODUCTS_HEADER.index("제품코드")
+SOURCE_FILE_COLUMN = PRODUCTS_HEADER.index("원본파일")
+BOM_HEADER = ["제품코드", "순번", "원료코드", "함량"]
+QC_HEADER = ["제품코드", "QC유형", "순번", "항목", "시험기준", "시험방법"]
+REVISIONS_HEADER = ["제품코드", "일련번호", "개정년월일", "개정사항"]
+
+
+def product_rows(data: dict) -> list:
+    """제품 기본 정보 행 (products.csv)"""
+    info = data["basic_info"]
+    return [
+        [
+            info["국문제품명"],
+            info["영문제품명"],
+            info["관리번호"],
+            info["작성일자"],
+            info["제품코드"],
+            info["성상"],
+            info["포장단위"],
+            info["작성자"],
+            info["사용법"],
+            info.get("Allergen국문", ""),
+            info.get("Allergen영문", ""),
+            data["storage_method"],
+            data["shelf_life"],
+            data["source_file"],
+            data["cosmetic_type"],
+            data["recycling_grade"],
+        ]
+    ]
+
+
+def bom_rows(data: dict) -> list:
+    """BOM 행 (bom.csv)"""
+    product_code = data["basic_info"]["제품코드"]
+    return [
+        [product_code, item["순번"], item["원료코드"], item["함량"]]
+        for item in data["bom"]
+    ]
+
+
+def qc_rows(data: dict) -> list:
+    """품질 규격 행 (qc_specs.csv) - 반제품 다음 완제품 순서"""
+    product_code = data["basic_info"]["제품코드"]
+    rows = []
+    for qc_type, items in (("반제품", data["qc_semi"]), ("완제품", data["qc_finished"])):
+        for item in items:
+            rows.append(
+                [
+                    product_code,
+                    qc_type,
+                    item["순번"],
+                    item["항목"],
+                    item["시험기준"],
+                    item["시험방법"],
+                ]
+            )
+    return rows
+
+
+def revision_rows(data: dict) -> list:
+    """개정 이력 행 (revisions.csv)"""
+    product_code = data["basic_info"]["제품코드"]
+    return [
+        [product_code, item["일련번호"], item["개정년월일"], item["개정사항"]]
+        for item in data["revisions"]
+    ]
+
+
+# Parquet 형식으로 저장할 때의 컬럼 자료형 (나머지 컬럼은 문자열, table_io.TableWriter 참고)
+EXPORT_COLUMN_TYPES = {
+    "작성일자": "date",
+    "순번": "int",
+    "함량": "float",
+    "일련번호": "int",
+    "개정년월일": "date",
+}
+
+# (파일명, 헤더, 행 생성 함수)
+CSV_TABLES = [
+    ("products.csv", PRODUCTS_HEADER, product_rows),
+    ("bom.csv", BOM_HEADER, bom_rows),
+    ("qc_specs.csv", QC_HEADER, qc_rows),
+    ("revisions.csv", REVISIONS_HEADER, revision_rows),
+]
+
+
+def export_to_csv(
+    all_data: list, output_dir: Path, prefix: str = "", fmt: str = "csv"
+):
     """
     추출된 데이터를 4개의 CSV 파일로 나누어 저장합니다.
     한글 깨짐 방지를 위해 UTF-8-SIG 인코딩을 사용합니다.
+    fmt="parquet"이면 같은 이름의 .parquet 파일로 저장합니다. (table_io.py 참고)
     """
     output_dir.mkdir(exist_ok=True)
 
-    # 1. 제품 기본 정보 (Products)
-    products_file = output_dir / f"{prefix}products.csv"
-    with open(products_file, "w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.writer(f)
-        writer.writerow(
-            [
-                "국문제품명",
-                "영문제품명",
-                "관리번호",
-                "작성일자",
-                "제품코드",
-                "성상",
-                "포장단위",
-                "작성자",
-                "사용법",
-                "Allergen국문",
-                "Allergen영문",
-                "저장방법",
-                "사용기한",
-                "원본파일",
-            ]
+    for filename, header, make_rows in CSV_TABLES:
+        with open_table_writer(output_dir / f"{prefix}{filename}", header, fmt) as writer:
+            for data in all_data:
+                writer.writerows(make_rows(data))
+        warn_invalid_values(writer)
+
+
+def open_table_writer(path: Path, header: list, fmt: str) -> TableWriter:
+    """출력 표 작성기 (Parquet은 EXPORT_COLUMN_TYPES의 자료형으로 기록)"""
+    return TableWriter(path, header, fmt, types=EXPORT_COLUMN_TYPES)
+
+
+def warn_invalid_values(writer: TableWriter):
+    """Parquet 자료형으로 바꿀 수 없어 null로 기록한 값이 있으면 컬럼별 개수를 경고합니다."""
+    if writer.invalid:
+        counts = ", ".join(f"{name} {count}건" for name, count in writer.invalid.items())
+        logger.warning(
+            f"{writer.path.name}: 자료형이 맞지 않아 비워 둔 값 ({counts})"
+            " - 원래 값은 CSV 형식으로 확인하세요."
         )
 
-        for data in all_data:
-            info = data["basic_info"]
-            writer.writerow(
-                [
-                    info["국문제품명"],
-                    info["영문제품명"],
-                    info["관리번호"],
-                    info["작성일자"],
-                    info["제품코드"],
-                    info["성상"],
-                    info["포장단위"],
-                    info["작성자"],
-                    info["사용법"],
-                    info.get("Allergen국문", ""),
-                    info.get("Allergen영문", ""),
-                    data["storage_method"],
-                    data["shelf_life"],
-                    data["source_file"],
-                ]
+
+# 화장품 유형/재활용등급 추출 결과 (scripts/import_product_standard_fields.py 등에서 사용)
+STANDARD_FIELDS_FILENAME = "product_standard_extracted.json"
+
+
+def standard_fields_record(filepath: Path, data: dict = None, error: str = None) -> dict:
+    """
+    파일 하나의 화장품 유형/재활용등급 레코드를 만듭니다.
+    scripts/extract_product_standard_fields.py의 출력과 같은 형식이며,
+    관리번호와 제품코드는 파일명에서 추출합니다. (예: ..._EVCO1249_...(AOFC001).xls)
+    """
+    fname = Path(filepath).name
+    mgmt_match = re.search(r"_?(EVCO\d+)_", fname)
+    code_match = re.search(r"\(([A-Z0-9~]+)\)", fname)
+    return {
+        "filename": fname,
+        "product_code": code_match.group(1) if code_match else None,
+        "management_code": mgmt_match.group(1) if mgmt_match else None,
+        "cosmetic_type": (data["cosmetic_type"] or None) if data else None,
+        "recycling_grade": (data["recycling_grade"] or None) if data else None,
+        "error": error,
+    }
+
+
+def export_standard_fields_json(records: list, output_dir: Path):
+    """화장품 유형/재활용등급 레코드를 JSON 파일로 저장합니다."""
+    output_dir.mkdir(exist_ok=True)
+    with open(output_dir / STANDARD_FIELDS_FILENAME, "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+
+
+def _code_key(code) -> str:
+    """
+    중복 판정용 제품코드 키.
+    엑셀 셀 타입(숫자/문자)이 다르면 배치 모드에서도 다른 코드로 취급되므로 타입을 함께 기록합니다.
+    """
+    return f"{type(code).__name__}:{code}"
+
+
+class StreamingCsvExporter:
+    """
+    분석된 워크북을 즉시 CSV로 기록하는 스트리밍 내보내기 도구입니다.
+
+    1. write(): 워크북 하나의 행을 임시 폴더(.stream_tmp/)의 4개 CSV에 바로 기록하고,
+       제품코드는 디스크 기반 인덱스(SQLite)에 등록합니다.
+    2. finish(): 임시 CSV를 한 줄씩 다시 읽어 정상 행은 최종 CSV로 옮기고,
+       중복 코드의 행만 SQLite에 모은 뒤 코드별로 정렬하여 duplicates_ 파일로 기록합니다.
+
+    메모리에는 중복 코드 목록만 유지하므로 전체 제품 수와 무관하게 사용량이 일정하며,
+    출력 내용과 순서는 배치 모드(export_to_csv)와 동일합니다.
+    임시 파일은 항상 CSV이며, 최종 파일만 fmt 형식(csv/parquet)으로 기록합니다.
+    dry_run이면 파일을 만들지 않고 메모리 SQLite 인덱스로 정상/중복 건수만 집계합니다.
+    """
+
+    def __init__(self, output_dir: Path, fmt: str = "csv", dry_run: bool = False):
+        import sqlite3
+
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.dry_run = dry_run
+        self.tmp_dir = output_dir / ".stream_tmp"
+
+        if dry_run:
+            self.db = sqlite3.connect(":memory:")
+        else:
+            self.tmp_dir.mkdir(parents=True, exist_ok=True)
+            index_path = self.tmp_dir / "codes.sqlite"
+            if index_path.exists():
+                index_path.unlink()
+            self.db = sqlite3.connect(str(index_path))
+        self.db.execute(
+            "CREATE TABLE codes ("
+            " code TEXT PRIMARY KEY, first_seq INTEGER NOT NULL, count INTEGER NOT NULL)"
+        )
+        self.db.execute(
+            "CREATE TABLE dup_rows ("
+            " tbl TEXT, first_seq INTEGER, seq INTEGER, n INTEGER, row TEXT)"
+        )
+
+        self.seq = 0
+        self.normal_count = 0
+        self.duplicate_count = 0
+        self._files = []
+        self._writers = []
+        if dry_run:
+            return
+        for filename, _, _ in CSV_TABLES:
+            f = open(self.tmp_dir / filename, "w", newline="", encoding="utf-8")
+            self._files.append(f)
+            self._writers.append(csv.writer(f))
+
+    def write(self, data: dict):
+        """워크북 하나의 행을 임시 CSV에 기록합니다. (행 앞에 순번과 코드 키를 붙여 저장)"""
+        self.seq += 1
+        code_key = _code_key(data["basic_info"]["제품코드"])
+        self.db.execute(
+            "INSERT INTO codes (code, first_seq, count) VALUES (?, ?, 1)"
+            " ON CONFLICT(code) DO UPDATE SET count = count + 1",
+            (code_key, self.seq),
+        )
+        if self.dry_run:
+            return
+        for writer, (_, _, make_rows) in zip(self._writers, CSV_TABLES):
+            for row in make_rows(data):
+                writer.writerow([self.seq, code_key] + row)
+
+    def finish(self):
+        """임시 CSV를 정상/중복 파일로 분리하여 최종 CSV를 생성하고 임시 파일을 정리합니다."""
+        for f in self._files:
+            f.close()
+
+        duplicates = {
+            code: first_seq
+            for code, first_seq in self.db.execute(
+                "SELECT code, first_seq FROM codes WHERE count > 1"
             )
+        }
+        self.normal_count = self.db.execute(
+            "SELECT COUNT(*) FROM codes WHERE count = 1"
+        ).fetchone()[0]
+        self.duplicate_count = (
+            self.db.execute(
+                "SELECT COALESCE(SUM(count), 0) FROM codes WHERE count > 1"
+            ).fetchone()[0]
+        )
+        if self.dry_run:
+            self.db.close()
+            return
+
+        for filename, header, _ in CSV_TABLES:
+            staged = self.tmp_dir / filename
+            out = None
+            if self.normal_count:
+                out = open_table_writer(self.output_dir / filename, header, self.fmt)
+
+            with open(staged, "r", newline="", encoding="utf-8") as f:
+                for n, (seq, code_key, *row) in enumerate(csv.reader(f)):
+                    if code_key in duplicates:
+                        self.db.execute(
+                            "INSERT INTO dup_rows VALUES (?, ?, ?, ?, ?)",
+                            (
+                                filename,
+                                duplicates[code_key],
+                                int(seq),
+                                n,
+                                json.dumps(row, ensure_ascii=False),
+                            ),
+                        )
+                    elif out is not None:
+                        out.writerow(row)
+
+            if out is not None:
+                out.close()
+                warn_invalid_values(out)
+            staged.unlink()
+
+            if duplicates:
+                with open_table_writer(
+                    self.output_dir / f"duplicates_{filename}", header, self.fmt
+                ) as writer:
+                    for (row,) in self.db.execute(
+                        "SELECT row FROM dup_rows WHERE tbl = ?"
+                        " ORDER BY first_seq, seq, n",
+                        (filename,),
+                    ):
+                        row = json.loads(row)
+                        writer.writerow(row)
+                        if filename == "products.csv":
+                            logger.warning(
+                                f"⚠️ 중복 제품코드 감지: {row[PRODUCT_CODE_COLUMN]} "
+                                f"({row[SOURCE_FILE_COLUMN]})"
+                            )
+                warn_invalid_values(writer)
+
+        self.db.close()
+        (self.tmp_dir / "codes.sqlite").unlink()
+        self.tmp_dir.rmdir()
+
+
+def split_duplicates(all_data: list) -> tuple:
+    """
+    제품코드 기준으로 정상 제품과 중복 제품을 분리합니다.
+    중복 제품은 코드가 처음 등장한 순서대로 코드별로 묶어 반환합니다.
+    """
+    product_codes = {}
 
-    # 2. BOM 정보 (BOM)
-    bom_file = output_dir / f"{prefix}bom.csv"
-    with open(bom_file, "w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.writer(f)
-        writer.writerow(["제품코드", "순번", "원료코드", "함량"])
-
-        for data in all_data:
-            product_code = data["basic_info"]["제품코드"]
-            for item in data["bom"]:
-                writer.writerow(
-                    [product_code, item["순번"], item["원료코드"], item["함량"]]
-                )
+    for data in all_data:
+        code = data["basic_info"]["제품코드"]
+        if code not in product_codes:
+            product_codes[code] = []
+        product_codes[code].append(data)
 
-    # 3. 품질 규격 (QC Specs)
-    qc_file = output_dir / f"{prefix}qc_specs.csv"
-    with open(qc_file, "w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.writer(f)
-        writer.writerow(["제품코드", "QC유형", "순번", "항목", "시험기준", "시험방법"])
-
-        for data in all_data:
-            product_code = data["basic_info"]["제품코드"]
-            # 반제품 QC
-            for item in data["qc_semi"]:
-                writer.writerow(
-                    [
-                        product_code,
-                        "반제품",
-                        item["순번"],
-                        item["항목"],
-                        item["시험기준"],
-                        item["시험방법"],
-                    ]
-                )
-            # 완제품 QC
-            for item in data["qc_finished"]:
-                writer.writerow(
-                    [
-                        product_code,
-                        "완제품",
-                        item["순번"],
-                        item["항목"],
-                        item["시험기준"],
-                        item["시험방법"],
-                    ]
-                )
+    normal_data = []
+    duplicate_data = []
 
-    # 4. 개정 이력 (Revisions)
-    revisions_file = output_dir / f"{prefix}revisions.csv"
-    with open(revisions_file, "w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.writer(f)
-        writer.writerow(["제품코드", "일련번호", "개정년월일", "개정사항"])
-
-        for data in all_data:
-            product_code = data["basic_info"]["제품코드"]
-            for item in data["revisions"]:
-                writer.writerow(
-                    [
-                        product_code,
-                        item["일련번호"],
-                        item["개정년월일"],
-                        item["개정사항"],
-                    ]
+    for code, products in product_codes.items():
+        if len(products) > 1:
+            # 중복된 코드가 있는 제품들
+            duplicate_data.extend(products)
+            for product in products:
+                logger.warning(
+                    f"⚠️ 중복 제품코드 감지: {code} ({product['source_file']})"
                 )
+        else:
+            # 유일한 코드를 가진 제품
+            normal_data.extend(products)
+
+    return normal_data, duplicate_data
+
+
+def log_profile_report(report: ProfileReport, output_dir: Path, write: bool = True):
+    """계측 결과 요약(단계별 합계, 가장 느린 파일)을 로그로 출력하고 보고서 파일로 저장합니다."""
+    summary = report.summary()
+    print()
+    logger.info("단계별 소요 시간 (wall / CPU / 비율)")
+    for name, phase in summary["phases"].items():
+        logger.info(
+            f"- {name:<15} {phase['wall_s']:>9.3f}s {phase['cpu_s']:>9.3f}s "
+            f"{phase['share'] * 100:>5.1f}%"
+        )
+    logger.info(
+        f"알러젠 전체 라벨 검색: {summary['allergen_fallback']}/{summary['parsed']}개 파일"
+    )
+    if summary["from_cache"]:
+        logger.info(
+            f"캐시 사용 {summary['from_cache']}건은 계측에서 제외됩니다. (--full로 전체 계측)"
+        )
+
+    slowest = report.slowest()
+    logger.info(f"가장 느린 파일 {len(slowest)}개:")
+    for row in slowest:
+        flag = " (알러젠 전체 검색)" if row["allergen_fallback"] else ""
+        logger.info(f"  {row['wall_s'] * 1000:>9.1f}ms  {row['file']}{flag}")
+
+    if write:
+        json_path, csv_path = report.write(output_dir)
+        logger.info(f"계측 보고서: {json_path}, {csv_path}")
 
 
 def main():
@@ -377,7 +912,50 @@ def main():
     parser.add_argument(
         "--dry-run", action="store_true", help="파일 생성 없이 분석만 수행"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="병렬 분석에 사용할 프로세스 수 (기본 1, 0이면 CPU 코어 수)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="캐시를 무시하고 모든 파일을 다시 분석",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="분석 결과를 메모리에 모으지 않고 파일별로 즉시 CSV에 기록",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="결과 표 형식 (기본 csv: 사람이 확인하는 용도, parquet: 다음 단계 입력용, pyarrow 필요)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="파일별/단계별 소요 시간 보고서(export_profile.json/.csv) 생성 (--full과 함께 사용 권장)",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=20,
+        help="보고서에 표시할 가장 느린 파일 수 (기본 20)",
+    )
+    parser.add_argument(
+        "--prune-cache",
+        action="store_true",
+        help="변환 후 공유 워크북 캐시에서 현재 원본 폴더에 없는 파일의 레코드를 삭제"
+        " (다른 폴더를 읽는 도구의 레코드도 삭제되므로 운영 폴더에서만 사용)",
+    )
     args = parser.parse_args()
+    if args.prune_cache and (args.file or args.dry_run):
+        parser.error("--prune-cache는 폴더 전체를 변환할 때만 사용할 수 있습니다.")
+
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
 
     # 입력 폴더 확인
     source_path = Path(SOURCE_DIR)
@@ -402,73 +980,139 @@ def main():
 
     logger.info(f"총 {len(files)}개의 파일을 처리합니다.")
     logger.info(f"출력 폴더: {OUTPUT_DIR}")
+    if workers > 1:
+        logger.info(f"병렬 분석: {workers}개 프로세스 사용")
+    if args.stream:
+        logger.info("스트리밍 모드: 분석된 파일을 즉시 CSV에 기록합니다.")
+    if args.format != "csv":
+        logger.info(f"출력 형식: {args.format}")
     print()
 
+    output_path = Path(OUTPUT_DIR)
+
     # 파일 분석 실행
     all_data = []
     success_count = 0
     error_count = 0
+    cache_hit_count = 0
+    parsed_count = 0
+    allergen_count = 0
+    standard_fields = []
+    total_bom = 0
+    total_qc = 0
+
+    cache = ParseCache(
+        output_path, source_path, enabled=not args.full, readonly=args.dry_run
+    )
+    # 다른 도구와 공유하는 워크북 캐시 (--full이면 엑셀을 다시 읽어 레코드 갱신)
+    workbook_cache = WorkbookCache(
+        WORKBOOK_CACHE_DIR, enabled=not args.full, readonly=args.dry_run
+    )
 
-    # 진행률 표시줄(tqdm) 사용
-    for idx, filepath in enumerate(tqdm(files, desc="엑셀 파일 분석 중"), 1):
-        try:
-            data = parse_excel_to_dict(str(filepath))
-            all_data.append(data)
-            success_count += 1
-        except Exception as e:
-            logger.error(f"실패: {filepath.name} - {e}")
+    # 계측 보고서 (--profile)
+    report = ProfileReport(args.profile_top) if args.profile else None
+
+    # 스트리밍 모드에서는 분석된 워크북을 즉시 임시 CSV에 기록
+    # (--dry-run이면 파일 없이 코드 인덱스만 유지하여 중복 건수를 집계)
+    exporter = None
+    if args.stream:
+        exporter = StreamingCsvExporter(output_path, args.format, dry_run=args.dry_run)
+
+    # 진행률 표시줄(tqdm) 사용 - 결과는 항상 정렬된 파일 순서로 도착함
+    results = parse_files_cached(
+        files, cache, workers, workbook_cache, profile=args.profile
+    )
+    for filepath, data, error, from_cache, record in tqdm(
+        results, total=len(files), desc="엑셀 파일 분석 중"
+    ):
+        if from_cache:
+            cache_hit_count += 1
+        else:
+            parsed_count += 1
+        if report is not None:
+            report.add(filepath.name, record, from_cache=from_cache, error=error)
+
+        if error is not None:
+            logger.error(f"실패: {filepath.name} - {error}")
             error_count += 1
+            standard_fields.append(standard_fields_record(filepath, error=error))
             continue
+        success_count += 1
+        standard_fields.append(standard_fields_record(filepath, data))
+
+        # 요약 통계는 분석 즉시 누적 (스트리밍 모드에서는 데이터를 보관하지 않음)
+        info = data["basic_info"]
+        if info.get("Allergen국문") or info.get("Allergen영문"):
+            allergen_count += 1
+        total_bom += len(data["bom"])
+        total_qc += len(data["qc_semi"]) + len(data["qc_finished"])
+
+        if exporter is not None:
+            with report.file_phase("csv_write") if report else nullcontext():
+                exporter.write(data)
+        elif not args.stream:
+            all_data.append(data)
+
+    # 매니페스트 갱신 (--file 모드에서는 다른 파일 항목을 유지)
+    if not args.dry_run:
+        live_hashes = cache.save(keep_unseen=bool(args.file))
+        # 공유 캐시이므로 요청한 경우(--prune-cache)에만 원본 파일과 해시가 맞지 않는 레코드 정리
+        if args.prune_cache:
+            pruned = workbook_cache.prune(live_hashes)
+            if pruned:
+                logger.info(f"워크북 캐시 정리: {pruned}건 삭제")
 
     print()
     logger.info(f"분석 완료: 성공 {success_count}건, 실패 {error_count}건")
+    logger.info(f"캐시 사용: {cache_hit_count}건, 재분석: {parsed_count}건")
     print()
 
     # 중복 제품 코드 감지 및 분리
     logger.info("중복 제품 코드를 확인하고 있습니다...")
-    product_codes = {}
-
-    for data in all_data:
-        code = data["basic_info"]["제품코드"]
-        if code not in product_codes:
-            product_codes[code] = []
-        product_codes[code].append(data)
-
-    normal_data = []
-    duplicate_data = []
-
-    for code, products in product_codes.items():
-        if len(products) > 1:
-            # 중복된 코드가 있는 제품들
-            duplicate_data.extend(products)
-            for product in products:
-                logger.warning(
-                    f"⚠️ 중복 제품코드 감지: {code} ({product['source_file']})"
-                )
-        else:
-            # 유일한 코드를 가진 제품
-            normal_data.extend(products)
+    if exporter is not None:
+        # 디스크 코드 인덱스로 중복을 판정하고 duplicates_ 파일로 분리
+        with report.batch.phase("csv_write") if report else nullcontext():
+            exporter.finish()
+        normal_count = exporter.normal_count
+        duplicate_count = exporter.duplicate_count
+    else:
+        normal_data, duplicate_data = split_duplicates(all_data)
+        normal_count = len(normal_data)
+        duplicate_count = len(duplicate_data)
 
-    logger.info(f"- 정상 제품: {len(normal_data)}건")
-    logger.info(f"- 중복 제품: {len(duplicate_data)}건")
+    logger.info(f"- 정상 제품: {normal_count}건")
+    logger.info(f"- 중복 제품: {duplicate_count}건")
     print()
 
     # CSV 파일로 저장
-    if all_data:
+    if success_count:
         if args.dry_run:
             logger.info("DRY-RUN 모드: CSV 파일 생성을 생략합니다.")
+        elif exporter is not None:
+            logger.info("✓ 스트리밍 모드 CSV 저장 완료")
         else:
-            output_path = Path(OUTPUT_DIR)
-
-            # 정상 제품 저장
-            if normal_data:
-                export_to_csv(normal_data, output_path)
-                logger.info(f"✓ 정상 제품 데이터 저장 완료")
-
-            # 중복 제품 저장 (파일명 앞에 'duplicates_' 접두어 추가)
-            if duplicate_data:
-                export_to_csv(duplicate_data, output_path, prefix="duplicates_")
-                logger.info(f"✓ 중복 제품 데이터 저장 완료 (duplicates_ 접두어 확인)")
+            with report.batch.phase("csv_write") if report else nullcontext():
+                # 정상 제품 저장
+                if normal_data:
+                    export_to_csv(normal_data, output_path, fmt=args.format)
+                    logger.info(f"✓ 정상 제품 데이터 저장 완료")
+
+                # 중복 제품 저장 (파일명 앞에 'duplicates_' 접두어 추가)
+                if duplicate_data:
+                    export_to_csv(
+                        duplicate_data,
+                        output_path,
+                        prefix="duplicates_",
+                        fmt=args.format,
+                    )
+                    logger.info(
+                        f"✓ 중복 제품 데이터 저장 완료 (duplicates_ 접두어 확인)"
+                    )
+
+        # 화장품 유형/재활용등급 JSON 저장 (같은 분석 과정에서 추출한 값)
+        if not args.dry_run:
+            export_standard_fields_json(standard_fields, output_path)
+            logger.info(f"✓ {STANDARD_FIELDS_FILENAME} 저장 완료")
 
         # 최종 요약 출력
         print()
@@ -478,24 +1122,20 @@ def main():
         logger.info(f"총 처리 파일: {len(files)}")
         logger.info(f"성공 건수: {success_count}")
         logger.info(f"실패 건수: {error_count}")
+        logger.info(f"캐시 사용 건수: {cache_hit_count}")
+        logger.info(f"재분석 건수: {parsed_count}")
         logger.info("-" * 30)
 
-        allergen_count = sum(
-            1
-            for d in all_data
-            if d["basic_info"].get("Allergen국문")
-            or d["basic_info"].get("Allergen영문")
-        )
-        logger.info(f"알러젠 정보 추출: {allergen_count}/{len(all_data)}개 제품")
-
-        total_bom = sum(len(d["bom"]) for d in all_data)
-        total_qc = sum(len(d["qc_semi"]) + len(d["qc_finished"]) for d in all_data)
+        logger.info(f"알러젠 정보 추출: {allergen_count}/{success_count}개 제품")
         logger.info(f"추출된 총 BOM 항목: {total_bom}건")
         logger.info(f"추출된 총 QC 규격: {total_qc}건")
 
         if not args.dry_run:
-            logger.info(f"결과 저장 위치: {Path(OUTPUT_DIR).absolute()}")
+            logger.info(f"결과 저장 위치: {output_path.absolute()}")
         logger.info("=" * 60)
+
+        if report is not None:
+            log_profile_report(report, output_path, write=not args.dry_run)
     else:
         logger.error("변환할 데이터가 없습니다.")
         sys.exit(1)
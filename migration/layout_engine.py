@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+[선언형 셀 배치(Layout) 추출 엔진]
+
+엑셀 양식의 "어느 셀에 무엇이 있는지"를 코드 대신 설정(dict)으로 선언하고,
+이를 추출 계획(LayoutPlan)으로 컴파일하여 시트에서 값을 뽑아냅니다.
+
+지원하는 항목 유형:
+    cell  : 고정 셀 하나                   {"type": "cell", "cell": "D18"}
+    cells : 고정 셀 여러 개 (dict로 반환)   {"type": "cells", "cells": {"제품코드": (6, 1)}}
+    rows  : 행 범위/목록 (list로 반환)      {"type": "rows", "rows": (13, 100), "key": 1,
+                                             "stop_when_empty": True, "columns": {...}}
+    label : 라벨 기준 위치                  {"type": "label", "label": "저장방법", "exact": True,
+                                             "col": 0, "value_col": 3, "default": (17, 3)}
+            (skip_empty=True이면 값이 빈 라벨은 건너뛰고 다음 라벨 위치를 확인,
+             normalize=False이면 공백을 무시하지 않고 셀 텍스트 그대로 비교)
+
+좌표는 0부터 시작하는 (행, 열) 튜플 또는 "H12" 같은 엑셀 주소 문자열로 적을 수 있습니다.
+열만 적는 곳(columns, key, value_col)에는 정수 또는 "H" 같은 열 문자를 쓸 수 있습니다.
+
+값 변환(convert):
+    cell : 빈 셀은 "", 숫자는 그대로, 나머지는 앞뒤 공백을 제거한 문자열 (기본값)
+    text : cell 변환 결과를 str()로 바꾼 뒤 앞뒤 공백 제거
+    display : text와 같으나 정수 값 숫자는 소수점 없이 표시 (예: 2.0 -> "2", pandas 읽기와 동일)
+    raw  : 시트에 저장된 값 그대로
+
+추출 시에는 필요한 행만 행 단위로 한 번씩 읽어 캐시하므로(xlrd: row_types/row_values,
+openpyxl: iter_rows 한 번), 셀마다 함수를 호출하던 방식보다 호출 비용이 크게 줄어듭니다.
+xlrd/openpyxl 어느 쪽에도 직접 의존하지 않습니다.
+"""
+
+import re
+
+# xlrd와 동일한 셀 타입 코드
+XL_CELL_EMPTY = 0
+XL_CELL_TEXT = 1
+XL_CELL_NUMBER = 2
+
+
+def normalize_label(value) -> str:
+    """라벨 비교용으로 텍스트의 모든 공백(줄바꿈 포함)을 제거합니다."""
+    return re.sub(r"\s+", "", str(value))
+
+
+def find_labels(index: dict, label: str, exact: bool = False, col: int = None) -> list:
+    """
+    라벨 인덱스에서 라벨의 모든 위치 (행, 열)를 시트 전체 검색과 같은 행 우선 순서로 반환합니다.
+    - exact=False: 라벨을 포함하는 셀도 찾습니다. (예: 'Allergen(국문)' 표기 앞뒤에 설명이 붙은 경우)
+    - col: 지정하면 해당 열에 있는 라벨만 찾습니다.
+    """
+    needle = normalize_label(label)
+    if exact:
+        candidates = index.get(needle, [])
+    else:
+        candidates = [
+            pos for key, positions in index.items() if needle in key for pos in positions
+        ]
+    if col is not None:
+        candidates = [pos for pos in candidates if pos[1] == col]
+    return sorted(candidates)
+
+
+def column_index(col) -> int:
+    """열 지정("H", "AB" 또는 정수)을 0부터 시작하는 열 번호로 바꿉니다."""
+    if isinstance(col, int):
+        return col
+    index = 0
+    for ch in col.upper():
+        index = index * 26 + (ord(ch) - ord("A") + 1)
+    return index - 1
+
+
+def cell_position(ref) -> tuple:
+    """셀 지정("H12" 또는 (행, 열))을 0부터 시작하는 (행, 열)로 바꿉니다."""
+    if isinstance(ref, str):
+        match = re.fullmatch(r"([A-Za-z]+)(\d+)", ref.strip())
+        if not match:
+            raise ValueError(f"잘못된 셀 주소입니다: {ref}")
+        return int(match.group(2)) - 1, column_index(match.group(1))
+    row, col = ref
+    return row, column_index(col)
+
+
+def convert_cell(ctype: int, value, convert: str = "cell"):
+    """셀 타입과 값을 지정한 변환 방식에 따라 변환합니다. (xlrd 셀 타입별 기존 셀 읽기 규칙과 동일)"""
+    if convert == "raw":
+        return value
+    if ctype == XL_CELL_EMPTY:
+        result = ""
+    elif ctype == XL_CELL_NUMBER:
+        # 숫자인 경우 소수점 포함 그대로 반환
+        result = value
+    else:
+        # 문자열인 경우 앞뒤 공백 제거 후 반환
+        result = str(value).strip() if value else ""
+    if convert == "display" and isinstance(result, float) and result.is_integer():
+        result = int(result)
+    if convert in ("text", "display"):
+        return str(result).strip()
+    return result
+
+
+class SheetRows:
+    """
+    시트의 행을 필요할 때 한 번씩만 읽어 (셀타입, 값) 목록으로 캐시합니다.
+    xlrd 시트와 openpyxl 워크시트를 모두 지원합니다.
+    """
+
+    def __init__(self, sheet):
+        self.sheet = sheet
+        self.is_xlrd = hasattr(sheet, "row_types")
+        self.label_scanned = False
+        self._rows = {}
+        self._label_index = None
+
+    @property
+    def nrows(self) -> int:
+        if self.is_xlrd:
+            return self.sheet.nrows
+        return self.sheet.max_row or 0
+
+    @staticmethod
+    def _openpyxl_cells(values) -> list:
+        cells = []
+        for value in values:
+            if value is None or value == "":
+                cells.append((XL_CELL_EMPTY, value))
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                cells.append((XL_CELL_NUMBER, value))
+            else:
+                cells.append((XL_CELL_TEXT, value))
+        return cells
+
+    def prefetch(self, rows):
+        """여러 행을 한 번에 읽어 둡니다. (openpyxl은 iter_rows 한 번으로 처리)"""
+        missing = sorted(r for r in set(rows) if r not in self._rows)
+        if not missing:
+            return
+        if self.is_xlrd:
+            for r in missing:
+                self.row(r)
+            return
+
+        wanted = set(missing)
+        for r, values in enumerate(
+            self.sheet.iter_rows(
+                min_row=missing[0] + 1, max_row=missing[-1] + 1, values_only=True
+            ),
+            start=missing[0],
+        ):
+            if r in wanted:
+                self._rows[r] = self._openpyxl_cells(values)
+        for r in missing:
+            self._rows.setdefault(r, [])
+
+    def row(self, r: int) -> list:
+        """r번째 행의 (셀타입, 값) 목록을 반환합니다. 범위를 벗어나면 빈 목록."""
+        cells = self._rows.get(r)
+        if cells is not None:
+            return cells
+        if self.is_xlrd:
+            if 0 <= r < self.sheet.nrows:
+                cells = list(zip(self.sheet.row_types(r), self.sheet.row_values(r)))
+            else:
+                cells = []
+            self._rows[r] = cells
+        else:
+            self.prefetch([r])
+            cells = self._rows[r]
+        return cells
+
+    def value(self, r: int, c: int, convert: str = "cell"):
+        """(r, c) 셀 값을 변환하여 반환합니다. 범위를 벗어나면 빈 셀로 취급합니다."""
+        cells = self.row(r)
+        if 0 <= c < len(cells):
+            ctype, value = cells[c]
+        else:
+            ctype, value = XL_CELL_EMPTY, ("" if self.is_xlrd else None)
+        return convert_cell(ctype, value, convert)
+
+    def label_index(self) -> dict:
+        """
+        시트 전체를 한 번 훑어 '정규화된 라벨 텍스트 -> [(행, 열), ...]' 인덱스를 만듭니다.
+        인덱스는 시트당 한 번만 만들어지며, 라벨은 문자열 셀만 대상으로 합니다.
+        """
+        if self._label_index is not None:
+            return self._label_index
+
+        self.label_scanned = True
+        if self.is_xlrd:
+            rows = range(self.sheet.nrows)
+        else:
+            count = 0
+            for r, values in enumerate(self.sheet.iter_rows(values_only=True)):
+                self._rows[r] = self._openpyxl_cells(values)
+                count = r + 1
+            rows = range(count)
+
+        index = {}
+        for r in rows:
+            for c, (_, value) in enumerate(self.row(r)):
+                if not isinstance(value, str):
+                    continue
+                key = normalize_label(value)
+                if key:
+                    index.setdefault(key, []).append((r, c))
+        self._label_index = index
+        return index
+
+
+class _CellField:
+    def __init__(self, spec: dict, convert: str):
+        self.pos = cell_position(spec["cell"])
+        self.convert = convert
+
+    def rows(self) -> set:
+        return {self.pos[0]}
+
+    def extract(self, rows: SheetRows):
+        return rows.value(*self.pos, self.convert)
+
+
+class _CellsField:
+    def __init__(self, spec: dict, convert: str):
+        self.cells = {name: cell_position(ref) for name, ref in spec["cells"].items()}
+        self.convert = convert
+
+    def rows(self) -> set:
+        return {r for r, _ in self.cells.values()}
+
+    def extract(self, rows: SheetRows) -> dict:
+        return {
+            name: rows.value(r, c, self.convert) for name, (r, c) in self.cells.items()
+        }
+
+
+class _RowsField:
+    def __init__(self, spec: dict, convert: str):
+        row_spec = spec["rows"]
+        if isinstance(row_spec, tuple):
+            self.row_numbers = list(range(*row_spec))
+        else:
+            self.row_numbers = list(row_spec)
+        self.columns = {
+            name: column_index(col) for name, col in spec["columns"].items()
+        }
+        self.key = column_index(spec["key"]) if "key" in spec else None
+        self.stop_when_empty = spec.get("stop_when_empty", False)
+        self.convert = convert
+
+    def rows(self) -> set:
+        # 빈 행에서 멈추는 범위는 실제로 몇 행을 읽을지 알 수 없으므로 미리 읽지 않음
+        return set() if self.stop_when_empty else set(self.row_numbers)
+
+    def extract(self, rows: SheetRows) -> list:
+        records = []
+        for r in self.row_numbers:
+            if self.key is not None:
+                key_value = rows.value(r, self.key, self.convert)
+                if not key_value:
+                    if self.stop_when_empty:
+                        break
+                    continue
+            records.append(
+                {
+                    name: rows.value(r, c, self.convert)
+                    for name, c in self.columns.items()
+                }
+            )
+        return records
+
+
+class _LabelField:
+    """
+    라벨 기준 항목.
+    - fixed: 라벨이 있어야 할 고정 셀. 이 셀에 라벨이 있으면 인덱스 없이 바로 값을 읽습니다.
+    - offset: 라벨 셀 기준 값 위치 (행, 열 차이). 예: (1, 0) = 바로 아래 셀
+    - value_col: 라벨과 같은 행의 값 열 (offset 대신 사용)
+    - default: 라벨을 찾지 못했을 때 값을 읽을 고정 셀
+    - skip_empty: True이면 값이 비어 있는 라벨은 건너뛰고 다음 라벨 위치의 값을 확인
+    - max_row: 지정하면 이 행(0부터 시작) 앞에 있는 라벨만 찾습니다.
+    - normalize: False이면 공백 차이를 무시하지 않고 셀 텍스트에 라벨이 그대로 들어 있어야 합니다.
+      (인덱스는 공백을 제거한 키이므로 후보를 찾은 뒤 원래 셀 텍스트로 다시 확인)
+    """
+
+    def __init__(self, spec: dict, convert: str):
+        self.label = spec["label"]
+        self.exact = spec.get("exact", False)
+        self.col = column_index(spec["col"]) if "col" in spec else None
+        self.fixed = cell_position(spec["fixed"]) if "fixed" in spec else None
+        self.offset = tuple(spec.get("offset", (0, 0)))
+        self.value_col = (
+            column_index(spec["value_col"]) if "value_col" in spec else None
+        )
+        self.default = cell_position(spec["default"]) if "default" in spec else None
+        self.skip_empty = spec.get("skip_empty", False)
+        self.max_row = spec.get("max_row")
+        self.normalize = spec.get("normalize", True)
+        self.convert = convert
+
+    def _value_at(self, rows: SheetRows, pos: tuple):
+        if self.value_col is not None:
+            return rows.value(pos[0], self.value_col, self.convert)
+        return rows.value(pos[0] + self.offset[0], pos[1] + self.offset[1], self.convert)
+
+    def _matches(self, text: str) -> bool:
+        if self.exact:
+            return text == self.label
+        return self.label in text
+
+    def rows(self) -> set:
+        if self.fixed is None:
+            return set()
+        return {self.fixed[0], self.fixed[0] + self.offset[0]}
+
+    def extract(self, rows: SheetRows):
+        # 1단계: 고정 위치 확인 (라벨 인덱스 없이)
+        if self.fixed is not None:
+            if self.label in str(rows.value(*self.fixed, "cell")):
+                value = self._value_at(rows, self.fixed)
+                if value:
+                    return value
+
+        # 2단계: 라벨 인덱스로 검색
+        positions = find_labels(
+            rows.label_index(), self.label, exact=self.exact, col=self.col
+        )
+        if self.max_row is not None:
+            positions = [pos for pos in positions if pos[0] < self.max_row]
+        if not self.normalize:
+            positions = [
+                pos for pos in positions if self._matches(str(rows.value(*pos, "raw")))
+            ]
+        for pos in positions:
+            value = self._value_at(rows, pos)
+            if value or not self.skip_empty:
+                return value
+        if positions:
+            return convert_cell(XL_CELL_EMPTY, "", self.convert)
+        if self.default is not None:
+            return rows.value(*self.default, self.convert)
+        return convert_cell(XL_CELL_EMPTY, "", self.convert)
+
+
+_FIELD_TYPES = {
+    "cell": _CellField,
+    "cells": _CellsField,
+    "rows": _RowsField,
+    "label": _LabelField,
+}
+
+
+class LayoutPlan:
+    """
+    선언형 배치(layout)를 컴파일한 추출 계획입니다.
+    시트마다 extract()를 호출하면 배치에 선언된 이름별로 추출 결과를 담은 dict를 반환합니다.
+    """
+
+    def __init__(self, layout: dict):
+        self.fields = {}
+        for name, spec in layout.items():
+            field_type = _FIELD_TYPES.get(spec.get("type"))
+            if field_type is None:
+                raise ValueError(f"알 수 없는 항목 유형입니다: {name} ({spec.get('type')})")
+            self.fields[name] = field_type(spec, spec.get("convert", "cell"))
+
+        # 고정 위치 행은 미리 한 번에 읽음
+        self.prefetch_rows = set()
+        for field in self.fields.values():
+            self.prefetch_rows |= field.rows()
+
+    def extract(self, sheet, rows: SheetRows = None) -> dict:
+        """
+        시트에서 배치에 선언된 값을 추출합니다.
+        rows를 넘기면 해당 행 캐시를 재사용합니다. (같은 시트를 여러 계획으로 읽을 때)
+        """
+        if rows is None:
+            rows = SheetRows(sheet)
+        rows.prefetch(self.prefetch_rows)
+        return {name: field.extract(rows) for name, field in self.fields.items()}
+
+
+def compile_layout(layout: dict) -> LayoutPlan:
+    """선언형 배치를 추출 계획으로 컴파일합니다."""
+    return LayoutPlan(layout)
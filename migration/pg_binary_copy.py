@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+[PostgreSQL 바이너리 COPY 인코더]
+
+COPY ... FROM STDIN WITH (FORMAT binary)에 보낼 데이터를 만듭니다.
+텍스트 CSV COPY는 서버가 모든 숫자/날짜 값을 문자열에서 다시 해석하고,
+pandas가 정수를 3.0처럼 실수 형태로 쓰는 문제가 생길 수 있습니다.
+바이너리 형식은 대상 컬럼 형식(스키마 기준)에 맞춰 값을 직접 인코딩합니다.
+
+지원 형식: INT(int4), DECIMAL/NUMERIC, DATE, UUID, TEXT, TEXT[]
+값은 Python 값(int, float, Decimal, date, str 등)이나 CSV에서 읽은 문자열 모두 받으며,
+None과 NaN은 NULL로 기록합니다.
+
+사용 예:
+    encoders = [encoder_for("INT"), encoder_for("TEXT")]
+    cur.copy_expert("COPY t (a, b) FROM STDIN WITH (FORMAT binary)",
+                    BinaryCopyStream(rows, encoders))
+"""
+
+import re
+import struct
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+# 파일 머리말: 서명 + 플래그(0) + 확장 영역 길이(0)
+SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+HEADER = SIGNATURE + struct.pack("!ii", 0, 0)
+# 파일 끝: 필드 수 -1
+TRAILER = struct.pack("!h", -1)
+NULL_FIELD = struct.pack("!i", -1)
+
+# DATE는 2000-01-01부터의 일 수로 기록
+POSTGRES_EPOCH = date(2000, 1, 1)
+
+TEXT_OID = 25
+
+NUMERIC_POSITIVE = 0x0000
+NUMERIC_NEGATIVE = 0x4000
+NUMERIC_NAN = 0xC000
+
+
+def _is_null(value) -> bool:
+    # NaN은 자기 자신과 같지 않음 (float NaN, pandas 결측값)
+    return value is None or value != value
+
+
+def _decimal(value) -> Decimal:
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, str):
+        return Decimal(value.strip())
+    if isinstance(value, float):
+        # 가장 짧은 표현으로 변환 (0.1 -> 0.1, 이진 오차 없이)
+        return Decimal(repr(value))
+    return Decimal(int(value))
+
+
+def encode_int4(value) -> bytes:
+    """INT: 4바이트 정수 (문자열 "3", "3.0"과 실수 3.0도 허용, 소수부가 있으면 오류)"""
+    if isinstance(value, str) or isinstance(value, float):
+        number = _decimal(value)
+        if number != number.to_integral_value():
+            raise ValueError(f"정수가 아닌 값: {value!r}")
+        value = int(number)
+    return struct.pack("!i", int(value))
+
+
+def encode_numeric(value) -> bytes:
+    """DECIMAL/NUMERIC: 부호, 10000진수 자릿수, 소수 자릿수(dscale)"""
+    number = _decimal(value)
+    if number.is_nan():
+        return struct.pack("!hhHh", 0, 0, NUMERIC_NAN, 0)
+    if number.is_infinite():
+        raise ValueError(f"NUMERIC에 기록할 수 없는 값: {value!r}")
+
+    sign, digits, exponent = number.as_tuple()
+    text = "".join(map(str, digits))
+    if exponent >= 0:
+        integer, fraction = text + "0" * exponent, ""
+    else:
+        text = text.rjust(-exponent, "0")
+        integer, fraction = text[:exponent], text[exponent:]
+    dscale = max(0, -exponent)
+
+    # 소수점 기준으로 4자리씩 맞춰 10000진수 자릿수로 분할
+    integer = integer.lstrip("0")
+    integer = integer.rjust(-(-len(integer) // 4) * 4, "0")
+    fraction = fraction.ljust(-(-len(fraction) // 4) * 4, "0")
+    groups = [int(integer[i : i + 4]) for i in range(0, len(integer), 4)]
+    groups += [int(fraction[i : i + 4]) for i in range(0, len(fraction), 4)]
+    weight = len(integer) // 4 - 1
+
+    # 앞뒤의 0 자릿수 제거 (앞에서 빼면 weight도 줄어듦)
+    while groups and groups[0] == 0:
+        groups.pop(0)
+        weight -= 1
+    while groups and groups[-1] == 0:
+        groups.pop()
+    if not groups:
+        weight = 0
+
+    header = struct.pack(
+        "!hhHh",
+        len(groups),
+        weight,
+        NUMERIC_NEGATIVE if sign else NUMERIC_POSITIVE,
+        dscale,
+    )
+    return header + struct.pack(f"!{len(groups)}h", *groups)
+
+
+def encode_date(value) -> bytes:
+    """DATE: 2000-01-01부터의 일 수 (문자열은 YYYY-MM-DD)"""
+    if isinstance(value, str):
+        value = date.fromisoformat(value.strip())
+    elif isinstance(value, datetime):
+        value = value.date()
+    return struct.pack("!i", (value - POSTGRES_EPOCH).days)
+
+
+def encode_uuid(value) -> bytes:
+    """UUID: 16바이트"""
+    if not isinstance(value, uuid.UUID):
+        value = uuid.UUID(str(value).strip())
+    return value.bytes
+
+
+def encode_text(value) -> bytes:
+    """TEXT: UTF-8 바이트"""
+    return str(value).encode("utf-8")
+
+
+_ARRAY_ELEMENT = re.compile(r'"((?:[^"\\]|\\.)*)"|([^,]+)')
+
+
+def parse_array_literal(text: str) -> list:
+    """Postgres 배열 문자열({a,"b c"})을 원소 목록으로 (따옴표 없는 NULL은 None)"""
+    text = text.strip()
+    if not (text.startswith("{") and text.endswith("}")):
+        raise ValueError(f"배열 형식이 아닌 값: {text!r}")
+    elements = []
+    for quoted, bare in _ARRAY_ELEMENT.findall(text[1:-1]):
+        if bare:
+            bare = bare.strip()
+            elements.append(None if bare.upper() == "NULL" else bare)
+        else:
+            elements.append(re.sub(r"\\(.)", r"\1", quoted))
+    return elements
+
+
+def encode_text_array(value) -> bytes:
+    """TEXT[]: 1차원 배열 (배열 문자열 또는 목록)"""
+    elements = parse_array_literal(value) if isinstance(value, str) else list(value)
+    if not elements:
+        # 빈 배열: 차원 0
+        return struct.pack("!iii", 0, 0, TEXT_OID)
+
+    has_null = any(element is None for element in elements)
+    parts = [struct.pack("!iiiii", 1, int(has_null), TEXT_OID, len(elements), 1)]
+    for element in elements:
+        if element is None:
+            parts.append(NULL_FIELD)
+        else:
+            data = str(element).encode("utf-8")
+            parts.append(struct.pack("!i", len(data)))
+            parts.append(data)
+    return b"".join(parts)
+
+
+ENCODERS = {
+    "int": encode_int4,
+    "integer": encode_int4,
+    "int4": encode_int4,
+    "decimal": encode_numeric,
+    "numeric": encode_numeric,
+    "date": encode_date,
+    "uuid": encode_uuid,
+    "text": encode_text,
+    "text[]": encode_text_array,
+}
+
+
+def encoder_for(sql_type: str):
+    """스키마의 컬럼 형식(예: "DECIMAL(10,4)", "TEXT[]")에 맞는 인코더. 지원하지 않으면 ValueError"""
+    base = re.sub(r"\(.*?\)", "", sql_type).strip().lower()
+    if base not in ENCODERS:
+        raise ValueError(f"바이너리 COPY에서 지원하지 않는 형식: {sql_type}")
+    return ENCODERS[base]
+
+
+class BinaryCopyStream:
+    """
+    행 목록을 바이너리 COPY 데이터로 인코딩하며 조금씩 내주는 파일 객체입니다.
+    (copy_expert가 read(size)로 읽으므로 전체 데이터를 메모리에 만들지 않음)
+    """
+
+    def __init__(self, rows, encoders: list):
+        self._chunks = self._generate(rows, encoders)
+        self._buffer = b""
+
+    @staticmethod
+    def _generate(rows, encoders):
+        yield HEADER
+        field_count = struct.pack("!h", len(encoders))
+        for row in rows:
+            parts = [field_count]
+            for value, encode in zip(row, encoders):
+                if _is_null(value):
+                    parts.append(NULL_FIELD)
+                    continue
+                data = encode(value)
+                parts.append(struct.pack("!i", len(data)))
+                parts.append(data)
+            yield b"".join(parts)
+        yield TRAILER
+
+    def read(self, size: int = -1) -> bytes:
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        for chunk in self._chunks:
+            chunks.append(chunk)
+            length += len(chunk)
+            if 0 <= size <= length:
+                break
+        data = b"".join(chunks)
+        if size < 0:
+            self._buffer = b""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+[합성 제품표준서 워크북 생성기]
+
+실제 제품표준서(대외비) 없이도 분석기 성능을 측정할 수 있도록
+'입력란' / '제품표준서' 시트 배치를 그대로 따르는 가짜 워크북(.xls/.xlsx)을 만듭니다.
+(셀 위치는 export_to_csv.py의 INPUT_SHEET_LAYOUT / STANDARD_SHEET_LAYOUT과 같습니다.)
+
+조절할 수 있는 항목:
+- BOM 행 수, 반제품/완제품 QC 행 수, 개정 이력 수
+- 알러젠 라벨 위치: fixed(고정 위치 F42/F47), displaced(다른 위치), none(없음), mixed(섞어서)
+- 제품표준서 시트명 변형: 공백이 앞/뒤에 붙은 이름 (mixed)
+- 분석과 무관한 추가 시트 수, 중복 제품코드 비율
+
+필요 라이브러리 (선택):
+- .xls: xlwt
+- .xlsx: openpyxl
+
+사용법:
+    python synthetic_workbooks.py bench_data --count 1000
+    python synthetic_workbooks.py bench_data --count 100 --format xlsx --allergen displaced
+"""
+
+import argparse
+import random
+from pathlib import Path
+
+try:
+    import xlwt
+
+    HAS_XLWT = True
+except ImportError:
+    HAS_XLWT = False
+
+try:
+    from openpyxl import Workbook
+
+    HAS_OPENPYXL = True
+except ImportError:
+    HAS_OPENPYXL = False
+
+# 기본 정보 라벨 (A3~A11) - 값은 B열
+BASIC_INFO_LABELS = [
+    "국문제품명",
+    "영문제품명",
+    "관리번호",
+    "작성일자",
+    "제품코드",
+    "성상",
+    "포장단위",
+    "작성자",
+    "사용법",
+]
+
+QC_ITEMS = [
+    ("성상", "고유의 색과 향을 가진 크림", "육안 검사"),
+    ("pH", "5.0 ~ 7.0", "pH 미터"),
+    ("점도", "10,000 ~ 20,000 cP", "점도계"),
+    ("비중", "0.95 ~ 1.05", "비중계"),
+    ("미생물", "100 CFU/g 이하", "미생물 한도 시험법"),
+    ("중금속", "10 ppm 이하", "원자흡광법"),
+    ("내용량", "표시량의 97% 이상", "중량법"),
+    ("향", "표준품과 동일", "관능 검사"),
+]
+
+APPEARANCES = ["크림", "로션", "액상", "젤", "오일", "에멀젼"]
+PACKAGING_UNITS = ["50ml", "100ml", "150ml", "200ml", "30g", "500ml"]
+AUTHORS = ["김연구", "이품질", "박개발", "최처방"]
+STORAGE_METHODS = ["기밀용기, 실온보관", "차광 기밀용기, 서늘한 곳", "밀폐용기, 직사광선을 피해 보관"]
+SHELF_LIVES = ["제조일로부터 36개월", "제조일로부터 30개월", "개봉 후 12개월"]
+COSMETIC_TYPES = ["기초화장용 제품류", "세안용 제품류", "두발용 제품류", "인체 세정용 제품류"]
+RECYCLING_GRADES = ["재활용 어려움", " 재활용 보통", "재활용 우수"]
+ALLERGENS_KR = ["리모넨", "리날룰", "시트로넬올", "제라니올", "쿠마린", "벤질알코올"]
+ALLERGENS_EN = ["Limonene", "Linalool", "Citronellol", "Geraniol", "Coumarin", "Benzyl Alcohol"]
+
+STANDARD_SHEET_VARIANTS = ["제품표준서", "제품표준서 ", " 제품표준서"]
+EXTRA_SHEET_NAMES = ["제조공정", "원료목록", "포장사양", "안정성", "변경이력", "참고"]
+
+# 알러젠 고정 위치 (F42/F47 라벨, 바로 아래 셀에 값)
+ALLERGEN_KR_POS = (41, 5)
+ALLERGEN_EN_POS = (46, 5)
+
+
+def _excel_date(rng: random.Random) -> float:
+    """2015~2024년 사이의 엑셀 날짜 일련번호"""
+    return float(rng.randint(42005, 45657))
+
+
+def _allergen_text(rng: random.Random, names: list) -> str:
+    return ", ".join(rng.sample(names, rng.randint(1, 4)))
+
+
+def build_input_sheet(
+    rng: random.Random,
+    product_code: str,
+    management_code: str,
+    bom_rows: int,
+    qc_semi_rows: int,
+    qc_finished_rows: int,
+    allergen: str,
+) -> dict:
+    """'입력란' 시트의 셀 dict {(행, 열): 값}를 만듭니다."""
+    cells = {(0, 0): "제품표준서 입력란"}
+
+    values = [
+        f"합성 {rng.choice(APPEARANCES)} {product_code}",
+        f"Synthetic Product {product_code}",
+        management_code,
+        _excel_date(rng),
+        product_code,
+        rng.choice(APPEARANCES),
+        rng.choice(PACKAGING_UNITS),
+        rng.choice(AUTHORS),
+        "적당량을 취해 피부에 골고루 펴 바른다.",
+    ]
+    for i, (label, value) in enumerate(zip(BASIC_INFO_LABELS, values)):
+        cells[(2 + i, 0)] = label
+        cells[(2 + i, 1)] = value
+
+    # QC 규격: 반제품 3~7행, 완제품 9~40행 (E:순번, F:항목, G:시험기준, I:시험방법)
+    cells[(1, 4)] = "반제품 QC"
+    for i in range(min(qc_semi_rows, 5)):
+        item, spec, method = QC_ITEMS[i % len(QC_ITEMS)]
+        row = 2 + i
+        cells[(row, 4)] = float(i + 1)
+        cells[(row, 5)] = item
+        cells[(row, 6)] = spec
+        cells[(row, 8)] = method
+    cells[(7, 4)] = "완제품 QC"
+    for i in range(min(qc_finished_rows, 32)):
+        item, spec, method = QC_ITEMS[i % len(QC_ITEMS)]
+        row = 8 + i
+        cells[(row, 4)] = float(i + 1)
+        cells[(row, 5)] = item
+        cells[(row, 6)] = spec
+        cells[(row, 8)] = method
+
+    # BOM: 14행부터 (A:순번, B:원료코드, C:함량), 함량 합계 100
+    cells[(12, 0)] = "순번"
+    cells[(12, 1)] = "원료코드"
+    cells[(12, 2)] = "함량"
+    count = min(bom_rows, 86)
+    weights = [rng.random() for _ in range(count)]
+    total = sum(weights) or 1.0
+    for i, weight in enumerate(weights):
+        row = 13 + i
+        cells[(row, 0)] = float(i + 1)
+        cells[(row, 1)] = f"MA{rng.randint(1, 9999):04d}"
+        cells[(row, 2)] = round(weight / total * 100, 4)
+
+    # 알러젠
+    if allergen == "fixed":
+        kr_pos, en_pos = ALLERGEN_KR_POS, ALLERGEN_EN_POS
+    elif allergen == "displaced":
+        # 고정 위치가 아닌 곳 (BOM/QC 영역 밖의 H열, 행 위치는 임의)
+        base = rng.randint(42, 80)
+        kr_pos, en_pos = (base, 7), (base + 3, 7)
+    else:
+        kr_pos = en_pos = None
+    if kr_pos:
+        cells[kr_pos] = "Allergen(국문)"
+        cells[(kr_pos[0] + 1, kr_pos[1])] = _allergen_text(rng, ALLERGENS_KR)
+        cells[en_pos] = "Allergen(영문)"
+        cells[(en_pos[0] + 1, en_pos[1])] = _allergen_text(rng, ALLERGENS_EN)
+
+    return cells
+
+
+def build_standard_sheet(rng: random.Random, revisions: int) -> dict:
+    """'제품표준서' 시트의 셀 dict를 만듭니다. (A열 라벨, D열 값)"""
+    cells = {(0, 0): "제 품 표 준 서"}
+    for row, (label, choices) in {
+        17: ("저장방법", STORAGE_METHODS),
+        18: ("사용기한", SHELF_LIVES),
+        19: ("화장품 유형", COSMETIC_TYPES),
+        20: ("재활용등급표시", RECYCLING_GRADES),
+    }.items():
+        cells[(row, 0)] = label
+        cells[(row, 3)] = rng.choice(choices)
+
+    # 개정 이력: 23~27행 (A:일련번호, B:개정년월일, C:개정사항)
+    cells[(21, 0)] = "일련번호"
+    cells[(21, 1)] = "개정년월일"
+    cells[(21, 2)] = "개정사항"
+    for i in range(min(revisions, 5)):
+        row = 22 + i
+        cells[(row, 0)] = float(i + 1)
+        cells[(row, 1)] = f"{rng.randint(2015, 2024)}.{rng.randint(1, 12):02d}.{rng.randint(1, 28):02d}"
+        cells[(row, 2)] = "제정" if i == 0 else f"{i}차 개정 (처방 변경)"
+    return cells
+
+
+def build_extra_sheet(rng: random.Random, rows: int = 40, cols: int = 8) -> dict:
+    """분석과 무관한 시트 (on_demand 읽기 효과 측정용)"""
+    return {
+        (r, c): (rng.random() * 100 if (r + c) % 3 else f"기타 {r}-{c}")
+        for r in range(rows)
+        for c in range(cols)
+    }
+
+
+def _write_xls(path: Path, sheets: list):
+    if not HAS_XLWT:
+        raise RuntimeError(".xls 파일을 만들려면 xlwt가 필요합니다. (pip install xlwt)")
+    workbook = xlwt.Workbook(encoding="utf-8")
+    for name, cells in sheets:
+        sheet = workbook.add_sheet(name, cell_overwrite_ok=True)
+        for (row, col), value in cells.items():
+            sheet.write(row, col, value)
+    workbook.save(str(path))
+
+
+def _write_xlsx(path: Path, sheets: list):
+    if not HAS_OPENPYXL:
+        raise RuntimeError(
+            ".xlsx 파일을 만들려면 openpyxl이 필요합니다. (pip install openpyxl)"
+        )
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for name, cells in sheets:
+        sheet = workbook.create_sheet(name)
+        for (row, col), value in cells.items():
+            sheet.cell(row=row + 1, column=col + 1, value=value)
+    workbook.save(str(path))
+
+
+WRITERS = {"xls": _write_xls, "xlsx": _write_xlsx}
+
+
+def generate_workbook(
+    path: Path,
+    rng: random.Random,
+    product_code: str,
+    management_code: str,
+    bom_rows: int = 30,
+    qc_semi_rows: int = 5,
+    qc_finished_rows: int = 20,
+    revisions: int = 3,
+    allergen: str = "fixed",
+    standard_sheet_name: str = "제품표준서",
+    extra_sheets: int = 2,
+    fmt: str = "xls",
+):
+    """합성 워크북 하나를 만듭니다."""
+    sheets = [
+        (
+            "입력란",
+            build_input_sheet(
+                rng,
+                product_code,
+                management_code,
+                bom_rows,
+                qc_semi_rows,
+                qc_finished_rows,
+                allergen,
+            ),
+        ),
+        (standard_sheet_name, build_standard_sheet(rng, revisions)),
+    ]
+    for name in EXTRA_SHEET_NAMES[:extra_sheets]:
+        sheets.append((name, build_extra_sheet(rng)))
+    WRITERS[fmt](path, sheets)
+
+
+def generate_corpus(
+    output_dir: Path,
+    count: int,
+    fmt: str = "xls",
+    seed: int = 0,
+    bom_rows: int = 30,
+    qc_rows: int = 25,
+    revisions: int = 3,
+    allergen: str = "mixed",
+    sheet_names: str = "mixed",
+    extra_sheets: int = 2,
+    duplicate_rate: float = 0.01,
+) -> list:
+    """
+    합성 워크북 count개를 output_dir에 만들고 경로 목록을 반환합니다.
+    같은 seed로 만들면 항상 같은 파일이 생성됩니다.
+    이미 있는 파일은 다시 만들지 않으므로 더 큰 count로 다시 실행하면 부족한 파일만 추가됩니다.
+    - bom_rows / qc_rows: 파일마다 이 값의 50~100% 사이에서 정합니다. (qc_rows는 반제품 최대 5행 + 나머지 완제품)
+    - allergen: fixed / displaced / none / mixed
+    - sheet_names: standard(항상 '제품표준서') / mixed(공백 변형 포함)
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        rng = random.Random(f"{seed}:{i}")
+        product_code = f"SYN{i:05d}"
+        if i and rng.random() < duplicate_rate:
+            # 중복 제품코드 (앞선 파일의 코드를 재사용)
+            product_code = f"SYN{rng.randrange(i):05d}"
+        management_code = f"EVCO{i:05d}"
+        path = output_dir / f"{i:05d}_{management_code}_합성제품({product_code}).{fmt}"
+        paths.append(path)
+        if path.exists():
+            continue
+
+        placement = allergen
+        if allergen == "mixed":
+            placement = rng.choices(["fixed", "displaced", "none"], [0.7, 0.2, 0.1])[0]
+        sheet_name = "제품표준서"
+        if sheet_names == "mixed":
+            sheet_name = rng.choices(STANDARD_SHEET_VARIANTS, [0.8, 0.1, 0.1])[0]
+        qc_total = rng.randint(qc_rows // 2, qc_rows)
+        generate_workbook(
+            path,
+            rng,
+            product_code,
+            management_code,
+            bom_rows=rng.randint(bom_rows // 2, bom_rows),
+            qc_semi_rows=min(5, qc_total),
+            qc_finished_rows=max(0, qc_total - 5),
+            revisions=rng.randint(1, revisions) if revisions else 0,
+            allergen=placement,
+            standard_sheet_name=sheet_name,
+            extra_sheets=extra_sheets,
+            fmt=fmt,
+        )
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 제품표준서 워크북 생성기")
+    parser.add_argument("output_dir", type=str, help="워크북을 만들 폴더")
+    parser.add_argument("--count", type=int, default=100, help="만들 파일 수 (기본 100)")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="xls")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bom", type=int, default=30, help="최대 BOM 행 수 (기본 30)")
+    parser.add_argument("--qc", type=int, default=25, help="최대 QC 행 수 (기본 25)")
+    parser.add_argument("--revisions", type=int, default=3, help="최대 개정 이력 수")
+    parser.add_argument(
+        "--allergen",
+        choices=["fixed", "displaced", "none", "mixed"],
+        default="mixed",
+        help="알러젠 라벨 위치 (기본 mixed)",
+    )
+    parser.add_argument(
+        "--sheet-names",
+        choices=["standard", "mixed"],
+        default="mixed",
+        help="제품표준서 시트명 변형 사용 여부",
+    )
+    parser.add_argument("--extra-sheets", type=int, default=2, help="추가 시트 수")
+    parser.add_argument(
+        "--duplicate-rate", type=float, default=0.01, help="중복 제품코드 비율"
+    )
+    args = parser.parse_args()
+
+    paths = generate_corpus(
+        Path(args.output_dir),
+        args.count,
+        fmt=args.format,
+        seed=args.seed,
+        bom_rows=args.bom,
+        qc_rows=args.qc,
+        revisions=args.revisions,
+        allergen=args.allergen,
+        sheet_names=args.sheet_names,
+        extra_sheets=args.extra_sheets,
+        duplicate_rate=args.duplicate_rate,
+    )
+    print(f"{len(paths)}개 파일 준비 완료: {Path(args.output_dir).absolute()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+[테이블 파일 입출력 모듈]
+
+마이그레이션 단계 사이에 주고받는 표 데이터를 CSV 또는 Parquet 형식으로 읽고 씁니다.
+
+- csv     : UTF-8-SIG CSV. 사람이 엑셀/대시보드에서 확인하거나 직접 임포트할 때 사용 (기본값)
+- parquet : 컬럼형 Parquet. 단계 사이 중간 파일용으로, 자료형이 보존되어
+            다음 단계에서 문자열을 다시 해석하거나 자료형을 추론하지 않습니다.
+            반복되는 코드 컬럼(제품코드, 원료코드 등)은 사전(dictionary) 인코딩으로 저장합니다.
+
+행 단위 작성기(TableWriter)는 컬럼 형식(int/float/date/string)을 지정받아
+Parquet 컬럼을 해당 자료형으로 기록합니다. (지정하지 않은 컬럼은 문자열)
+
+Parquet은 pyarrow가 필요합니다. (pip install pyarrow)
+읽는 쪽은 같은 이름의 .csv/.parquet 중 최근에 기록된 파일을 자동으로 선택합니다.
+"""
+
+import re
+from datetime import date, timedelta
+from pathlib import Path
+
+FORMATS = ("csv", "parquet")
+EXTENSIONS = {"csv": ".csv", "parquet": ".parquet"}
+
+# 사전 인코딩할 반복 코드 컬럼 (한글 헤더는 export_to_csv.py / Data_prep 원본 기준)
+DICTIONARY_COLUMNS = {
+    "제품코드",
+    "관리번호",
+    "원료코드",
+    "품목코드",
+    "QC유형",
+    "공급업체",
+    "향료코드",
+    "product_code",
+    "management_code",
+    "ingredient_code",
+    "semi_product_code",
+    "p_product_code",
+    "qc_type",
+    "supplier",
+    "fragrance_code",
+    "fragrance_id",
+    "allergen_id",
+    "process_id",
+    "step_type",
+}
+
+# Parquet 행 그룹 크기 (TableWriter는 이 개수만큼 모아서 기록)
+ROW_GROUP_SIZE = 50000
+
+PARQUET_COMPRESSION = "zstd"
+
+# 엑셀 날짜 일련번호의 기준일 (1900 윤년 버그 반영)
+EXCEL_EPOCH = date(1899, 12, 30)
+
+# 텍스트 날짜: 2014.12.08 / 2014-12-08 / 2014/12/08 (끝의 마침표 허용)
+_DATE_TEXT = re.compile(r"(\d{4})\s*[.\-/]\s*(\d{1,2})\s*[.\-/]\s*(\d{1,2})\.?")
+
+
+def require_pyarrow():
+    """pyarrow 모듈을 불러옵니다. 설치되어 있지 않으면 안내 메시지와 함께 ImportError."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "Parquet 형식에는 pyarrow가 필요합니다: pip install pyarrow"
+        ) from e
+    return pyarrow
+
+
+def table_path(path, fmt: str) -> Path:
+    """확장자를 형식에 맞게 바꾼 경로 (예: products.csv -> products.parquet)"""
+    if fmt not in EXTENSIONS:
+        raise ValueError(f"지원하지 않는 형식: {fmt} (csv, parquet 중 선택)")
+    return Path(path).with_suffix(EXTENSIONS[fmt])
+
+
+def find_table(path):
+    """
+    같은 이름의 .csv/.parquet 중 존재하는 파일을 찾습니다.
+    둘 다 있으면 최근에 기록된 파일을 반환하고, 없으면 None.
+    """
+    candidates = [table_path(path, fmt) for fmt in FORMATS]
+    existing = [p for p in candidates if p.exists()]
+    if not existing:
+        return None
+    return max(existing, key=lambda p: p.stat().st_mtime)
+
+
+def table_format(path) -> str:
+    """파일 확장자로 형식을 판정합니다."""
+    return "parquet" if Path(path).suffix == EXTENSIONS["parquet"] else "csv"
+
+
+def _dictionary_columns(columns) -> list:
+    return [name for name in columns if name in DICTIONARY_COLUMNS]
+
+
+def write_frame(df, path, fmt: str = "csv") -> Path:
+    """
+    DataFrame을 지정 형식으로 저장하고 실제 저장 경로를 반환합니다.
+    (CSV는 기존과 같이 index 없이 UTF-8-SIG)
+    """
+    path = table_path(path, fmt)
+    if fmt == "csv":
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+        return path
+
+    pa = require_pyarrow()
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pa.parquet.write_table(
+        table,
+        path,
+        use_dictionary=_dictionary_columns(table.column_names),
+        compression=PARQUET_COMPRESSION,
+    )
+    return path
+
+
+def read_frame(path, **csv_kwargs):
+    """
+    CSV/Parquet 파일을 DataFrame으로 읽습니다.
+    확장자 없이 주거나 다른 확장자로 주면 find_table로 실제 파일을 찾습니다.
+    csv_kwargs는 CSV를 읽을 때만 pd.read_csv에 전달합니다.
+    """
+    import pandas as pd
+
+    found = find_table(path)
+    if found is None:
+        raise FileNotFoundError(f"{Path(path).with_suffix('')}.csv/.parquet 없음")
+
+    if table_format(found) == "parquet":
+        require_pyarrow()
+        return pd.read_parquet(found)
+    return pd.read_csv(found, encoding="utf-8-sig", **csv_kwargs)
+
+
+def iter_frames(path, chunksize: int, **csv_kwargs):
+    """
+    CSV/Parquet 파일을 chunksize 행씩 DataFrame으로 나누어 읽습니다. (메모리 사용량 일정)
+    파일 찾기와 csv_kwargs는 read_frame과 같습니다.
+    """
+    import pandas as pd
+
+    found = find_table(path)
+    if found is None:
+        raise FileNotFoundError(f"{Path(path).with_suffix('')}.csv/.parquet 없음")
+
+    if table_format(found) == "parquet":
+        pa = require_pyarrow()
+        for batch in pa.parquet.ParquetFile(found).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+        return
+    yield from pd.read_csv(
+        found, encoding="utf-8-sig", chunksize=chunksize, **csv_kwargs
+    )
+
+
+class FrameWriter:
+    """
+    DataFrame을 여러 번에 나누어 한 파일에 이어 쓰는 작성기입니다. (청크 단위 처리용)
+
+    CSV는 write_frame과 같은 형식(UTF-8-SIG, 헤더 1회)으로 이어 쓰고,
+    Parquet은 첫 DataFrame의 스키마로 write()마다 행 그룹을 기록합니다.
+    """
+
+    def __init__(self, path, fmt: str = "csv"):
+        self.fmt = fmt
+        self.path = table_path(path, fmt)
+        self._writer = None
+        self._schema = None
+        if fmt == "csv":
+            self._file = open(self.path, "w", newline="", encoding="utf-8-sig")
+            self._header = True
+        else:
+            self._pa = require_pyarrow()
+
+    def write(self, df):
+        if self.fmt == "csv":
+            df.to_csv(self._file, index=False, header=self._header)
+            self._header = False
+            return
+
+        pa = self._pa
+        table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        if self._writer is None:
+            # 첫 청크 기준으로 스키마를 정하되, 값이 모두 비어 있는 컬럼은 문자열로,
+            # 범주형 컬럼은 이후 청크에서 값 종류가 늘어날 수 있도록 int32 인덱스로 기록
+            self._schema = pa.schema(
+                [self._chunk_field(pa, field) for field in table.schema],
+                metadata=table.schema.metadata,
+            )
+            table = table.cast(self._schema)
+            self._writer = pa.parquet.ParquetWriter(
+                self.path,
+                self._schema,
+                use_dictionary=_dictionary_columns(table.column_names),
+                compression=PARQUET_COMPRESSION,
+            )
+        self._writer.write_table(table)
+
+    @staticmethod
+    def _chunk_field(pa, field):
+        if pa.types.is_null(field.type):
+            return field.with_type(pa.string())
+        if pa.types.is_dictionary(field.type):
+            return field.with_type(pa.dictionary(pa.int32(), field.type.value_type))
+        return field
+
+    def close(self):
+        if self.fmt == "csv":
+            self._file.close()
+        elif self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+def _to_text(value):
+    # csv.writer와 같은 문자열 변환
+    return value if isinstance(value, str) else str(value)
+
+
+def _to_int(value) -> int:
+    # 엑셀 숫자(1.0)와 숫자 텍스트("1", "1.0")를 정수로, 소수부가 있으면 오류
+    number = float(value.strip()) if isinstance(value, str) else float(value)
+    if not number.is_integer():
+        raise ValueError(f"정수가 아닌 값: {value!r}")
+    return int(number)
+
+
+def _to_float(value) -> float:
+    return float(value.strip()) if isinstance(value, str) else float(value)
+
+
+def _to_date(value) -> date:
+    # 엑셀 날짜 일련번호(숫자, 날짜 셀의 "44000.0" 텍스트 포함) 또는 YYYY.MM.DD 형태의 텍스트
+    if isinstance(value, str):
+        text = value.strip()
+        match = _DATE_TEXT.fullmatch(text)
+        if match:
+            return date(*map(int, match.groups()))
+        value = float(text)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"날짜가 아닌 값: {value!r}")
+    return EXCEL_EPOCH + timedelta(days=int(value))
+
+
+# 컬럼 형식 -> (Arrow 자료형 이름, 변환 함수)
+COLUMN_TYPES = {
+    "string": ("string", _to_text),
+    "int": ("int64", _to_int),
+    "float": ("float64", _to_float),
+    "date": ("date32", _to_date),
+}
+
+
+class TableWriter:
+    """
+    csv.writer처럼 행 단위로 기록하는 표 파일 작성기입니다.
+
+    CSV는 바로 기록하고, Parquet은 ROW_GROUP_SIZE 행씩 모아 행 그룹으로 기록합니다.
+    Parquet 컬럼은 types({컬럼명: "int"/"float"/"date"/"string"})에 지정한 자료형으로,
+    지정하지 않은 컬럼은 CSV와 같은 문자열 값으로 저장합니다. (빈 값은 null)
+    지정한 자료형으로 바꿀 수 없는 값은 null로 기록하고 컬럼별 개수를 invalid에 모읍니다.
+    (원래 값이 모두 필요하면 CSV 형식을 사용)
+    """
+
+    def __init__(self, path, header: list, fmt: str = "csv", types: dict = None):
+        import csv
+
+        self.header = list(header)
+        self.fmt = fmt
+        self.path = table_path(path, fmt)
+        self.invalid = {}
+        self._rows = []
+        self._writer = None
+
+        if fmt == "csv":
+            self._file = open(self.path, "w", newline="", encoding="utf-8-sig")
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(self.header)
+        else:
+            self._pa = require_pyarrow()
+            types = types or {}
+            for name, column_type in types.items():
+                if column_type not in COLUMN_TYPES:
+                    raise ValueError(f"지원하지 않는 컬럼 형식: {name}={column_type}")
+            self._converters = []
+            fields = []
+            for name in self.header:
+                type_name, convert = COLUMN_TYPES[types.get(name, "string")]
+                fields.append((name, getattr(self._pa, type_name)()))
+                self._converters.append(convert)
+            self._schema = self._pa.schema(fields)
+
+    def writerow(self, row: list):
+        if self.fmt == "csv":
+            self._csv.writerow(row)
+            return
+        self._rows.append(row)
+        if len(self._rows) >= ROW_GROUP_SIZE:
+            self._flush()
+
+    def writerows(self, rows):
+        for row in rows:
+            self.writerow(row)
+
+    def _column(self, i: int) -> list:
+        # None/빈 문자열은 null, 변환할 수 없는 값도 null (개수는 invalid에 기록)
+        convert = self._converters[i]
+        values = []
+        for row in self._rows:
+            value = row[i]
+            if value is None or value == "":
+                values.append(None)
+                continue
+            try:
+                values.append(convert(value))
+            except (TypeError, ValueError, OverflowError):
+                name = self.header[i]
+                self.invalid[name] = self.invalid.get(name, 0) + 1
+                values.append(None)
+        return values
+
+    def _flush(self):
+        pa = self._pa
+        columns = [
+            pa.array(self._column(i), type=self._schema.field(i).type)
+            for i in range(len(self.header))
+        ]
+        if self._writer is None:
+            self._writer = pa.parquet.ParquetWriter(
+                self.path,
+                self._schema,
+                use_dictionary=_dictionary_columns(self.header),
+                compression=PARQUET_COMPRESSION,
+            )
+        self._writer.write_table(pa.Table.from_arrays(columns, schema=self._schema))
+        self._rows = []
+
+    def close(self):
+        if self.fmt == "csv":
+            self._file.close()
+            return
+        if self._rows or self._writer is None:
+            self._flush()
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+[제품표준서 폴더 감시 변환 도구]
+
+SOURCE_DIR 폴더를 계속 감시하다가 제품표준서(.xls)가 추가/수정/삭제되면
+바뀐 파일만 다시 분석하여 결과 표(products/bom/qc_specs/revisions)를 갱신합니다.
+
+동작 방식:
+1. 시작 시 export_to_csv.py와 같은 증분 캐시(export_manifest.json, .export_cache/)로
+   전체 파일을 한 번 읽고, 파일별 분석 결과를 메모리에 보관합니다.
+2. --interval 초마다 폴더의 파일 크기/수정시각을 확인합니다. (추가 라이브러리 없는 폴링 방식)
+3. 변경이 감지된 뒤 --debounce 초 동안 추가 변경이 없으면(저장이 끝나면) 바뀐 파일만 분석하고,
+   메모리의 분석 결과로 결과 표를 다시 기록합니다. 나머지 파일은 다시 분석하지 않습니다.
+
+결과 표는 임시 폴더에 기록한 뒤 교체하므로 다른 도구가 기록 중인 파일을 읽지 않으며,
+내용과 순서는 export_to_csv.py 배치 모드와 동일합니다.
+분석에 실패한 파일(저장 중인 파일 등)은 직전 분석 결과를 유지하고 다음 변경 때 다시 분석합니다.
+결과 파일을 교체하지 못하면(Excel에서 열어 둔 경우 등) 감시를 멈추지 않고 잠시 뒤 다시 시도합니다.
+
+사용법:
+    python watch_export.py
+    python watch_export.py --interval 1 --debounce 2 --workers 4 --format parquet
+    (종료: Ctrl+C)
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+from export_to_csv import (
+    CSV_TABLES,
+    OUTPUT_DIR,
+    SOURCE_DIR,
+    STANDARD_FIELDS_FILENAME,
+    WORKBOOK_CACHE_DIR,
+    ParseCache,
+    export_standard_fields_json,
+    export_to_csv,
+    logger,
+    parse_files_cached,
+    split_duplicates,
+    standard_fields_record,
+)
+from table_io import FORMATS, table_path
+from workbook_cache import WorkbookCache
+
+WATCH_TMP_DIRNAME = ".watch_tmp"
+
+
+def scan_folder(source_path: Path) -> dict:
+    """폴더의 .xls 파일별 (크기, 수정시각) 목록. 엑셀 잠금 파일(~$...)은 제외합니다."""
+    snapshot = {}
+    for filepath in source_path.glob("*.xls"):
+        if filepath.name.startswith("~$"):
+            continue
+        try:
+            stat = filepath.stat()
+        except OSError:
+            # 목록을 읽은 뒤 삭제된 파일
+            continue
+        snapshot[filepath] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+class WatchExporter:
+    """
+    파일별 분석 결과를 메모리에 보관하고, 바뀐 파일만 다시 분석하여 결과 표를 갱신합니다.
+    """
+
+    def __init__(
+        self,
+        source_path: Path,
+        output_path: Path,
+        workers: int = 1,
+        fmt: str = "csv",
+        full: bool = False,
+    ):
+        self.source_path = source_path
+        self.output_path = output_path
+        self.workers = workers
+        self.fmt = fmt
+        self.cache = ParseCache(output_path, source_path, enabled=not full)
+        self.workbook_cache = WorkbookCache(WORKBOOK_CACHE_DIR, enabled=not full)
+        # 파일 경로 -> 분석 결과 / 오류 메시지
+        self.results = {}
+        self.errors = {}
+
+    def refresh(self, changed: list, deleted: list = ()) -> tuple:
+        """
+        바뀐 파일을 다시 분석하고 삭제된 파일을 제외한 뒤 결과 표를 다시 기록합니다.
+        Returns: (다시 분석한 파일 수, 실패한 파일 수)
+        """
+        for filepath in deleted:
+            self.results.pop(filepath, None)
+            self.errors.pop(filepath, None)
+            self.cache.forget(filepath)
+
+        parsed = 0
+        failed = 0
+        existing = [filepath for filepath in sorted(changed) if filepath.exists()]
+        for filepath, data, error, from_cache, _ in parse_files_cached(
+            existing, self.cache, self.workers, self.workbook_cache
+        ):
+            if not from_cache:
+                parsed += 1
+            if error is not None:
+                # 직전 분석 결과가 있으면 유지 (저장 도중 읽은 경우 등)
+                logger.error(f"실패: {filepath.name} - {error}")
+                self.errors[filepath] = error
+                failed += 1
+                continue
+            self.errors.pop(filepath, None)
+            self.results[filepath] = data
+
+        self.cache.save()
+        self.write_outputs()
+        return parsed, failed
+
+    def write_outputs(self):
+        """메모리의 분석 결과로 결과 표와 화장품 유형/재활용등급 JSON을 다시 기록합니다."""
+        all_data = [self.results[filepath] for filepath in sorted(self.results)]
+        normal_data, duplicate_data = split_duplicates(all_data)
+
+        tmp_dir = self.output_path / WATCH_TMP_DIRNAME
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+
+        # 일반 표는 분석 결과가 없어도 헤더만 있는 파일로 기록 (이전 행이 남지 않도록)
+        export_to_csv(normal_data, tmp_dir, fmt=self.fmt)
+        if duplicate_data:
+            export_to_csv(duplicate_data, tmp_dir, prefix="duplicates_", fmt=self.fmt)
+
+        standard_fields = [
+            standard_fields_record(filepath, data=self.results.get(filepath))
+            if filepath in self.results
+            else standard_fields_record(filepath, error=self.errors[filepath])
+            for filepath in sorted(set(self.results) | set(self.errors))
+        ]
+        export_standard_fields_json(standard_fields, tmp_dir)
+
+        # 임시 폴더의 파일로 교체 (중복이 해소된 경우 이전 duplicates_ 파일은 삭제)
+        names = [STANDARD_FIELDS_FILENAME]
+        for filename, _, _ in CSV_TABLES:
+            names.append(table_path(filename, self.fmt).name)
+            names.append(table_path(f"duplicates_{filename}", self.fmt).name)
+        for name in names:
+            staged = tmp_dir / name
+            if staged.exists():
+                os.replace(staged, self.output_path / name)
+            elif name.startswith("duplicates_"):
+                (self.output_path / name).unlink(missing_ok=True)
+        tmp_dir.rmdir()
+
+
+def watch(
+    watcher: WatchExporter,
+    interval: float = 2.0,
+    debounce: float = 3.0,
+    max_cycles: int = None,
+    pending: list = (),
+):
+    """
+    폴더를 주기적으로 확인하며 변경된 파일을 모아 두었다가,
+    마지막 변경 후 debounce 초 동안 추가 변경이 없으면 한 번에 갱신합니다.
+    갱신이 실패하면(결과 파일이 Excel/Dropbox에 잠긴 경우 등) 오류를 기록하고
+    변경 목록을 그대로 두었다가 debounce 초 뒤에 다시 시도합니다.
+    pending: 처음부터 갱신이 필요한 파일 (초기 변환이 실패한 경우)
+    max_cycles가 주어지면 그 횟수만큼 갱신(실패 포함)한 뒤 종료합니다.
+    """
+    snapshot = scan_folder(watcher.source_path)
+    changed = set(pending)
+    deleted = set()
+    last_change = time.monotonic() if changed else None
+    cycles = 0
+
+    while max_cycles is None or cycles < max_cycles:
+        time.sleep(interval)
+        current = scan_folder(watcher.source_path)
+
+        for filepath, stat in current.items():
+            if snapshot.get(filepath) != stat:
+                changed.add(filepath)
+                deleted.discard(filepath)
+                last_change = time.monotonic()
+        for filepath in snapshot.keys() - current.keys():
+            deleted.add(filepath)
+            changed.discard(filepath)
+            last_change = time.monotonic()
+        snapshot = current
+
+        if last_change is None or time.monotonic() - last_change < debounce:
+            continue
+
+        start = time.perf_counter()
+        cycles += 1
+        try:
+            parsed, failed = watcher.refresh(sorted(changed), sorted(deleted))
+        except Exception as e:
+            logger.error(f"갱신 실패: {e} - {debounce}초 뒤 다시 시도합니다.")
+            last_change = time.monotonic()
+            continue
+        logger.info(
+            f"갱신 완료: 변경 {len(changed)}건 (재분석 {parsed}건, 실패 {failed}건), "
+            f"삭제 {len(deleted)}건, 전체 {len(watcher.results)}건, "
+            f"{time.perf_counter() - start:.2f}초"
+        )
+        changed.clear()
+        deleted.clear()
+        last_change = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="제품표준서 폴더 감시 변환 도구")
+    parser.add_argument(
+        "--interval", type=float, default=2.0, help="폴더 확인 주기(초, 기본 2)"
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=3.0,
+        help="마지막 변경 후 이 시간(초) 동안 추가 변경이 없으면 갱신 (기본 3)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="병렬 분석에 사용할 프로세스 수 (기본 1, 0이면 CPU 코어 수)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="결과 표 형식 (기본 csv, parquet은 pyarrow 필요)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="시작 시 캐시를 무시하고 모든 파일을 다시 분석",
+    )
+    args = parser.parse_args()
+
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
+    source_path = Path(SOURCE_DIR)
+    if not source_path.exists():
+        logger.error(f"오류: 소스 폴더를 찾을 수 없습니다: {SOURCE_DIR}")
+        logger.error("config.py 파일의 SOURCE_DIR 설정을 확인해주세요.")
+        sys.exit(1)
+    output_path = Path(OUTPUT_DIR)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    watcher = WatchExporter(source_path, output_path, workers, args.format, args.full)
+
+    logger.info(f"감시 폴더: {source_path}")
+    logger.info(f"출력 폴더: {output_path}")
+    start = time.perf_counter()
+    initial = sorted(scan_folder(source_path))
+    pending = []
+    try:
+        parsed, failed = watcher.refresh(initial)
+        logger.info(
+            f"초기 변환 완료: {len(watcher.results)}건 (재분석 {parsed}건, 실패 {failed}건), "
+            f"{time.perf_counter() - start:.2f}초"
+        )
+    except Exception as e:
+        logger.error(f"초기 변환 실패: {e} - 감시 중에 다시 시도합니다.")
+        pending = initial
+    logger.info(
+        f"변경 감시 중 (확인 주기 {args.interval}초, 대기 {args.debounce}초). 종료: Ctrl+C"
+    )
+
+    try:
+        watch(watcher, args.interval, args.debounce, pending=pending)
+    except KeyboardInterrupt:
+        logger.info("감시를 종료합니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+[Excel 워크북 접근 공통 모듈]
+
+제품표준서 등 .xls 워크북을 읽는 스크립트들이 함께 사용하는 모듈입니다.
+
+주요 기능:
+1. 워크북을 on_demand 모드로 열어 실제로 요청한 시트만 메모리에 올림
+2. 추출이 끝나면 읽은 시트와 파일 자원을 즉시 해제
+3. 시트 이름 후보로 시트 찾기(load_sheet, find_sheet_name)
+   (셀 값 추출은 layout_engine 모듈의 추출 계획을 사용)
+
+사용 예:
+    from workbook_access import open_workbook, load_sheet
+
+    with open_workbook("제품표준서.xls") as workbook:
+        sheet = load_sheet(workbook, "입력란")
+        ...
+"""
+
+from contextlib import contextmanager
+
+import xlrd
+
+
+@contextmanager
+def open_workbook(filepath):
+    """
+    워크북을 on_demand 모드로 엽니다.
+    - 시트 목록만 먼저 읽고, 각 시트는 load_sheet()로 요청할 때 읽습니다.
+    - with 블록이 끝나면 읽은 시트를 모두 내리고 파일 자원을 해제합니다.
+    """
+    workbook = xlrd.open_workbook(str(filepath), on_demand=True, formatting_info=False)
+    try:
+        yield workbook
+    finally:
+        for name in workbook.sheet_names():
+            if workbook.sheet_loaded(name):
+                workbook.unload_sheet(name)
+        workbook.release_resources()
+
+
+def load_sheet(workbook, names):
+    """
+    이름으로 시트를 읽어 반환합니다. 시트가 없으면 None을 반환합니다.
+    names에 여러 후보를 주면 (예: 공백이 붙은 시트명) 처음 존재하는 시트를 읽습니다.
+    """
+    if isinstance(names, str):
+        names = [names]
+    available = set(workbook.sheet_names())
+    for name in names:
+        if name in available:
+            return workbook.sheet_by_name(name)
+    return None
+
+
+def find_sheet_name(workbook, keyword: str):
+    """시트를 읽지 않고 이름에 keyword가 포함된 첫 시트명을 반환합니다. 없으면 None."""
+    for name in workbook.sheet_names():
+        if keyword in name:
+            return name
+    return None
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+[제품표준서 워크북 공유 캐시]
+
+제품표준서 폴더를 읽는 도구들(export_to_csv.py, scripts/extract_product_standard_fields.py 등)이
+함께 사용하는 내용 주소 기반(content-addressed) 캐시입니다.
+
+- 파일 내용의 SHA-256 해시마다 JSON 레코드 하나를 저장합니다. (<캐시폴더>/<해시>.json)
+- 레코드에는 추출에 쓰이는 시트('입력란', 이름에 '표준'이 들어간 시트)의
+  모든 행이 (셀타입, 값) 형태 그대로 들어 있습니다.
+- 캐시 폴더의 기본값은 저장소 밖의 사용자 캐시 폴더(~/.cache/riselab/workbook_cache)입니다.
+  레코드에 원본 워크북 내용이 그대로 들어 있으므로 저장소 안에 두지 않습니다.
+- 캐시에서 읽은 워크북(CachedWorkbook)은 xlrd 워크북/시트와 같은 방식으로 사용할 수 있으므로
+  layout_engine의 추출 계획이나 workbook_access의 load_sheet()를 그대로 적용할 수 있습니다.
+
+따라서 새 항목을 추출할 때도 엑셀 파일 전체를 다시 열 필요 없이 캐시된 행만 다시 훑으면 됩니다.
+더 이상 원본 파일과 해시가 맞지 않는 레코드는 prune()으로 정리합니다.
+여러 도구와 폴더가 함께 쓰는 캐시이므로 자동으로 정리하지 않으며,
+운영 폴더를 변환할 때 export_to_csv.py --prune-cache로 명시적으로 호출합니다.
+
+사용 예:
+    from workbook_cache import WorkbookCache, open_cached_workbook
+
+    cache = WorkbookCache()
+    with open_cached_workbook("제품표준서.xls", cache) as workbook:
+        sheet = load_sheet(workbook, "입력란")
+        ...
+"""
+
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+from workbook_access import open_workbook
+
+# 레코드 구조가 바뀌면 이 값을 올려 기존 레코드를 무효화합니다.
+WORKBOOK_CACHE_VERSION = 2
+
+# 기본 캐시 폴더 (저장소 밖의 사용자 캐시 폴더, 모든 도구가 공유)
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "riselab" / "workbook_cache"
+
+# 이름에 이 키워드가 들어간 시트만 캐시에 담습니다.
+CACHED_SHEET_KEYWORDS = ("입력란", "표준")
+
+
+def file_sha256(filepath) -> str:
+    """파일 내용의 SHA-256 해시를 계산합니다. (1MB 단위로 읽어 메모리 사용 최소화)"""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class CachedCell:
+    """xlrd Cell과 같은 ctype/value 속성을 가진 셀"""
+
+    __slots__ = ("ctype", "value")
+
+    def __init__(self, ctype, value):
+        self.ctype = ctype
+        self.value = value
+
+
+class CachedSheet:
+    """
+    캐시된 행으로 만든 읽기 전용 시트입니다.
+    xlrd 시트의 nrows/ncols/row_types/row_values/cell/cell_value를 지원합니다.
+    """
+
+    def __init__(self, name: str, rows: list):
+        self.name = name
+        self._rows = rows
+        self.nrows = len(rows)
+        self.ncols = max((len(types) for types, _ in rows), default=0)
+
+    def row_types(self, rowx: int, start_colx: int = 0, end_colx: int = None) -> list:
+        return list(self._rows[rowx][0][start_colx:end_colx])
+
+    def row_values(self, rowx: int, start_colx: int = 0, end_colx: int = None) -> list:
+        return list(self._rows[rowx][1][start_colx:end_colx])
+
+    def cell(self, rowx: int, colx: int) -> CachedCell:
+        if rowx < 0 or colx < 0:
+            raise IndexError("cell index out of range")
+        types, values = self._rows[rowx]
+        return CachedCell(types[colx], values[colx])
+
+    def cell_value(self, rowx: int, colx: int):
+        return self.cell(rowx, colx).value
+
+
+class CachedWorkbook:
+    """
+    캐시 레코드로 만든 워크북입니다.
+    sheet_names()는 캐시에 담긴 시트만 원래 워크북의 순서대로 반환합니다.
+    """
+
+    def __init__(self, record: dict):
+        self._names = list(record["sheet_names"])
+        self._sheets = record["sheets"]
+
+    def sheet_names(self) -> list:
+        return list(self._names)
+
+    def sheet_by_name(self, name: str) -> CachedSheet:
+        return CachedSheet(name, self._sheets[name])
+
+    def sheet_loaded(self, name) -> bool:
+        return True
+
+    def unload_sheet(self, name):
+        pass
+
+
+def read_workbook_record(filepath) -> dict:
+    """엑셀 파일을 열어 캐시 대상 시트의 모든 행을 담은 레코드를 만듭니다."""
+    names = []
+    sheets = {}
+    with open_workbook(filepath) as workbook:
+        for name in workbook.sheet_names():
+            if not any(keyword in name for keyword in CACHED_SHEET_KEYWORDS):
+                continue
+            sheet = workbook.sheet_by_name(name)
+            sheets[name] = [
+                (tuple(sheet.row_types(r)), tuple(sheet.row_values(r)))
+                for r in range(sheet.nrows)
+            ]
+            names.append(name)
+            workbook.unload_sheet(name)
+    return {"version": WORKBOOK_CACHE_VERSION, "sheet_names": names, "sheets": sheets}
+
+
+class WorkbookCache:
+    """
+    파일 내용 해시 -> 워크북 레코드(JSON) 캐시입니다.
+
+    - enabled=False: 기존 레코드를 읽지 않고 항상 엑셀을 다시 읽습니다. (읽은 결과로 레코드는 갱신)
+    - readonly=True: 레코드를 새로 쓰지 않습니다. (예: --dry-run)
+
+    프로세스 풀 작업자에게 그대로 넘길 수 있도록 상태는 단순한 값만 가집니다.
+    """
+
+    def __init__(self, cache_dir=None, enabled: bool = True, readonly: bool = False):
+        if cache_dir is None:
+            cache_dir = os.environ.get("WORKBOOK_CACHE_DIR") or DEFAULT_CACHE_DIR
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self.readonly = readonly
+        self.hits = 0
+        self.misses = 0
+
+    def _record_path(self, sha256: str) -> Path:
+        return self.cache_dir / f"{sha256}.json"
+
+    def _read(self, sha256: str):
+        record_path = self._record_path(sha256)
+        if not self.enabled or not record_path.exists():
+            return None
+        try:
+            with open(record_path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(record, dict):
+            return None
+        if record.get("version") != WORKBOOK_CACHE_VERSION:
+            return None
+        return record
+
+    def _write(self, sha256: str, record: dict):
+        if self.readonly:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # 여러 프로세스가 같은 레코드를 쓰더라도 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        record_path = self._record_path(sha256)
+        tmp_path = record_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, record_path)
+
+    def prune(self, live_hashes) -> int:
+        """
+        live_hashes(현재 원본 파일들의 내용 해시)에 없는 레코드를 삭제하고 삭제한 개수를 반환합니다.
+        다른 폴더의 워크북 레코드도 삭제되므로 캐시를 함께 쓰는 모든 원본 폴더의 해시를 넘겨야 합니다.
+        이전 버전이 남긴 pickle 레코드(*.pkl)도 함께 삭제합니다.
+        """
+        if self.readonly or not self.cache_dir.exists():
+            return 0
+        live = set(live_hashes)
+        removed = 0
+        for pattern in ("*.json", "*.pkl"):
+            for record_path in self.cache_dir.glob(pattern):
+                if record_path.suffix == ".json" and record_path.stem in live:
+                    continue
+                try:
+                    record_path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def load(self, filepath, sha256: str = None) -> CachedWorkbook:
+        """
+        파일의 워크북 레코드를 반환합니다.
+        캐시에 없으면 엑셀 파일을 읽어 레코드를 만들고 캐시에 저장합니다.
+        sha256을 이미 알고 있으면 넘겨서 해시 재계산을 생략할 수 있습니다.
+        """
+        if sha256 is None:
+            sha256 = file_sha256(filepath)
+        record = self._read(sha256)
+        if record is None:
+            self.misses += 1
+            record = read_workbook_record(filepath)
+            self._write(sha256, record)
+        else:
+            self.hits += 1
+        return CachedWorkbook(record)
+
+
+@contextmanager
+def open_cached_workbook(filepath, cache: WorkbookCache = None, sha256: str = None):
+    """
+    캐시가 주어지면 캐시된 워크북을, 없으면 엑셀 파일을 직접(on_demand) 열어 제공합니다.
+    어느 쪽이든 load_sheet()/find_sheet_name() 등으로 같은 방식으로 사용할 수 있습니다.
+    """
+    if cache is None:
+        with open_workbook(filepath) as workbook:
+            yield workbook
+    else:
+        yield cache.load(filepath, sha256)
@@ -10,20 +10,25 @@ from __future__ import annotations
 
 import os
 import re
+import sys
 from pathlib import Path
 from typing import Any
 
 import pandas as pd
 from supabase import Client, create_client
 
+PROJECT_ROOT = Path(__file__).resolve().parents[4]
+
+# Shared on-demand workbook access layer (migration/workbook_access.py)
+sys.path.insert(0, str(PROJECT_ROOT / "migration"))
+
 try:
-    import xlrd
+    from workbook_access import open_workbook
 
     HAS_XLRD = True
 except ImportError:
     HAS_XLRD = False
 
-PROJECT_ROOT = Path(__file__).resolve().parents[4]
 SOURCE_DIR = PROJECT_ROOT / "migration_docs" / "서식 샘플" / "원료입고 관리대장"
 
 SUPPLIERS_TABLE = "labdoc_demo_suppliers"
@@ -96,15 +101,12 @@ def to_test_no(value: Any, year: int) -> str | None:
     return text
 
 
-def load_sheet(file_path: Path, sheet_name: str) -> pd.DataFrame:
-    if not HAS_XLRD:
-        raise RuntimeError("xlrd is required to read .xls files")
-    return pd.read_excel(
-        file_path,
-        sheet_name=sheet_name,
-        header=2,
-        engine="xlrd",
-    )
+def load_sheet(workbook: Any, excel: pd.ExcelFile, sheet_name: str) -> pd.DataFrame:
+    try:
+        return excel.parse(sheet_name, header=2)
+    finally:
+        if workbook.sheet_loaded(sheet_name):
+            workbook.unload_sheet(sheet_name)
 
 
 def build_records(
@@ -234,33 +236,35 @@ def main() -> None:
             errors.append(str(exc))
             continue
 
+        if not HAS_XLRD:
+            errors.append(f"{file_path.name}: xlrd is required to read .xls files")
+            continue
+
         try:
-            sheet_names = (
-                xlrd.open_workbook(file_path).sheet_names() if HAS_XLRD else []
-            )
+            with open_workbook(file_path) as workbook:
+                excel = pd.ExcelFile(workbook, engine="xlrd")
+                for sheet_name in workbook.sheet_names():
+                    if sheet_name in {"양식", "List", "Sheet1", "Sheet2"}:
+                        continue
+                    if not re.match(r"^\d{1,2}월$", sheet_name):
+                        continue
+
+                    print(f"  [SHEET] {sheet_name}")
+                    try:
+                        df = load_sheet(workbook, excel, sheet_name)
+                        if df.empty:
+                            continue
+                        frame = build_records(df, year, file_path.name, sheet_name)
+                        if frame.empty:
+                            continue
+                        total_rows += len(frame)
+                        all_frames.append(frame)
+                    except Exception as exc:
+                        errors.append(f"{file_path.name}::{sheet_name}: {exc}")
         except Exception as exc:
             errors.append(f"{file_path.name}: failed to read sheets ({exc})")
             continue
 
-        for sheet_name in sheet_names:
-            if sheet_name in {"양식", "List", "Sheet1", "Sheet2"}:
-                continue
-            if not re.match(r"^\d{1,2}월$", sheet_name):
-                continue
-
-            print(f"  [SHEET] {sheet_name}")
-            try:
-                df = load_sheet(file_path, sheet_name)
-                if df.empty:
-                    continue
-                frame = build_records(df, year, file_path.name, sheet_name)
-                if frame.empty:
-                    continue
-                total_rows += len(frame)
-                all_frames.append(frame)
-            except Exception as exc:
-                errors.append(f"{file_path.name}::{sheet_name}: {exc}")
-
     if not all_frames:
         print("No data extracted.")
         return
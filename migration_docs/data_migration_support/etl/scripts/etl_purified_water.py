@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import os
 import re
+import sys
 from datetime import date
 from pathlib import Path
 from typing import Any, Iterable
@@ -26,6 +27,11 @@ except ImportError:
 
 PROJECT_ROOT = Path(__file__).resolve().parents[4]
 
+# Shared declarative cell-layout engine (migration/layout_engine.py)
+sys.path.insert(0, str(PROJECT_ROOT / "migration"))
+
+from layout_engine import compile_layout  # noqa: E402
+
 
 def load_env_file(path: Path) -> None:
     if not path.exists():
@@ -133,6 +139,30 @@ TEST_ITEMS = [
 RESULT_COL = "H"
 JUDGMENT_COL = "J"
 
+# Cell layout of one test report sheet (Excel addresses, 1-based like the form)
+PURIFIED_WATER_LAYOUT = {
+    "test_date": {"type": "cell", "cell": "A5", "convert": "raw"},
+    "header": {
+        "type": "cells",
+        "cells": {
+            "material_name": "C7",
+            "sample_amount": "D7",
+            "sampling_location": "I7",
+            "collector": "K7",
+            "inspector": "I25",
+        },
+        "convert": "raw",
+    },
+    "results": {
+        "type": "rows",
+        "rows": [item["row"] - 1 for item in TEST_ITEMS],
+        "columns": {"raw_value": RESULT_COL, "raw_judgment": JUDGMENT_COL},
+        "convert": "raw",
+    },
+}
+
+PURIFIED_WATER_PLAN = compile_layout(PURIFIED_WATER_LAYOUT)
+
 
 def parse_filename(filename: str) -> tuple[int, str]:
     match = re.match(r"정제수성적서_(\d{4})년\s*(상반기|하반기)", filename)
@@ -249,13 +279,6 @@ def calculate_overall_result(results: Iterable[dict[str, Any]]) -> str:
     return "적합"
 
 
-def get_cell_value(sheet: Any, row: int, col: str) -> Any:
-    if hasattr(sheet, "cell_value"):
-        col_idx = ord(col.upper()) - ord("A")
-        return sheet.cell_value(row - 1, col_idx)
-    return sheet[f"{col}{row}"].value
-
-
 def should_skip_file(filename: str) -> bool:
     return filename in {"정제수pH통계.xls", "정제수성적서.xls"}
 
@@ -287,13 +310,13 @@ def get_sheet(workbook: Any, sheet_name: str) -> Any:
     return workbook[sheet_name]
 
 
-def build_results(sheet) -> list[dict[str, Any]]:
+def build_results(raw_results: list[dict[str, Any]]) -> list[dict[str, Any]]:
     results: list[dict[str, Any]] = []
     prev_judgment: str | None = None
 
-    for item in TEST_ITEMS:
-        raw_value = get_cell_value(sheet, item["row"], RESULT_COL)
-        raw_judgment = get_cell_value(sheet, item["row"], JUDGMENT_COL)
+    for item, raw in zip(TEST_ITEMS, raw_results):
+        raw_value = raw["raw_value"]
+        raw_judgment = raw["raw_judgment"]
 
         result_value = normalize_result_value(raw_value)
         judgment = convert_judgment(
@@ -391,26 +414,23 @@ def main() -> None:
             print(f"  [SHEET] {sheet_name}")
             try:
                 sheet = get_sheet(workbook, sheet_name)
+                extracted = PURIFIED_WATER_PLAN.extract(sheet)
 
                 test_date = parse_test_date_from_cell(
-                    get_cell_value(sheet, 5, "A"), sheet_date
+                    extracted["test_date"], sheet_date
                 )
                 if not test_date:
                     raise RuntimeError("test_date not found")
 
                 header = {
                     "test_date": test_date.isoformat(),
-                    "material_name": get_cell_value(sheet, 7, "C"),
-                    "sample_amount": get_cell_value(sheet, 7, "D"),
-                    "sampling_location": get_cell_value(sheet, 7, "I"),
-                    "collector": get_cell_value(sheet, 7, "K"),
-                    "inspector": get_cell_value(sheet, 25, "I"),
+                    **extracted["header"],
                     "source_file": file_path.name,
                     "source_sheet": sheet_name,
                     "source_row": None,
                 }
 
-                results = build_results(sheet)
+                results = build_results(extracted["results"])
                 header["overall_result"] = calculate_overall_result(results)
 
                 test_id = upsert_test(client, header)
@@ -5,15 +5,24 @@
 
 사용법:
     python extract_product_standard_fields.py
+
+참고: migration/export_to_csv.py도 같은 분석 과정에서 두 필드를 추출하여
+products.csv의 화장품유형/재활용등급 컬럼과 출력 폴더의 product_standard_extracted.json에 저장합니다.
+이 스크립트는 두 필드만 다시 추출할 때 사용합니다.
 """
 
 import pandas as pd
-import xlrd
 import os
 import re
 import json
+import sys
 from pathlib import Path
 
+# migration/ 폴더의 공통 워크북 접근 모듈과 공유 워크북 캐시 사용
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "migration"))
+from workbook_access import find_sheet_name, load_sheet
+from workbook_cache import WorkbookCache, open_cached_workbook
+
 # 설정
 FOLDER = r"d:\(주)에바스코스메틱 Dropbox\JI SEULKI\claude\@ongoing_LAB doc\200_연구실 문서 샘플\제품표준서_all"
 OUTPUT_FILE = (
@@ -28,8 +37,23 @@ def normalize_text(text):
     return re.sub(r"\s+", "", str(text).strip())
 
 
-def extract_from_file(filepath):
-    """단일 파일에서 데이터 추출"""
+def cell_text(value):
+    """
+    xlrd 셀 값을 문자열 비교용 값으로 변환합니다. 빈 셀은 None.
+    (정수 값 숫자는 pandas.read_excel과 같이 int로 변환)
+    """
+    if value == "":
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def extract_from_file(filepath, workbook_cache=None):
+    """
+    단일 파일에서 데이터 추출
+    workbook_cache가 주어지면 export_to_csv.py와 공유하는 워크북 캐시의 시트 행을 사용
+    """
     result = {
         "filename": os.path.basename(filepath),
         "product_code": None,
@@ -53,41 +77,34 @@ def extract_from_file(filepath):
         result["product_code"] = code_match.group(1)
 
     try:
-        # 시트 찾기
-        wb = xlrd.open_workbook(filepath)
-        target_sheet = None
-        for s in wb.sheet_names():
-            if "표준" in s:
-                target_sheet = s
-                break
-
-        if not target_sheet:
-            result["error"] = "No 제품표준서 sheet"
-            return result
-
-        # 시트 읽기
-        df = pd.read_excel(
-            filepath, sheet_name=target_sheet, header=None, engine="xlrd"
-        )
-
-        # 라벨 기반 검색
-        for i in range(min(30, len(df))):
-            if df.shape[1] < 4:
-                continue
-
-            label = normalize_text(df.iloc[i, 0])
-            value = df.iloc[i, 3] if pd.notna(df.iloc[i, 3]) else None
-
-            # 화장품 유형
-            if "화장품유형" in label and result["cosmetic_type"] is None:
-                result["cosmetic_type"] = str(value).strip() if value else None
-
-            # 재활용등급
-            if "재활용등급" in label and result["recycling_grade"] is None:
-                val_str = str(value).strip() if value else None
-                if val_str:
-                    # "재활용 보통" 등에서 앞의 공백 제거
-                    result["recycling_grade"] = val_str.lstrip()
+        # 캐시된 시트 행 사용 (캐시가 없으면 on_demand 모드로 제품표준서 시트 하나만 읽음)
+        with open_cached_workbook(filepath, workbook_cache) as wb:
+            target_sheet = find_sheet_name(wb, "표준")
+            if not target_sheet:
+                result["error"] = "No 제품표준서 sheet"
+                return result
+
+            sheet = load_sheet(wb, target_sheet)
+
+            # 라벨 기반 검색 (A열 라벨, D열 값)
+            for i in range(min(30, sheet.nrows)):
+                if sheet.ncols < 4:
+                    continue
+
+                row = sheet.row_values(i, 0, 4)
+                label = normalize_text(cell_text(row[0]))
+                value = cell_text(row[3]) if len(row) > 3 else None
+
+                # 화장품 유형
+                if "화장품유형" in label and result["cosmetic_type"] is None:
+                    result["cosmetic_type"] = str(value).strip() if value else None
+
+                # 재활용등급
+                if "재활용등급" in label and result["recycling_grade"] is None:
+                    val_str = str(value).strip() if value else None
+                    if val_str:
+                        # "재활용 보통" 등에서 앞의 공백 제거
+                        result["recycling_grade"] = val_str.lstrip()
 
     except Exception as e:
         result["error"] = str(e)
@@ -100,6 +117,7 @@ def main():
     files = sorted([f for f in os.listdir(FOLDER) if f.endswith(".xls")])
     print(f"파일 수: {len(files)}")
 
+    workbook_cache = WorkbookCache()
     results = []
     success_count = 0
     has_cosmetic_type = 0
@@ -107,7 +125,7 @@ def main():
 
     for i, fname in enumerate(files):
         filepath = os.path.join(FOLDER, fname)
-        result = extract_from_file(filepath)
+        result = extract_from_file(filepath, workbook_cache)
         results.append(result)
 
         if not result["error"]:
@@ -131,6 +149,7 @@ def main():
     print(f"성공: {success_count}")
     print(f"화장품유형 있음: {has_cosmetic_type}")
     print(f"재활용등급 있음: {has_recycling_grade}")
+    print(f"워크북 캐시 사용: {workbook_cache.hits}, 엑셀 읽기: {workbook_cache.misses}")
     print(f"저장: {OUTPUT_FILE}")
 
     # 샘플 출력
@@ -1,16 +1,45 @@
 """
 Import prepared CSVs to Supabase using direct PostgreSQL connection.
 Uses psycopg2 COPY command for fast bulk import.
+Reads Parquet tables written by prepare_import_csv.py --format parquet
+when they are newer than the CSVs.
+Checks each table against the manifest.json written by prepare_import_csv.py
+before clearing anything (set IMPORT_IGNORE_MANIFEST=1 to import anyway).
+Tables are loaded in foreign-key tiers taken from the schema; the tables of a
+tier are copied concurrently over IMPORT_WORKERS pooled connections.
+IMPORT_MODE=upsert applies only the changed rows instead of truncating and
+reloading every table.
+IMPORT_COPY_FORMAT=binary encodes each value for its schema column type and
+uses COPY ... (FORMAT binary) instead of text CSV.
 """
 
+import csv
+import json
 import os
+import re
+import sys
+import time
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
+from pathlib import Path
+
+# Shared CSV/Parquet table I/O from migration/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "migration"))
+from table_io import (
+    find_table,
+    iter_frames,
+    read_frame,
+    require_pyarrow,
+    table_format,
+)
+from pg_binary_copy import BinaryCopyStream, encoder_for
 
 # Try to import psycopg2, fall back to supabase if not available
 try:
-    import psycopg2
     from psycopg2 import sql
+    from psycopg2.extras import execute_values
+    from psycopg2.pool import ThreadedConnectionPool
 
     HAS_PSYCOPG2 = True
 except ImportError:
@@ -40,6 +69,35 @@ DB_PASSWORD = os.getenv(
 )  # Get from Supabase Dashboard > Settings > Database
 
 INPUT_DIR = "csv_output/supabase_import"
+SCHEMA_FILE = (
+    Path(__file__).resolve().parent.parent / "migration_docs" / "schema_labdoc_v2.sql"
+)
+
+# Characters read from a CSV file per COPY data message
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Rows read from a table file at a time for binary COPY
+BINARY_CHUNK_SIZE = 10000
+
+# Rows per INSERT when a COPY failed; failing batches are split in half
+FALLBACK_BATCH_SIZE = 1000
+
+# Rows that could not be inserted go to INPUT_DIR/rejects/<table>.csv
+REJECT_DIRNAME = "rejects"
+
+# replace: TRUNCATE every table and COPY it again (default)
+# upsert:  stage each table and apply only the differences, tables stay online
+IMPORT_MODE = os.getenv("IMPORT_MODE", "replace")
+STAGE_PREFIX = "_stage_"
+
+# csv:    COPY the prepared files as text CSV (default)
+# binary: encode values for the schema column types, COPY ... (FORMAT binary)
+IMPORT_COPY_FORMAT = os.getenv("IMPORT_COPY_FORMAT", "csv")
+
+# Connections used to load the tables of one tier concurrently
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "4"))
+MANIFEST_FILE = os.path.join(INPUT_DIR, "manifest.json")
+IGNORE_MANIFEST = os.getenv("IMPORT_IGNORE_MANIFEST", "") == "1"
 
 # Import order (respecting foreign key dependencies)
 IMPORT_ORDER = [
@@ -62,6 +120,134 @@ IMPORT_ORDER = [
 ]
 
 
+def read_schema_tables(schema_file=SCHEMA_FILE):
+    """CREATE TABLE bodies of the schema by table name (comments removed), {} without it"""
+    if not os.path.exists(schema_file):
+        return {}
+    with open(schema_file, encoding="utf-8") as f:
+        schema = re.sub(r"--[^\n]*", "", f.read())
+    return dict(
+        re.findall(
+            r"CREATE TABLE(?: IF NOT EXISTS)?\s+(\w+)\s*\((.*?)\n\);", schema, re.S
+        )
+    )
+
+
+def unique_keys(table_name, schema_file=SCHEMA_FILE):
+    """Column lists of the table's UNIQUE constraints in the schema"""
+    body = read_schema_tables(schema_file).get(table_name, "")
+    keys = [
+        [col.strip() for col in cols.split(",")]
+        for cols in re.findall(r"UNIQUE\s*\(([^)]*)\)", body)
+    ]
+    keys += [[col] for col in re.findall(r"^\s*(\w+)\s+\w+[^,\n]*\bUNIQUE\b", body, re.M)]
+    return keys
+
+
+def column_types(table_name, schema_file=SCHEMA_FILE):
+    """Declared SQL type of each column of the table in the schema, e.g. DECIMAL(10,4)"""
+    body = read_schema_tables(schema_file).get(table_name, "")
+    return dict(
+        re.findall(r"^\s*(\w+)\s+([A-Za-z]+(?:\([^)]*\))?(?:\[\])?)", body, re.M)
+    )
+
+
+def binary_encoders(table_name, columns):
+    """Encoders for COPY (FORMAT binary) of these columns, None when a column is
+    missing from the schema or has a type pg_binary_copy cannot encode.
+    """
+    types = column_types(table_name)
+    try:
+        return [encoder_for(types[col]) for col in columns]
+    except (KeyError, ValueError) as e:
+        print(f"  Binary COPY not possible for {table_name} ({e}), using CSV")
+        return None
+
+
+def load_table_tiers(schema_file=SCHEMA_FILE):
+    """Group IMPORT_ORDER into tiers that can be loaded concurrently.
+    A table goes one tier after the tables it REFERENCES in the schema; within a
+    tier IMPORT_ORDER is kept. Without the schema file every table is its own tier.
+    """
+    schema_tables = read_schema_tables(schema_file)
+    if not schema_tables:
+        print(f"  {schema_file} not found, loading tables one at a time")
+        return [[entry] for entry in IMPORT_ORDER]
+
+    references = {
+        table: set(re.findall(r"REFERENCES\s+(\w+)", body))
+        for table, body in schema_tables.items()
+    }
+
+    tables = [table for _, table in IMPORT_ORDER]
+    levels = {}
+
+    def level(table, seen=()):
+        if table not in levels:
+            parents = [
+                ref
+                for ref in references.get(table, ())
+                if ref in tables and ref != table and ref not in seen
+            ]
+            levels[table] = 1 + max(
+                (level(ref, seen + (table,)) for ref in parents), default=-1
+            )
+        return levels[table]
+
+    tiers = [[] for _ in range(max(map(level, tables)) + 1)]
+    for entry in IMPORT_ORDER:
+        tiers[level(entry[1])].append(entry)
+    return tiers
+
+
+def load_manifest():
+    """Files section of the manifest written by prepare_import_csv.py ({} if missing)"""
+    if not os.path.exists(MANIFEST_FILE):
+        return {}
+    with open(MANIFEST_FILE, encoding="utf-8") as f:
+        return json.load(f).get("files", {})
+
+
+def check_manifest(manifest):
+    """Compare the tables on disk with the manifest without parsing them.
+    Returns a list of problems (missing entries, files changed since prepare).
+    """
+    print("\nChecking manifest...")
+    if not manifest:
+        print(f"  {MANIFEST_FILE} not found, skipping checks")
+        return []
+
+    problems = []
+    for csv_file, _ in IMPORT_ORDER:
+        filepath = find_table(os.path.join(INPUT_DIR, csv_file))
+        if filepath is None:
+            continue
+        entry = manifest.get(filepath.name)
+        stat = filepath.stat()
+        if entry is None:
+            problems.append(f"{filepath.name}: not in manifest")
+        elif (
+            stat.st_size != entry["bytes"] or stat.st_mtime_ns != entry["mtime_ns"]
+        ):
+            problems.append(
+                f"{filepath.name}: changed since prepare "
+                f"({stat.st_size} bytes, manifest {entry['bytes']} bytes)"
+            )
+        else:
+            print(f"  OK {filepath.name}: {entry['rows']} rows")
+
+    for problem in problems:
+        print(f"  MISMATCH {problem}")
+    return problems
+
+
+def check_row_count(manifest, filepath, rows):
+    """Warn when the table loaded does not have the row count prepare wrote"""
+    entry = manifest.get(filepath.name) if manifest else None
+    if entry is not None and entry["rows"] != rows:
+        print(f"  WARNING: {rows} rows read, manifest has {entry['rows']}")
+
+
 def clear_tables(conn):
     """Clear all labdoc_ tables in reverse order (to handle FK constraints)"""
     print("\nClearing existing data...")
@@ -82,23 +268,31 @@ def clear_tables(conn):
     print("  Done clearing tables")
 
 
-def import_csv_psycopg2(conn, csv_file, table_name):
-    """Import CSV using PostgreSQL COPY command (fastest method)"""
-    filepath = os.path.join(INPUT_DIR, csv_file)
-
-    if not os.path.exists(filepath):
-        print(f"  SKIP: {csv_file} not found")
-        return 0
-
-    df = pd.read_csv(filepath, encoding="utf-8-sig")
-
-    if len(df) == 0:
-        print(f"  SKIP: {csv_file} is empty")
-        return 0
+def copy_csv_file(conn, filepath, table_name, size=COPY_BUFFER_SIZE):
+    """Stream a prepared CSV file to COPY as it is, size characters at a time.
+    The BOM is dropped by the utf-8-sig decoder, the header row names the columns
+    and is skipped by the server, and empty unquoted fields load as NULL.
+    Returns the number of rows copied (does not commit).
+    """
+    with open(filepath, encoding="utf-8-sig", newline="") as f:
+        columns = next(csv.reader(f), None)
+        if not columns:
+            return 0
+        f.seek(0)
+
+        copy_sql = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv, HEADER)").format(
+            sql.Identifier(table_name),
+            sql.SQL(", ").join(map(sql.Identifier, columns)),
+        )
+        with conn.cursor() as cur:
+            cur.copy_expert(copy_sql.as_string(conn), f, size=size)
+            return cur.rowcount
 
-    # Get column names from CSV
-    columns = list(df.columns)
 
+def copy_frame(conn, df, table_name):
+    """COPY a DataFrame (Parquet tables) through an in-memory CSV buffer.
+    Returns the number of rows copied (does not commit).
+    """
     # Handle NaN values - replace with None for proper NULL handling
     df = df.where(pd.notnull(df), None)
 
@@ -107,86 +301,423 @@ def import_csv_psycopg2(conn, csv_file, table_name):
     df.to_csv(buffer, index=False, header=False, sep="\t", na_rep="\\N")
     buffer.seek(0)
 
-    try:
-        with conn.cursor() as cur:
-            # Use COPY command for fast bulk insert
-            copy_sql = sql.SQL(
-                "COPY {} ({}) FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t', NULL '\\N')"
-            ).format(
-                sql.Identifier(table_name),
-                sql.SQL(", ").join(map(sql.Identifier, columns)),
-            )
-            cur.copy_expert(copy_sql.as_string(conn), buffer)
+    with conn.cursor() as cur:
+        copy_sql = sql.SQL(
+            "COPY {} ({}) FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t', NULL '\\N')"
+        ).format(
+            sql.Identifier(table_name),
+            sql.SQL(", ").join(map(sql.Identifier, df.columns)),
+        )
+        cur.copy_expert(copy_sql.as_string(conn), buffer)
+    return len(df)
+
+
+def binary_rows(filepath, chunksize=BINARY_CHUNK_SIZE):
+    """Rows of a prepared table file for binary COPY, read chunksize rows at a time.
+    Parquet columns keep their types; CSV values are read as text so they are
+    encoded exactly as written, and only empty fields are NULL, as with
+    COPY (FORMAT csv).
+    """
+    if table_format(filepath) == "csv":
+        csv_kwargs = {"dtype": str, "keep_default_na": False, "na_values": [""]}
+    else:
+        csv_kwargs = {}
+    for chunk in iter_frames(filepath, chunksize, **csv_kwargs):
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        yield from chunk.itertuples(index=False, name=None)
+
+
+def copy_binary(conn, filepath, table_name, columns, encoders):
+    """COPY a prepared table file in PostgreSQL binary format, one encoder per
+    column. Rows are read and encoded while the server reads them. Returns the
+    number of rows copied (does not commit).
+    """
+    copy_sql = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT binary)").format(
+        sql.Identifier(table_name),
+        sql.SQL(", ").join(map(sql.Identifier, columns)),
+    )
+    stream = BinaryCopyStream(binary_rows(filepath), encoders)
+    with conn.cursor() as cur:
+        cur.copy_expert(copy_sql.as_string(conn), stream, size=COPY_BUFFER_SIZE)
+        return cur.rowcount
+
+
+def import_csv_psycopg2(
+    conn, csv_file, table_name, manifest=None, into=None, rejected=None
+):
+    """Import a prepared table using PostgreSQL COPY command (fastest method).
+    CSV files are streamed straight from disk; Parquet tables go through pandas.
+    Binary COPY reads either in chunks of BINARY_CHUNK_SIZE rows.
+    into: load into this table instead (e.g. a staging table)
+    rejected: list that receives the rows the fallback could not insert, as (row, error)
+    """
+    filepath = find_table(os.path.join(INPUT_DIR, csv_file))
+    target = into or table_name
+
+    if filepath is None:
+        print(f"  SKIP: {csv_file} not found")
+        return 0
+
+    encoders = None
+    if IMPORT_COPY_FORMAT == "binary":
+        # Types come from the live table's schema, also when loading a stage
+        columns = table_columns(filepath)
+        encoders = binary_encoders(table_name, columns)
 
+    try:
+        if encoders:
+            rows = copy_binary(conn, filepath, target, columns, encoders)
+        elif table_format(filepath) == "csv":
+            rows = copy_csv_file(conn, filepath, target)
+        else:
+            rows = copy_frame(conn, read_frame(filepath), target)
         conn.commit()
-        return len(df)
+        check_row_count(manifest, filepath, rows)
+        return rows
 
     except Exception as e:
         conn.rollback()
         print(f"  ERROR with COPY: {e}")
-        # Fall back to row-by-row insert
-        return import_csv_rowbyrow(conn, df, table_name, columns)
+        # Fall back to batched inserts that isolate the bad rows
+        df = read_frame(filepath)
+        return import_batches_bisect(
+            conn,
+            df,
+            target,
+            list(df.columns),
+            reject_name=table_name,
+            rejected=rejected,
+        )
 
 
-def import_csv_rowbyrow(conn, df, table_name, columns):
-    """Fallback: Import row by row (slower but more reliable)"""
-    print(f"  Falling back to row-by-row insert...")
+def upsert_table(conn, csv_file, table_name, manifest=None):
+    """Import a prepared table without emptying the live table.
+    The file is copied into an unlogged _stage_<table>, then one transaction
+    deletes rows that vanished from the file, inserts new rows and updates only
+    rows whose values differ. Rows are matched on id when the file has it, else on
+    the table's UNIQUE key; tables without a key are matched on whole-row hashes.
+    When rows of the file were rejected they are missing from the stage without
+    having vanished from the file: nothing is deleted then, and tables matched on
+    row hashes are left unchanged. Returns the number of rows staged.
+    """
+    filepath = find_table(os.path.join(INPUT_DIR, csv_file))
+    if filepath is None:
+        print(f"  SKIP: {csv_file} not found")
+        return 0
 
-    success_count = 0
-    error_count = 0
+    stage_name = f"{STAGE_PREFIX}{table_name}"
+    table = sql.Identifier(table_name)
+    stage = sql.Identifier(stage_name)
 
     with conn.cursor() as cur:
-        for idx, row in df.iterrows():
-            try:
-                # Build INSERT statement
-                placeholders = sql.SQL(", ").join(sql.Placeholder() * len(columns))
-                insert_sql = sql.SQL("INSERT INTO {} ({}) VALUES ({})").format(
-                    sql.Identifier(table_name),
-                    sql.SQL(", ").join(map(sql.Identifier, columns)),
-                    placeholders,
+        cur.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(stage))
+        # Same columns and NOT NULL checks as the live table; the defaults fill
+        # the ids of tables whose file has no id column
+        cur.execute(
+            sql.SQL("CREATE UNLOGGED TABLE {} (LIKE {} INCLUDING DEFAULTS)").format(
+                stage, table
+            )
+        )
+    conn.commit()
+
+    try:
+        rejected = []
+        rows = import_csv_psycopg2(
+            conn, csv_file, table_name, manifest, into=stage_name, rejected=rejected
+        )
+        if rows == 0:
+            # Never treat a failed or empty load as "every row vanished"
+            print(f"  {table_name}: nothing staged, table left unchanged")
+            return 0
+
+        columns = table_columns(filepath)
+        key = next(
+            (
+                key
+                for key in [["id"]] + unique_keys(table_name)
+                if set(key) <= set(columns)
+            ),
+            None,
+        )
+        if rejected and not key:
+            # A rejected row would show up as a delete of its live row
+            print(
+                f"  {table_name}: {len(rejected)} rows rejected, table left unchanged"
+            )
+            return 0
+
+        with conn.cursor() as cur:
+            if key:
+                deleted, inserted, updated = merge_on_key(
+                    cur, table, stage, columns, key, delete=not rejected
                 )
+            else:
+                deleted, inserted, updated = merge_on_row_hash(cur, table, stage, columns)
+            match = ", ".join(key) if key else "row hash"
+            note = ""
+            if rejected:
+                note = f" (delete skipped, {len(rejected)} rows rejected)"
+            print(
+                f"  {table_name} ({match}): {inserted} inserted, {updated} updated, "
+                f"{deleted} deleted{note}"
+            )
+        conn.commit()
+        return rows
 
-                # Convert row values, handling NaN
-                values = []
-                for col in columns:
-                    val = row[col]
-                    if pd.isna(val):
-                        values.append(None)
-                    else:
-                        values.append(val)
+    except Exception as e:
+        conn.rollback()
+        print(f"  ERROR applying {table_name}, table left unchanged: {e}")
+        return 0
 
-                cur.execute(insert_sql, values)
-                success_count += 1
+    finally:
+        with conn.cursor() as cur:
+            cur.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(stage))
+        conn.commit()
 
-            except Exception as e:
-                error_count += 1
-                if error_count <= 3:
-                    print(f"    Row {idx} error: {e}")
 
+def merge_on_key(cur, table, stage, columns, key, delete=True):
+    """Apply the staged rows to table matched on key columns.
+    delete=False keeps the rows that are not in the stage.
+    Returns (deleted, inserted, updated).
+    """
+    cols = sql.SQL(", ").join(map(sql.Identifier, columns))
+    values = [col for col in columns if col not in key]
+    key_match = sql.SQL(" AND ").join(
+        sql.SQL("s.{0} = t.{0}").format(sql.Identifier(col)) for col in key
+    )
+
+    deleted = 0
+    if delete:
+        cur.execute(
+            sql.SQL(
+                "DELETE FROM {} AS t WHERE NOT EXISTS (SELECT 1 FROM {} AS s WHERE {})"
+            ).format(table, stage, key_match)
+        )
+        deleted = cur.rowcount
+
+    if values:
+        on_conflict = sql.SQL("DO UPDATE SET {} WHERE ({}) IS DISTINCT FROM ({})").format(
+            sql.SQL(", ").join(
+                sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(col)) for col in values
+            ),
+            sql.SQL(", ").join(
+                sql.SQL("t.{}").format(sql.Identifier(col)) for col in values
+            ),
+            sql.SQL(", ").join(
+                sql.SQL("EXCLUDED.{}").format(sql.Identifier(col)) for col in values
+            ),
+        )
+    else:
+        on_conflict = sql.SQL("DO NOTHING")
+
+    # xmax is 0 for rows inserted by this statement, set for rows it updated
+    cur.execute(
+        sql.SQL(
+            "WITH changed AS ("
+            "INSERT INTO {table} AS t ({cols}) SELECT {cols} FROM {stage} "
+            "ON CONFLICT ({key}) {on_conflict} RETURNING (t.xmax = 0) AS inserted) "
+            "SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) "
+            "FROM changed"
+        ).format(
+            table=table,
+            cols=cols,
+            stage=stage,
+            key=sql.SQL(", ").join(map(sql.Identifier, key)),
+            on_conflict=on_conflict,
+        )
+    )
+    inserted, updated = cur.fetchone()
+    return deleted, inserted, updated
+
+
+def merge_on_row_hash(cur, table, stage, columns):
+    """Apply the staged rows to a table without a natural key: rows are matched on
+    a hash of all imported columns (repeated identical rows by their count).
+    Changed rows show up as a delete plus an insert. Returns (deleted, inserted, 0).
+    """
+    cols = sql.SQL(", ").join(map(sql.Identifier, columns))
+    row_hash = sql.SQL("md5(ROW({})::text)").format(cols)
+
+    cur.execute(
+        sql.SQL(
+            "DELETE FROM {table} WHERE id IN ("
+            "SELECT t.id FROM ("
+            "SELECT id, {row_hash} AS h, "
+            "row_number() OVER (PARTITION BY {row_hash} ORDER BY id) AS n FROM {table}"
+            ") AS t LEFT JOIN ("
+            "SELECT {row_hash} AS h, count(*) AS cnt FROM {stage} GROUP BY 1"
+            ") AS s ON s.h = t.h WHERE s.h IS NULL OR t.n > s.cnt)"
+        ).format(table=table, stage=stage, row_hash=row_hash)
+    )
+    deleted = cur.rowcount
+
+    cur.execute(
+        sql.SQL(
+            "INSERT INTO {table} ({cols}) SELECT {cols} FROM ("
+            "SELECT {cols}, {row_hash} AS h, "
+            "row_number() OVER (PARTITION BY {row_hash}) AS n FROM {stage}"
+            ") AS s LEFT JOIN ("
+            "SELECT {row_hash} AS h, count(*) AS cnt FROM {table} GROUP BY 1"
+            ") AS t ON t.h = s.h WHERE s.n > coalesce(t.cnt, 0)"
+        ).format(table=table, stage=stage, cols=cols, row_hash=row_hash)
+    )
+    return deleted, cur.rowcount, 0
+
+
+def table_columns(filepath):
+    """Column names of a prepared table file, without reading its rows"""
+    if table_format(filepath) == "csv":
+        with open(filepath, encoding="utf-8-sig", newline="") as f:
+            return next(csv.reader(f), [])
+    return require_pyarrow().parquet.read_schema(filepath).names
+
+
+def import_table_pooled(pool, csv_file, table_name, manifest=None, loader=None):
+    """Import one table on a connection borrowed from the pool, with loader
+    (import_csv_psycopg2 or upsert_table). Returns (rows, seconds, file bytes).
+    """
+    loader = loader or import_csv_psycopg2
+    filepath = find_table(os.path.join(INPUT_DIR, csv_file))
+    size = filepath.stat().st_size if filepath is not None else 0
+
+    conn = pool.getconn()
+    try:
+        start = time.perf_counter()
+        rows = loader(conn, csv_file, table_name, manifest)
+        return rows, time.perf_counter() - start, size
+    finally:
+        pool.putconn(conn)
+
+
+def import_tiers(pool, tiers, manifest=None, workers=IMPORT_WORKERS, loader=None):
+    """Import tier by tier; the tables of a tier run concurrently and the next
+    tier starts only when all of them are done. Returns the total row count.
+    """
+    total_rows = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for number, tier in enumerate(tiers, 1):
+            names = ", ".join(table for _, table in tier)
+            print(f"\n  Tier {number}/{len(tiers)}: {names}")
+            start = time.perf_counter()
+            futures = [
+                (
+                    table_name,
+                    executor.submit(
+                        import_table_pooled, pool, csv_file, table_name, manifest, loader
+                    ),
+                )
+                for csv_file, table_name in tier
+            ]
+            for table_name, future in futures:
+                rows, elapsed, size = future.result()
+                rate = rows / elapsed if elapsed else 0
+                mb_rate = size / 1024 / 1024 / elapsed if elapsed else 0
+                print(
+                    f"    [{table_name}] {rows} rows in {elapsed:.2f}s "
+                    f"({rate:,.0f} rows/s, {mb_rate:.1f} MB/s)"
+                )
+                total_rows += rows
+            print(f"    Tier {number} done in {time.perf_counter() - start:.2f}s")
+    return total_rows
+
+
+def error_text(e):
+    """One-line database error message, with its DETAIL when there is one"""
+    diag = getattr(e, "diag", None)
+    if diag is None or not diag.message_primary:
+        return str(e).strip().splitlines()[0]
+    if diag.message_detail:
+        return f"{diag.message_primary} ({diag.message_detail})"
+    return diag.message_primary
+
+
+def insert_bisect(cur, insert_sql, rows, rejects):
+    """INSERT rows with execute_values under a savepoint; when that fails, split
+    the rows in half and retry each half, down to single rows. Rows that fail on
+    their own are added to rejects as (row, error). Returns the rows inserted.
+    """
+    cur.execute("SAVEPOINT bisect")
+    try:
+        execute_values(cur, insert_sql, rows, page_size=len(rows))
+        cur.execute("RELEASE SAVEPOINT bisect")
+        return len(rows)
+    except Exception as e:
+        cur.execute("ROLLBACK TO SAVEPOINT bisect")
+        cur.execute("RELEASE SAVEPOINT bisect")
+        if len(rows) == 1:
+            rejects.append((rows[0], error_text(e)))
+            return 0
+
+    middle = len(rows) // 2
+    inserted = insert_bisect(cur, insert_sql, rows[:middle], rejects)
+    return inserted + insert_bisect(cur, insert_sql, rows[middle:], rejects)
+
+
+def import_batches_bisect(
+    conn, df, table_name, columns, reject_name=None, rejected=None
+):
+    """Fallback after a failed COPY: insert in batches of FALLBACK_BATCH_SIZE rows,
+    bisecting failed batches to isolate the bad rows. A few bad rows cost
+    O(k log n) statements instead of one per row; they are written with the
+    error text to rejects/<table>.csv in INPUT_DIR and, when given, added to
+    the rejected list as (row, error).
+    """
+    print("  Falling back to batched inserts...")
+
+    insert_sql = sql.SQL("INSERT INTO {} ({}) VALUES %s").format(
+        sql.Identifier(table_name),
+        sql.SQL(", ").join(map(sql.Identifier, columns)),
+    ).as_string(conn)
+
+    # Python values with None for nulls (numpy/categorical values are not adaptable)
+    values = df[columns].astype(object).where(pd.notnull(df[columns]), None)
+    rows = [tuple(row) for row in values.itertuples(index=False, name=None)]
+
+    success_count = 0
+    rejects = []
+    with conn.cursor() as cur:
+        for i in range(0, len(rows), FALLBACK_BATCH_SIZE):
+            batch = rows[i : i + FALLBACK_BATCH_SIZE]
+            success_count += insert_bisect(cur, insert_sql, batch, rejects)
     conn.commit()
 
-    if error_count > 0:
-        print(f"  Errors: {error_count}/{len(df)} rows failed")
+    if rejected is not None:
+        rejected.extend(rejects)
+    if rejects:
+        print(f"  Errors: {len(rejects)}/{len(df)} rows failed")
+        for _, error in rejects[:3]:
+            print(f"    {error[:120]}")
+        reject_dir = os.path.join(INPUT_DIR, REJECT_DIRNAME)
+        os.makedirs(reject_dir, exist_ok=True)
+        reject_path = os.path.join(reject_dir, f"{reject_name or table_name}.csv")
+        reject_df = pd.DataFrame([row for row, _ in rejects], columns=columns)
+        reject_df["error"] = [error for _, error in rejects]
+        reject_df.to_csv(reject_path, index=False, encoding="utf-8-sig")
+        print(f"  Rejected rows: {reject_path}")
 
     return success_count
 
 
-def import_with_supabase_py(client: Client, csv_file: str, table_name: str):
+def import_with_supabase_py(
+    client: Client, csv_file: str, table_name: str, manifest: dict = None
+):
     """Import using supabase-py (slower, but works without direct DB access)"""
-    filepath = os.path.join(INPUT_DIR, csv_file)
+    filepath = find_table(os.path.join(INPUT_DIR, csv_file))
 
-    if not os.path.exists(filepath):
+    if filepath is None:
         print(f"  SKIP: {csv_file} not found")
         return 0
 
-    df = pd.read_csv(filepath, encoding="utf-8-sig")
+    df = read_frame(filepath)
+    check_row_count(manifest, filepath, len(df))
 
     if len(df) == 0:
         print(f"  SKIP: {csv_file} is empty")
         return 0
 
-    # Convert to list of dicts
-    records = df.where(pd.notnull(df), None).to_dict(orient="records")
+    # Convert to list of dicts (as object first, so that nulls in categorical
+    # and float columns also become None)
+    records = df.astype(object).where(pd.notnull(df), None).to_dict(orient="records")
 
     # Insert in batches of 500
     batch_size = 500
@@ -208,11 +739,21 @@ def main():
     print("Supabase CSV Import")
     print("=" * 70)
 
+    manifest = load_manifest()
+    if check_manifest(manifest) and not IGNORE_MANIFEST:
+        print("\nERROR: tables do not match manifest.json, re-run prepare_import_csv.py")
+        print("  (or set IMPORT_IGNORE_MANIFEST=1 to import them anyway)")
+        sys.exit(1)
+
     if HAS_PSYCOPG2 and DB_PASSWORD:
         # Preferred: Direct PostgreSQL connection
         print("\nUsing PostgreSQL direct connection...")
 
-        conn = psycopg2.connect(
+        tiers = load_table_tiers()
+        workers = max(1, min(IMPORT_WORKERS, max(map(len, tiers))))
+        pool = ThreadedConnectionPool(
+            1,
+            workers,
             host=DB_HOST,
             port=DB_PORT,
             dbname=DB_NAME,
@@ -220,20 +761,28 @@ def main():
             password=DB_PASSWORD,
         )
 
-        # Clear existing data
-        clear_tables(conn)
-
-        # Import each table
-        print("\nImporting tables...")
-        total_rows = 0
-
-        for csv_file, table_name in IMPORT_ORDER:
-            print(f"\n  [{table_name}]")
-            rows = import_csv_psycopg2(conn, csv_file, table_name)
-            print(f"    Imported: {rows} rows")
-            total_rows += rows
-
-        conn.close()
+        try:
+            if IMPORT_MODE == "upsert":
+                loader = upsert_table
+            else:
+                # Clear existing data
+                loader = import_csv_psycopg2
+                conn = pool.getconn()
+                try:
+                    clear_tables(conn)
+                finally:
+                    pool.putconn(conn)
+
+            # Import tier by tier, the tables of a tier concurrently
+            print(
+                f"\nImporting tables ({IMPORT_MODE}, {len(tiers)} tiers, "
+                f"{workers} connections)..."
+            )
+            start = time.perf_counter()
+            total_rows = import_tiers(pool, tiers, manifest, workers, loader)
+            print(f"\n  Loaded in {time.perf_counter() - start:.2f}s")
+        finally:
+            pool.closeall()
 
     elif HAS_SUPABASE and SUPABASE_KEY:
         # Alternative: Supabase Python client
@@ -244,7 +793,7 @@ def main():
         total_rows = 0
         for csv_file, table_name in IMPORT_ORDER:
             print(f"\n  [{table_name}]")
-            rows = import_with_supabase_py(client, csv_file, table_name)
+            rows = import_with_supabase_py(client, csv_file, table_name, manifest)
             print(f"    Imported: {rows} rows")
             total_rows += rows
 
@@ -4,22 +4,288 @@ Supabase Import용 CSV 준비 스크립트
 - 중복 제거
 - 컬럼명 영문 변환
 - UTF-8 인코딩
+- --format parquet: Parquet 중간 파일로 저장 (import_to_supabase.py가 그대로 읽음)
+- manifest.json: 테이블별 행 수, 크기, 컬럼 체크섬, 단계별 소요 시간 (import_to_supabase.py가 확인)
 """
 
 import pandas as pd
 import numpy as np
+import argparse
+import hashlib
+import io
 import json
 import os
+import re
+import shutil
+import sys
+import time
+import uuid
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import redirect_stdout
 from datetime import datetime
+from pathlib import Path
+
+# Shared CSV/Parquet table I/O from migration/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "migration"))
+from table_io import FORMATS, FrameWriter, iter_frames, read_frame, write_frame
 
 # Input/Output directories
 INPUT_DIR = "csv_output/Data_prep"
 OUTPUT_DIR = "csv_output/supabase_import"
 
+# Output table format (csv or parquet), set from --format
+OUTPUT_FORMAT = "csv"
+
+# Namespace for ids derived from natural keys, so that unchanged entities
+# keep the same id across runs
+ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "riselab/labdoc")
+
+# Rows per chunk for the large stages (qc_specs, bom, english_specs),
+# set from --chunk-size; 0 reads each input table whole
+CHUNK_SIZE = 0
+
+# Per-run record of the tables written, read by import_to_supabase.py
+MANIFEST_FILENAME = "manifest.json"
+
+# Delta mode (--delta): per-table insert/update/delete files in DELTA_DIR,
+# compared against the key/hash snapshot in SNAPSHOT_DIR. Each run leaves its own
+# snapshot in PENDING_SNAPSHOT_DIR; --accept-delta makes it the new baseline once
+# the delta has been applied, so an unapplied delta is never lost.
+DELTA_MODE = False
+DELTA_DIR = f"{OUTPUT_DIR}/delta"
+SNAPSHOT_DIR = f"{OUTPUT_DIR}/.snapshot"
+PENDING_SNAPSHOT_DIR = f"{DELTA_DIR}/.snapshot"
+DELTA_SUMMARY_FILENAME = "summary.json"
+
+# Natural key of each output table. Rows whose key is not unique (e.g. repeated
+# test items) cannot be matched one to one; they go to <table>.duplicates instead.
+NATURAL_KEYS = {
+    "labdoc_products.csv": ["product_code"],
+    "labdoc_ingredients.csv": ["ingredient_code"],
+    "labdoc_product_bom.csv": ["product_code", "sequence_no"],
+    "labdoc_product_qc_specs.csv": ["product_code", "qc_type", "test_item"],
+    "labdoc_product_english_specs.csv": ["product_code", "test_item"],
+    "labdoc_product_work_specs.csv": ["product_code"],
+    "labdoc_product_subsidiary_materials.csv": ["product_code", "sequence_no"],
+    "labdoc_product_revisions.csv": ["product_code", "revision_no"],
+    "labdoc_fragrances.csv": ["id"],
+    "labdoc_allergens.csv": ["id"],
+    "labdoc_fragrance_allergens.csv": ["fragrance_id", "allergen_id"],
+    "labdoc_manufacturing_processes.csv": ["id"],
+    "labdoc_manufacturing_process_steps.csv": ["process_id", "step_num"],
+    "labdoc_ingredient_specs.csv": ["ingredient_code", "spec_item"],
+}
+
+# Tables written by the current stage (collected by run_stage)
+_written = []
+
 # Create output directory
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 
+def row_keys(df, key_columns):
+    """Natural key of each row as one string"""
+    keys = df[key_columns[0]].astype(str)
+    for col in key_columns[1:]:
+        keys = keys + "\x1f" + df[col].astype(str)
+    return keys
+
+
+def sorted_hashes(hashes, keys):
+    """Row hashes grouped by key, as a sorted tuple per key"""
+    return hashes.groupby(keys.values).agg(lambda group: tuple(sorted(group)))
+
+
+def write_delta(df, filename):
+    """Compare a prepared table with the baseline snapshot and write
+    <table>.insert / .update / .delete files to DELTA_DIR (deletes hold only the
+    key columns). Rows of keys that are not unique (now or in the baseline) are
+    left out of these and, where they changed, written to <table>.duplicates.
+    The snapshot of this run (keys and a hash of each row) goes to
+    PENDING_SNAPSHOT_DIR until --accept-delta. Returns the change counts.
+    """
+    key_columns = NATURAL_KEYS[filename]
+    stem = Path(filename).stem
+    keys = row_keys(df, key_columns)
+    hashes = pd.util.hash_pandas_object(df, index=False).astype(str)
+
+    snapshot_path = Path(SNAPSHOT_DIR) / f"{stem}.csv"
+    if snapshot_path.exists():
+        previous = pd.read_csv(
+            snapshot_path, dtype=str, keep_default_na=False, encoding="utf-8-sig"
+        )
+    else:
+        previous = pd.DataFrame(columns=key_columns + ["_row_hash"], dtype=str)
+    previous_keys = row_keys(previous, key_columns)
+    previous_hashes = previous["_row_hash"]
+
+    ambiguous_keys = set(keys[keys.duplicated()]) | set(
+        previous_keys[previous_keys.duplicated()]
+    )
+    ambiguous = keys.isin(ambiguous_keys)
+    previous_ambiguous = previous_keys.isin(ambiguous_keys)
+
+    # Unique keys: matched one to one
+    unique_hashes = pd.Series(
+        previous_hashes[~previous_ambiguous].values,
+        index=previous_keys[~previous_ambiguous].values,
+    )
+    inserted = ~ambiguous & ~keys.isin(previous_keys)
+    updated = ~ambiguous & keys.isin(unique_hashes.index)
+    updated &= keys.map(unique_hashes) != hashes
+    deleted = previous[~previous_keys.isin(keys)].drop_duplicates(key_columns)
+
+    # Non-unique keys: reported only when the key's set of rows changed
+    current_groups = sorted_hashes(hashes[ambiguous], keys[ambiguous])
+    previous_groups = sorted_hashes(
+        previous_hashes[previous_ambiguous], previous_keys[previous_ambiguous]
+    )
+    changed_keys = [
+        key
+        for key, group in current_groups.items()
+        if previous_groups.get(key) != group
+    ]
+    duplicates = ambiguous & keys.isin(changed_keys)
+
+    os.makedirs(DELTA_DIR, exist_ok=True)
+    write_frame(df[inserted], f"{DELTA_DIR}/{stem}.insert.csv", OUTPUT_FORMAT)
+    write_frame(df[updated], f"{DELTA_DIR}/{stem}.update.csv", OUTPUT_FORMAT)
+    write_frame(
+        deleted[key_columns].reset_index(drop=True),
+        f"{DELTA_DIR}/{stem}.delete.csv",
+        OUTPUT_FORMAT,
+    )
+    write_frame(df[duplicates], f"{DELTA_DIR}/{stem}.duplicates.csv", OUTPUT_FORMAT)
+
+    snapshot = df[key_columns].astype(str)
+    snapshot["_row_hash"] = hashes
+    os.makedirs(PENDING_SNAPSHOT_DIR, exist_ok=True)
+    snapshot.to_csv(
+        Path(PENDING_SNAPSHOT_DIR) / f"{stem}.csv", index=False, encoding="utf-8-sig"
+    )
+
+    return {
+        "baseline": not snapshot_path.exists(),
+        "insert": int(inserted.sum()),
+        "update": int(updated.sum()),
+        "delete": len(deleted),
+        "duplicate_keys": len(changed_keys),
+    }
+
+
+def accept_delta():
+    """Make the snapshots of the last --delta run the baseline for the next one.
+    Returns the tables accepted.
+    """
+    pending = sorted(Path(PENDING_SNAPSHOT_DIR).glob("*.csv"))
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    for path in pending:
+        os.replace(path, Path(SNAPSHOT_DIR) / path.name)
+    return [path.stem for path in pending]
+
+
+def read_input(filename, categories=()):
+    """Read a Data_prep table (.csv or .parquet, whichever was written last).
+    categories: repeated text columns to read as categoricals
+    """
+    df = read_frame(
+        f"{INPUT_DIR}/{filename}", dtype={col: "category" for col in categories}
+    )
+    for col in categories:
+        if not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    return df
+
+
+def write_output(df, filename):
+    """Write a prepared table in OUTPUT_FORMAT and record it for the manifest"""
+    path = write_frame(df, f"{OUTPUT_DIR}/{filename}", OUTPUT_FORMAT)
+    columns = {str(col): column_checksum(df[col]) for col in df.columns}
+    entry = output_entry(path, len(df), columns)
+    if DELTA_MODE:
+        entry["delta"] = write_delta(df, filename)
+    _written.append(entry)
+
+
+def column_checksum(series, digest=None):
+    """Order-sensitive checksum of a column's values (as written, before any re-read).
+    Pass the same hashlib digest for consecutive chunks of one column to checksum
+    them as a whole.
+    """
+    digest = digest or hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def output_entry(path, rows, columns):
+    """Manifest entry for a written table (columns: {name: checksum})"""
+    stat = os.stat(path)
+    return {
+        "file": path.name,
+        "format": OUTPUT_FORMAT,
+        "rows": rows,
+        "bytes": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "columns": columns,
+    }
+
+
+def drop_seen_rows(chunk, seen):
+    """Drop rows of a chunk seen earlier in it or in previous chunks.
+    seen is a sorted uint64 array of row fingerprints (8 bytes per distinct row).
+    Returns the remaining rows and the updated fingerprints.
+    """
+    fingerprints = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+    keep = ~pd.Series(fingerprints).duplicated().to_numpy()
+    if len(seen):
+        pos = np.minimum(np.searchsorted(seen, fingerprints), len(seen) - 1)
+        keep &= seen[pos] != fingerprints
+    # Both parts are sorted, so the stable (merge) sort is linear
+    seen = np.sort(
+        np.concatenate([seen, np.sort(fingerprints[keep])]), kind="stable"
+    )
+    return chunk[keep], seen
+
+
+def prepare_chunked(input_name, output_name, transform, dedup):
+    """Stream input_name in CHUNK_SIZE-row chunks through transform() and append
+    the results to output_name, so memory stays bounded by the chunk size.
+    Values are read as text, and with dedup, input rows that repeat an earlier
+    row (like DataFrame.drop_duplicates) are dropped by fingerprint.
+    """
+    rows_in = 0
+    rows_unique = 0
+    rows_out = 0
+    seen = np.empty(0, dtype=np.uint64)
+    digests = {}
+
+    started = False
+    with FrameWriter(f"{OUTPUT_DIR}/{output_name}", OUTPUT_FORMAT) as writer:
+        path = writer.path
+        for chunk in iter_frames(f"{INPUT_DIR}/{input_name}", CHUNK_SIZE, dtype=str):
+            rows_in += len(chunk)
+            if dedup:
+                chunk, seen = drop_seen_rows(chunk, seen)
+            rows_unique += len(chunk)
+
+            result = transform(chunk)
+            if started and result.empty:
+                continue
+            writer.write(result)
+            started = True
+            rows_out += len(result)
+            for col in result.columns:
+                column_checksum(result[col], digests.setdefault(str(col), hashlib.sha256()))
+
+    print(f"  Input: {rows_in} rows ({CHUNK_SIZE}-row chunks)")
+    if dedup:
+        print(f"  After dedup: {rows_unique} rows")
+    columns = {col: digest.hexdigest()[:16] for col, digest in digests.items()}
+    _written.append(output_entry(path, rows_out, columns))
+    print(f"  Output: {rows_out} rows")
+
+
 def clean_text(val):
     """Clean text values"""
     if pd.isna(val):
@@ -59,6 +325,135 @@ def parse_int(val):
         return None
 
 
+# Vectorized equivalents of clean_text / parse_date / parse_int.
+# Each returns the same values as series.apply(<scalar function>); values that
+# fall outside the fast path are passed to the scalar function unchanged
+# (checked on Data_prep by tests/test_prepare_normalizers.py).
+
+# parse_date formats in the order parse_date() tries them, with the exact
+# shapes handled by pd.to_datetime (ASCII digits only, no inner spaces)
+DATE_PATTERNS = [
+    ("%Y.%m.%d", r"[0-9]{4}\.[0-9]{1,2}\.[0-9]{1,2}"),
+    ("%Y-%m-%d", r"[0-9]{4}-[0-9]{1,2}-[0-9]{1,2}"),
+    ("%y.%m.%d", r"[0-9]{2}\.[0-9]{1,2}\.[0-9]{1,2}"),
+    ("%Y/%m/%d", r"[0-9]{4}/[0-9]{1,2}/[0-9]{1,2}"),
+]
+
+# The characters str.split()/str.strip() treat as whitespace (str.isspace()).
+# Spelled out because the pyarrow-backed string dtype has its own notion of \s
+# and strip.
+WHITESPACE = (
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680"
+    "\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a"
+    "\u2028\u2029\u202f\u205f\u3000"
+)
+WHITESPACE_RUN = "[{}]+".format(re.escape(WHITESPACE))
+
+# Plain decimal strings whose int(float(val)) cannot depend on float rounding
+INT_PATTERN = r"[+-]?[0-9]{1,9}(\.[0-9]{0,6})?"
+
+
+def _result_series(values, series):
+    """Wrap per-row results like Series.apply does (same index, name and dtype inference)"""
+    return pd.Series(values, index=series.index, name=series.name).infer_objects()
+
+
+def clean_text_series(series):
+    """Vectorized clean_text()"""
+    values = np.full(len(series), None, dtype=object)
+    present = series.notna().to_numpy()
+    text = series[present].astype(str)
+    text = text.str.replace(WHITESPACE_RUN, " ", regex=True).str.strip(" ")
+    cleaned = text.to_numpy(dtype=object)
+    cleaned[cleaned == ""] = None
+    values[present] = cleaned
+    return _result_series(values, series)
+
+
+def clean_category_series(series):
+    """clean_text_series() for columns with few distinct values (codes, test items).
+    Each distinct value is cleaned once and the result is a categorical, so repeated
+    values share one string and later dedup/merge passes compare integer codes.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        uniques = series.cat.categories.astype(str)
+    else:
+        # Factorize the text form, as clean_text() sees it (1.0 and True stay apart)
+        present = series.notna().to_numpy()
+        codes = np.full(len(series), -1, dtype=np.intp)
+        codes[present], uniques = pd.factorize(series[present].astype(str))
+
+    cleaned = clean_text_series(pd.Series(uniques, dtype=object))
+    cleaned_codes, categories = pd.factorize(cleaned)
+    codes = np.where(codes >= 0, cleaned_codes[codes] if len(uniques) else -1, -1)
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=categories),
+        index=series.index,
+        name=series.name,
+    )
+
+
+def parse_date_series(series):
+    """Vectorized parse_date()"""
+    values = np.full(len(series), None, dtype=object)
+    present = series.notna().to_numpy()
+    text = series[present].astype(str).str.strip(WHITESPACE)
+
+    dates = np.full(len(text), None, dtype=object)
+    resolved = np.zeros(len(text), dtype=bool)
+    for fmt, pattern in DATE_PATTERNS:
+        match = text.str.fullmatch(pattern).to_numpy(dtype=bool)
+        if not match.any():
+            continue
+        parsed = pd.to_datetime(text[match], format=fmt, errors="coerce")
+        # Years before 1000 are left to strptime/strftime
+        ok = (parsed.notna() & (parsed.dt.year >= 1000)).to_numpy()
+        rows = np.flatnonzero(match)[ok]
+        dates[rows] = parsed[ok].dt.strftime("%Y-%m-%d").to_numpy(dtype=object)
+        resolved[rows] = True
+
+    # Everything else (blanks, header text, invalid or out-of-range dates)
+    rest = ~resolved
+    dates[rest] = [parse_date(val) for val in text.to_numpy(dtype=object)[rest]]
+    values[present] = dates
+    return _result_series(values, series)
+
+
+def parse_int_series(series):
+    """Vectorized parse_int()"""
+    values = np.full(len(series), None, dtype=object)
+    present = series.notna().to_numpy()
+    raw = series[present]
+    ints = np.full(len(raw), None, dtype=object)
+
+    if pd.api.types.is_numeric_dtype(raw) and not pd.api.types.is_bool_dtype(raw):
+        numbers = raw.to_numpy(dtype=float)
+    else:
+        match = raw.astype(str).str.fullmatch(INT_PATTERN).to_numpy(dtype=bool)
+        numbers = np.full(len(raw), np.nan)
+        numbers[match] = pd.to_numeric(
+            raw[match].astype(str), errors="coerce"
+        ).to_numpy(dtype=float)
+
+    # Exact for |x| < 2**53; everything else goes through parse_int()
+    fast = np.isfinite(numbers) & (np.abs(numbers) < 2**53)
+    ints[fast] = np.trunc(numbers[fast]).astype(np.int64).tolist()
+    rest = ~fast
+    ints[rest] = [parse_int(val) for val in raw.to_numpy(dtype=object)[rest]]
+    values[present] = ints
+    return _result_series(values, series)
+
+
+def natural_key_ids(entity, df, key_columns):
+    """UUIDv5 ids from the (already cleaned) natural key columns of each row"""
+    keys = df[key_columns].astype(object).where(df[key_columns].notna(), "")
+    return [
+        str(uuid.uuid5(ID_NAMESPACE, "\x1f".join([entity, *map(str, key)])))
+        for key in keys.itertuples(index=False, name=None)
+    ]
+
+
 def json_to_postgres_array(json_str):
     """Convert JSON array string to Postgres array literal"""
     if pd.isna(json_str) or json_str in ["[]", ""]:
@@ -78,7 +473,7 @@ def prepare_products():
     """Prepare 01_products_master.csv -> labdoc_products.csv"""
     print("\n[1/7] Preparing labdoc_products.csv...")
 
-    df = pd.read_csv(f"{INPUT_DIR}/01_products_master.csv", encoding="utf-8-sig")
+    df = read_input("01_products_master.csv")
     print(f"  Input: {len(df)} rows")
 
     # Remove duplicates by product_code (keep last)
@@ -88,39 +483,39 @@ def prepare_products():
     # Map columns
     result = pd.DataFrame(
         {
-            "product_code": df["제품코드"].apply(clean_text),
-            "management_code": df["관리번호"].apply(clean_text),
-            "korean_name": df["국문제품명"].apply(clean_text),
-            "english_name": df["영문제품명"].apply(clean_text),
-            "appearance": df["성상"].apply(clean_text),
-            "packaging_unit": df["포장단위"].apply(clean_text),
-            "created_date": df["작성일자"].apply(parse_date),
-            "author": df["작성자"].apply(clean_text),
-            "usage_instructions": df["사용법"].apply(clean_text),
-            "allergen_korean": df["Allergen국문"].apply(clean_text),
-            "allergen_english": df["Allergen영문"].apply(clean_text),
-            "storage_method": df["저장방법"].apply(clean_text),
-            "shelf_life": df["사용기한_x"].apply(clean_text),
-            "label_volume": df["표시\n용량"].apply(clean_text)
+            "product_code": clean_text_series(df["제품코드"]),
+            "management_code": clean_text_series(df["관리번호"]),
+            "korean_name": clean_text_series(df["국문제품명"]),
+            "english_name": clean_text_series(df["영문제품명"]),
+            "appearance": clean_text_series(df["성상"]),
+            "packaging_unit": clean_text_series(df["포장단위"]),
+            "created_date": parse_date_series(df["작성일자"]),
+            "author": clean_text_series(df["작성자"]),
+            "usage_instructions": clean_text_series(df["사용법"]),
+            "allergen_korean": clean_text_series(df["Allergen국문"]),
+            "allergen_english": clean_text_series(df["Allergen영문"]),
+            "storage_method": clean_text_series(df["저장방법"]),
+            "shelf_life": clean_text_series(df["사용기한_x"]),
+            "label_volume": clean_text_series(df["표시\n용량"])
             if "표시\n용량" in df.columns
             else None,
-            "fill_volume": df["충진\n용량\n()"].apply(clean_text)
+            "fill_volume": clean_text_series(df["충진\n용량\n()"])
             if "충진\n용량\n()" in df.columns
             else None,
             "specific_gravity": pd.to_numeric(df["비중"], errors="coerce"),
-            "ph_standard": df["pH기준"].apply(clean_text),
-            "viscosity_standard": df["점,경도기준"].apply(clean_text),
-            "raw_material_report": df["원료목록보고"].apply(parse_int),
-            "standardized_name": df["표준화\n명칭적용"].apply(parse_int)
+            "ph_standard": clean_text_series(df["pH기준"]),
+            "viscosity_standard": clean_text_series(df["점,경도기준"]),
+            "raw_material_report": parse_int_series(df["원료목록보고"]),
+            "standardized_name": parse_int_series(df["표준화\n명칭적용"])
             if "표준화\n명칭적용" in df.columns
             else None,
-            "responsible_seller": df["책임판매업적용"].apply(parse_int),
-            "recycling_grade": df["재활용등급표시"].apply(clean_text),
-            "label_position": df["라벨부착위치"].apply(clean_text),
-            "functional_claim": df["기능성"].apply(clean_text),
-            "semi_product_code": df["semi_product_code"].apply(clean_text),
-            "p_product_code": df["p_product_code"].apply(clean_text),
-            "source_file": df["원본파일"].apply(clean_text),
+            "responsible_seller": parse_int_series(df["책임판매업적용"]),
+            "recycling_grade": clean_text_series(df["재활용등급표시"]),
+            "label_position": clean_text_series(df["라벨부착위치"]),
+            "functional_claim": clean_text_series(df["기능성"]),
+            "semi_product_code": clean_text_series(df["semi_product_code"]),
+            "p_product_code": clean_text_series(df["p_product_code"]),
+            "source_file": clean_text_series(df["원본파일"]),
         }
     )
 
@@ -133,9 +528,7 @@ def prepare_products():
         if col in result.columns:
             result[col] = result[col].astype("Int64")
 
-    result.to_csv(
-        f"{OUTPUT_DIR}/labdoc_products.csv", index=False, encoding="utf-8-sig"
-    )
+    write_output(result, "labdoc_products.csv")
     print(f"  Output: {len(result)} rows")
     return result
 
@@ -145,13 +538,11 @@ def prepare_ingredients():
     print("\n[2/7] Preparing labdoc_ingredients.csv...")
 
     # Load ingredient master
-    df = pd.read_csv(f"{INPUT_DIR}/11_ingredients_master.csv", encoding="utf-8-sig")
+    df = read_input("11_ingredients_master.csv")
     print(f"  Master: {len(df)} rows")
 
     # Load document URLs
-    docs = pd.read_csv(
-        f"{INPUT_DIR}/ingredient_files_uploaded_summary.csv", encoding="utf-8-sig"
-    )
+    docs = read_input("ingredient_files_uploaded_summary.csv")
     print(f"  Docs: {len(docs)} rows")
 
     # Merge
@@ -160,12 +551,12 @@ def prepare_ingredients():
     # Map columns
     result = pd.DataFrame(
         {
-            "ingredient_code": df["ingredient_code"].apply(clean_text),
-            "ingredient_name": df["ingredient_name"].apply(clean_text),
-            "manufacturer": df["manufacturer"].apply(clean_text),
-            "origin_country": df["origin_country"].apply(clean_text),
-            "purchase_type": df["purchase_type"].apply(clean_text),
-            "purchase_method": df["purchase_method"].apply(clean_text),
+            "ingredient_code": clean_text_series(df["ingredient_code"]),
+            "ingredient_name": clean_text_series(df["ingredient_name"]),
+            "manufacturer": clean_text_series(df["manufacturer"]),
+            "origin_country": clean_text_series(df["origin_country"]),
+            "purchase_type": clean_text_series(df["purchase_type"]),
+            "purchase_method": clean_text_series(df["purchase_method"]),
             "coa_urls": df["coa_urls"].apply(json_to_postgres_array)
             if "coa_urls" in df.columns
             else "{}",
@@ -181,25 +572,25 @@ def prepare_ingredients():
         }
     )
 
-    result.to_csv(
-        f"{OUTPUT_DIR}/labdoc_ingredients.csv", index=False, encoding="utf-8-sig"
-    )
+    write_output(result, "labdoc_ingredients.csv")
     print(f"  Output: {len(result)} rows")
     return result
 
 
-def prepare_bom():
-    """Prepare 02_products_bom.csv -> labdoc_product_bom.csv"""
-    print("\n[3/7] Preparing labdoc_product_bom.csv...")
+# Repeated text columns of the large inputs, kept as categoricals from read to write
+BOM_CATEGORIES = ["제품코드", "원료코드"]
+QC_SPEC_CATEGORIES = ["제품코드", "QC유형", "항목", "시험기준", "시험방법"]
+ENGLISH_SPEC_CATEGORIES = ["관리번호", "제품명", "품목코드", "TEST", "SPECIFICATION", "RESULT"]
+INGREDIENT_SPEC_CATEGORIES = ["ingredient_code", "ingredient_name", "spec_item", "test_method"]
 
-    df = pd.read_csv(f"{INPUT_DIR}/02_products_bom.csv", encoding="utf-8-sig")
-    print(f"  Input: {len(df)} rows")
 
+def bom_rows(df):
+    """02_products_bom rows -> labdoc_product_bom rows"""
     result = pd.DataFrame(
         {
-            "product_code": df["제품코드"].apply(clean_text),
-            "sequence_no": df["순번"].apply(parse_int),
-            "ingredient_code": df["원료코드"].apply(clean_text),
+            "product_code": clean_category_series(df["제품코드"]),
+            "sequence_no": parse_int_series(df["순번"]),
+            "ingredient_code": clean_category_series(df["원료코드"]),
             "content_ratio": pd.to_numeric(df["함량"], errors="coerce"),
         }
     )
@@ -209,75 +600,113 @@ def prepare_bom():
 
     # Convert INT columns to nullable integer
     result["sequence_no"] = result["sequence_no"].astype("Int64")
+    return result
 
-    result.to_csv(
-        f"{OUTPUT_DIR}/labdoc_product_bom.csv", index=False, encoding="utf-8-sig"
-    )
+
+def prepare_bom():
+    """Prepare 02_products_bom.csv -> labdoc_product_bom.csv"""
+    print("\n[3/7] Preparing labdoc_product_bom.csv...")
+
+    if CHUNK_SIZE:
+        prepare_chunked(
+            "02_products_bom.csv", "labdoc_product_bom.csv", bom_rows, dedup=False
+        )
+        return None
+
+    df = read_input("02_products_bom.csv", BOM_CATEGORIES)
+    print(f"  Input: {len(df)} rows")
+
+    result = bom_rows(df)
+
+    write_output(result, "labdoc_product_bom.csv")
     print(f"  Output: {len(result)} rows")
     return result
 
 
+def qc_spec_rows(df):
+    """03_products_qc_specs rows (already de-duplicated) -> labdoc_product_qc_specs rows"""
+    result = pd.DataFrame(
+        {
+            "product_code": clean_category_series(df["제품코드"]),
+            "qc_type": clean_category_series(df["QC유형"]),
+            "sequence_no": parse_int_series(df["순번"]),
+            "test_item": clean_category_series(df["항목"]),
+            "specification": clean_category_series(df["시험기준"]),
+            "test_method": clean_category_series(df["시험방법"]),
+        }
+    )
+
+    result = result[result["product_code"].notna() & result["test_item"].notna()]
+
+    # Convert INT columns to nullable integer
+    result["sequence_no"] = result["sequence_no"].astype("Int64")
+    return result
+
+
 def prepare_qc_specs():
     """Prepare 03_products_qc_specs.csv -> labdoc_product_qc_specs.csv"""
     print("\n[4/7] Preparing labdoc_product_qc_specs.csv...")
 
-    df = pd.read_csv(f"{INPUT_DIR}/03_products_qc_specs.csv", encoding="utf-8-sig")
+    if CHUNK_SIZE:
+        prepare_chunked(
+            "03_products_qc_specs.csv",
+            "labdoc_product_qc_specs.csv",
+            qc_spec_rows,
+            dedup=True,
+        )
+        return None
+
+    df = read_input("03_products_qc_specs.csv", QC_SPEC_CATEGORIES)
     print(f"  Input: {len(df)} rows")
 
     # Remove duplicates
     df = df.drop_duplicates()
     print(f"  After dedup: {len(df)} rows")
 
+    result = qc_spec_rows(df)
+
+    write_output(result, "labdoc_product_qc_specs.csv")
+    print(f"  Output: {len(result)} rows")
+    return result
+
+
+def english_spec_rows(df):
+    """04_products_english_specs rows (already de-duplicated) -> labdoc_product_english_specs rows"""
     result = pd.DataFrame(
         {
-            "product_code": df["제품코드"].apply(clean_text),
-            "qc_type": df["QC유형"].apply(clean_text),
-            "sequence_no": df["순번"].apply(parse_int),
-            "test_item": df["항목"].apply(clean_text),
-            "specification": df["시험기준"].apply(clean_text),
-            "test_method": df["시험방법"].apply(clean_text),
+            "management_code": clean_category_series(df["관리번호"]),
+            "product_name": clean_category_series(df["제품명"]),
+            "product_code": clean_category_series(df["품목코드"]),
+            "test_item": clean_category_series(df["TEST"]),
+            "specification": clean_category_series(df["SPECIFICATION"]),
+            "result": clean_category_series(df["RESULT"]),
         }
     )
 
-    result = result[result["product_code"].notna() & result["test_item"].notna()]
-
-    # Convert INT columns to nullable integer
-    result["sequence_no"] = result["sequence_no"].astype("Int64")
-
-    result.to_csv(
-        f"{OUTPUT_DIR}/labdoc_product_qc_specs.csv", index=False, encoding="utf-8-sig"
-    )
-    print(f"  Output: {len(result)} rows")
-    return result
+    return result[result["management_code"].notna() & result["test_item"].notna()]
 
 
 def prepare_english_specs():
     """Prepare 04_products_english_specs.csv -> labdoc_product_english_specs.csv"""
     print("\n[5/7] Preparing labdoc_product_english_specs.csv...")
 
-    df = pd.read_csv(f"{INPUT_DIR}/04_products_english_specs.csv", encoding="utf-8-sig")
+    if CHUNK_SIZE:
+        prepare_chunked(
+            "04_products_english_specs.csv",
+            "labdoc_product_english_specs.csv",
+            english_spec_rows,
+            dedup=True,
+        )
+        return None
+
+    df = read_input("04_products_english_specs.csv", ENGLISH_SPEC_CATEGORIES)
     print(f"  Input: {len(df)} rows")
 
     df = df.drop_duplicates()
 
-    result = pd.DataFrame(
-        {
-            "management_code": df["관리번호"].apply(clean_text),
-            "product_name": df["제품명"].apply(clean_text),
-            "product_code": df["품목코드"].apply(clean_text),
-            "test_item": df["TEST"].apply(clean_text),
-            "specification": df["SPECIFICATION"].apply(clean_text),
-            "result": df["RESULT"].apply(clean_text),
-        }
-    )
+    result = english_spec_rows(df)
 
-    result = result[result["management_code"].notna() & result["test_item"].notna()]
-
-    result.to_csv(
-        f"{OUTPUT_DIR}/labdoc_product_english_specs.csv",
-        index=False,
-        encoding="utf-8-sig",
-    )
+    write_output(result, "labdoc_product_english_specs.csv")
     print(f"  Output: {len(result)} rows")
     return result
 
@@ -286,31 +715,29 @@ def prepare_work_specs():
     """Prepare 07_products_work_specs.csv -> labdoc_product_work_specs.csv"""
     print("\n[6/7] Preparing labdoc_product_work_specs.csv...")
 
-    df = pd.read_csv(f"{INPUT_DIR}/07_products_work_specs.csv", encoding="utf-8-sig")
+    df = read_input("07_products_work_specs.csv")
     print(f"  Input: {len(df)} rows")
 
     result = pd.DataFrame(
         {
-            "management_code": df["관리번호"].apply(clean_text),
-            "product_code": df["제품코드"].apply(clean_text),
-            "product_name": df["제품명"].apply(clean_text),
-            "contents_notes": df["내용물관련사항"].apply(clean_text),
-            "production_cautions": df["생산시주의사항"].apply(clean_text)
+            "management_code": clean_text_series(df["관리번호"]),
+            "product_code": clean_text_series(df["제품코드"]),
+            "product_name": clean_text_series(df["제품명"]),
+            "contents_notes": clean_text_series(df["내용물관련사항"]),
+            "production_cautions": clean_text_series(df["생산시주의사항"])
             if "생산시주의사항" in df.columns
             else None,
-            "label_volume": df["표시용량"].apply(clean_text),
-            "fill_volume": df["충진용량"].apply(clean_text),
-            "color": df["색상"].apply(clean_text),
-            "remarks": df["비고"].apply(clean_text),
-            "source_filename": df["파일명"].apply(clean_text),
+            "label_volume": clean_text_series(df["표시용량"]),
+            "fill_volume": clean_text_series(df["충진용량"]),
+            "color": clean_text_series(df["색상"]),
+            "remarks": clean_text_series(df["비고"]),
+            "source_filename": clean_text_series(df["파일명"]),
         }
     )
 
     result = result[result["product_code"].notna()]
 
-    result.to_csv(
-        f"{OUTPUT_DIR}/labdoc_product_work_specs.csv", index=False, encoding="utf-8-sig"
-    )
+    write_output(result, "labdoc_product_work_specs.csv")
     print(f"  Output: {len(result)} rows")
     return result
 
@@ -319,9 +746,7 @@ def prepare_subsidiary_materials():
     """Prepare 08_products_subsidiary_materials.csv with fill-down"""
     print("\n[7/7] Preparing labdoc_product_subsidiary_materials.csv...")
 
-    df = pd.read_csv(
-        f"{INPUT_DIR}/08_products_subsidiary_materials.csv", encoding="utf-8-sig"
-    )
+    df = read_input("08_products_subsidiary_materials.csv")
     print(f"  Input: {len(df)} rows")
 
     # Fill down blank 관리번호 and 제품코드
@@ -333,11 +758,11 @@ def prepare_subsidiary_materials():
 
     result = pd.DataFrame(
         {
-            "management_code": df["관리번호"].apply(clean_text),
-            "product_code": df["제품코드"].apply(clean_text),
-            "material_name": df["부자재명"].apply(clean_text),
-            "material_spec": df["부자재사양"].apply(clean_text),
-            "vendor": df["업체"].apply(clean_text),
+            "management_code": clean_text_series(df["관리번호"]),
+            "product_code": clean_text_series(df["제품코드"]),
+            "material_name": clean_text_series(df["부자재명"]),
+            "material_spec": clean_text_series(df["부자재사양"]),
+            "vendor": clean_text_series(df["업체"]),
             "sequence_no": df["seq"],
         }
     )
@@ -347,11 +772,7 @@ def prepare_subsidiary_materials():
     # Convert INT columns to nullable integer
     result["sequence_no"] = result["sequence_no"].astype("Int64")
 
-    result.to_csv(
-        f"{OUTPUT_DIR}/labdoc_product_subsidiary_materials.csv",
-        index=False,
-        encoding="utf-8-sig",
-    )
+    write_output(result, "labdoc_product_subsidiary_materials.csv")
     print(f"  Output: {len(result)} rows")
     return result
 
@@ -362,7 +783,7 @@ def prepare_revisions():
     """
     print("\n[8/14] Preparing labdoc_product_revisions.csv...")
 
-    df = pd.read_csv(f"{INPUT_DIR}/05_products_revisions.csv", encoding="utf-8-sig")
+    df = read_input("05_products_revisions.csv")
     print(f"  Input: {len(df)} rows")
 
     # Filter out header rows
@@ -375,10 +796,10 @@ def prepare_revisions():
 
     result = pd.DataFrame(
         {
-            "product_code": df["제품코드"].apply(clean_text),
-            "revision_no": df["일련번호"].apply(parse_int),
-            "revision_date": df["개정년월일"].apply(parse_date),
-            "revision_content": df["개정사항"].apply(clean_text),
+            "product_code": clean_text_series(df["제품코드"]),
+            "revision_no": parse_int_series(df["일련번호"]),
+            "revision_date": parse_date_series(df["개정년월일"]),
+            "revision_content": clean_text_series(df["개정사항"]),
         }
     )
 
@@ -390,9 +811,7 @@ def prepare_revisions():
     # Convert INT columns to nullable integer
     result["revision_no"] = result["revision_no"].astype("Int64")
 
-    result.to_csv(
-        f"{OUTPUT_DIR}/labdoc_product_revisions.csv", index=False, encoding="utf-8-sig"
-    )
+    write_output(result, "labdoc_product_revisions.csv")
     print(f"  Output: {len(result)} rows")
     return result
 
@@ -405,7 +824,7 @@ def prepare_fragrances_allergens():
     """
     print("\n[9-11/14] Preparing fragrance/allergen tables...")
 
-    df = pd.read_csv(f"{INPUT_DIR}/06_allergens_master.csv", encoding="utf-8-sig")
+    df = read_input("06_allergens_master.csv")
     print(f"  Input: {len(df)} rows")
 
     # === 1. Extract unique fragrances ===
@@ -417,104 +836,102 @@ def prepare_fragrances_allergens():
     frag_cols = ["공급업체", "향료코드_filled", "향료명", "파일명"]
     frag_df = df[frag_cols].drop_duplicates(subset=["공급업체", "향료코드_filled"])
 
-    # Generate UUIDs for fragrances
-    import uuid
-
-    frag_df = frag_df.copy()
-    frag_df["id"] = [str(uuid.uuid4()) for _ in range(len(frag_df))]
-
     fragrances = pd.DataFrame(
         {
-            "id": frag_df["id"],
-            "supplier": frag_df["공급업체"].apply(clean_text),
-            "fragrance_code": frag_df["향료코드_filled"].apply(clean_text),
-            "fragrance_name": frag_df["향료명"].apply(clean_text),
-            "source_filename": frag_df["파일명"].apply(clean_text),
+            "supplier": clean_text_series(frag_df["공급업체"]),
+            "fragrance_code": clean_text_series(frag_df["향료코드_filled"]),
+            "fragrance_name": clean_text_series(frag_df["향료명"]),
+            "source_filename": clean_text_series(frag_df["파일명"]),
         }
     )
     fragrances = fragrances[fragrances["fragrance_code"].notna()]
-    fragrances.to_csv(
-        f"{OUTPUT_DIR}/labdoc_fragrances.csv", index=False, encoding="utf-8-sig"
+
+    # Stable ids from supplier + fragrance_code; rows whose raw keys only
+    # differed in whitespace now share an id, keep the last one
+    fragrances.insert(
+        0,
+        "id",
+        natural_key_ids("fragrance", fragrances, ["supplier", "fragrance_code"]),
     )
+    fragrances = fragrances.drop_duplicates(subset=["id"], keep="last")
+    write_output(fragrances, "labdoc_fragrances.csv")
     print(f"  Fragrances: {len(fragrances)} rows")
 
-    # Create fragrance lookup dict - use filtered fragrances, not frag_df!
-    frag_lookup = {}
-    for _, row in fragrances.iterrows():
-        key = (row["supplier"], row["fragrance_code"])
-        frag_lookup[key] = row["id"]
-
     # === 2. Extract unique allergens ===
     print("  Extracting allergens...")
     allerg_cols = ["알러젠명", "INCI명", "CAS번호"]
     allerg_df = df[allerg_cols].drop_duplicates()
 
-    # Generate UUIDs for allergens
-    allerg_df = allerg_df.copy()
-    allerg_df["id"] = [str(uuid.uuid4()) for _ in range(len(allerg_df))]
-
     allergens = pd.DataFrame(
         {
-            "id": allerg_df["id"],
-            "allergen_name": allerg_df["알러젠명"].apply(clean_text),
-            "inci_name": allerg_df["INCI명"].apply(clean_text),
-            "cas_no": allerg_df["CAS번호"].apply(clean_text),
+            "allergen_name": clean_text_series(allerg_df["알러젠명"]),
+            "inci_name": clean_text_series(allerg_df["INCI명"]),
+            "cas_no": clean_text_series(allerg_df["CAS번호"]),
         }
     )
     allergens = allergens[allergens["allergen_name"].notna()]
-    allergens.to_csv(
-        f"{OUTPUT_DIR}/labdoc_allergens.csv", index=False, encoding="utf-8-sig"
+
+    # Stable ids from allergen name + INCI name + CAS number
+    allergens.insert(
+        0,
+        "id",
+        natural_key_ids(
+            "allergen", allergens, ["allergen_name", "inci_name", "cas_no"]
+        ),
     )
+    allergens = allergens.drop_duplicates(subset=["id"], keep="last")
+    write_output(allergens, "labdoc_allergens.csv")
     print(f"  Allergens: {len(allergens)} rows")
 
-    # Create allergen lookup dict - use filtered allergens, not allerg_df!
-    allerg_lookup = {}
-    for _, row in allergens.iterrows():
-        key = (
-            row["allergen_name"],
-            row["inci_name"],
-            row["cas_no"],
-        )
-        allerg_lookup[key] = row["id"]
-
     # === 3. Create fragrance-allergen links ===
     print("  Creating fragrance-allergen links...")
-    links = []
-    for _, row in df.iterrows():
-        frag_key = (clean_text(row["공급업체"]), clean_text(row["향료코드_filled"]))
-        allerg_key = (
-            clean_text(row["알러젠명"]),
-            clean_text(row["INCI명"]),
-            clean_text(row["CAS번호"]),
-        )
+    frag_key = ["supplier", "fragrance_code"]
+    allerg_key = ["allergen_name", "inci_name", "cas_no"]
 
-        frag_id = frag_lookup.get(frag_key)
-        allerg_id = allerg_lookup.get(allerg_key)
-
-        if frag_id and allerg_id:
-            links.append(
-                {
-                    "fragrance_id": frag_id,
-                    "allergen_id": allerg_id,
-                    "content_in_fragrance": pd.to_numeric(
-                        row["향료중함량"], errors="coerce"
-                    ),
-                    "content_in_product": pd.to_numeric(
-                        row["제품중함량"], errors="coerce"
-                    ),
-                    "leave_on_label": clean_text(row["Leave-on라벨"]),
-                    "rinse_off_label": clean_text(row["Rinse-off라벨"]),
-                }
-            )
+    # Normalized keys and values for every input row (in input order)
+    links = pd.DataFrame(
+        {
+            "supplier": clean_text_series(df["공급업체"]),
+            "fragrance_code": clean_text_series(df["향료코드_filled"]),
+            "allergen_name": clean_text_series(df["알러젠명"]),
+            "inci_name": clean_text_series(df["INCI명"]),
+            "cas_no": clean_text_series(df["CAS번호"]),
+            "content_in_fragrance": pd.to_numeric(df["향료중함량"], errors="coerce"),
+            "content_in_product": pd.to_numeric(df["제품중함량"], errors="coerce"),
+            "leave_on_label": clean_text_series(df["Leave-on라벨"]),
+            "rinse_off_label": clean_text_series(df["Rinse-off라벨"]),
+        }
+    )
+
+    # Look up ids from the filtered tables (not frag_df/allerg_df). When two
+    # rows normalize to the same key, the later id wins.
+    frag_ids = fragrances.drop_duplicates(subset=frag_key, keep="last")
+    allerg_ids = allergens.drop_duplicates(subset=allerg_key, keep="last")
+    links = links.merge(
+        frag_ids[frag_key + ["id"]].rename(columns={"id": "fragrance_id"}),
+        on=frag_key,
+        how="left",
+    ).merge(
+        allerg_ids[allerg_key + ["id"]].rename(columns={"id": "allergen_id"}),
+        on=allerg_key,
+        how="left",
+    )
+    links = links[links["fragrance_id"].notna() & links["allergen_id"].notna()]
+
+    fa_df = links[
+        [
+            "fragrance_id",
+            "allergen_id",
+            "content_in_fragrance",
+            "content_in_product",
+            "leave_on_label",
+            "rinse_off_label",
+        ]
+    ]
 
-    fa_df = pd.DataFrame(links)
     # Remove duplicates (fragrance_id + allergen_id)
     fa_df = fa_df.drop_duplicates(subset=["fragrance_id", "allergen_id"], keep="last")
-    fa_df.to_csv(
-        f"{OUTPUT_DIR}/labdoc_fragrance_allergens.csv",
-        index=False,
-        encoding="utf-8-sig",
-    )
+    write_output(fa_df, "labdoc_fragrance_allergens.csv")
     print(f"  Fragrance-Allergens: {len(fa_df)} rows")
 
     return fragrances, allergens, fa_df
@@ -526,49 +943,45 @@ def prepare_manufacturing():
     - 10_manufacturing_process_steps.csv -> labdoc_manufacturing_process_steps.csv
     """
     print("\n[12-13/14] Preparing manufacturing process tables...")
-    import uuid
 
     # === 1. Manufacturing process headers ===
-    headers = pd.read_csv(
-        f"{INPUT_DIR}/09_manufacturing_process_headers.csv", encoding="utf-8-sig"
-    )
+    headers = read_input("09_manufacturing_process_headers.csv")
     print(f"  Headers input: {len(headers)} rows")
 
-    # Generate UUIDs
-    headers = headers.copy()
-    headers["id"] = [str(uuid.uuid4()) for _ in range(len(headers))]
-
     processes = pd.DataFrame(
         {
-            "id": headers["id"],
-            "product_code": headers["product_code"].apply(clean_text),
-            "source_filename": headers["filename"].apply(clean_text),
-            "product_name": headers["product_name"].apply(clean_text),
-            "batch_number": headers["batch_number"].apply(clean_text),
-            "batch_unit": headers["batch_unit"].apply(clean_text),
-            "dept_name": headers["dept_name"].apply(clean_text),
-            "actual_qty": headers["actual_qty"].apply(clean_text),
-            "mfg_date": headers["mfg_date"].apply(parse_date),
-            "operator": headers["operator"].apply(clean_text),
-            "approver_1": headers["approver_1"].apply(clean_text),
-            "approver_2": headers["approver_2"].apply(clean_text),
-            "approver_3": headers["approver_3"].apply(clean_text),
-            "notes_content": headers["notes_content"].apply(clean_text),
-            "total_time": headers["total_time"].apply(clean_text),
-            "special_notes": headers["special_notes"].apply(clean_text),
-            "step_count": headers["step_count"].apply(parse_int),
+            "product_code": clean_text_series(headers["product_code"]),
+            "source_filename": clean_text_series(headers["filename"]),
+            "product_name": clean_text_series(headers["product_name"]),
+            "batch_number": clean_text_series(headers["batch_number"]),
+            "batch_unit": clean_text_series(headers["batch_unit"]),
+            "dept_name": clean_text_series(headers["dept_name"]),
+            "actual_qty": clean_text_series(headers["actual_qty"]),
+            "mfg_date": parse_date_series(headers["mfg_date"]),
+            "operator": clean_text_series(headers["operator"]),
+            "approver_1": clean_text_series(headers["approver_1"]),
+            "approver_2": clean_text_series(headers["approver_2"]),
+            "approver_3": clean_text_series(headers["approver_3"]),
+            "notes_content": clean_text_series(headers["notes_content"]),
+            "total_time": clean_text_series(headers["total_time"]),
+            "special_notes": clean_text_series(headers["special_notes"]),
+            "step_count": parse_int_series(headers["step_count"]),
         }
     )
     processes = processes[processes["product_code"].notna()]
 
+    # Stable ids from product_code + source file
+    processes.insert(
+        0,
+        "id",
+        natural_key_ids("process", processes, ["product_code", "source_filename"]),
+    )
+    processes = processes.drop_duplicates(subset=["id"], keep="last")
+
     # Convert INT columns to nullable integer
     processes["step_count"] = processes["step_count"].astype("Int64")
 
-    processes.to_csv(
-        f"{OUTPUT_DIR}/labdoc_manufacturing_processes.csv",
-        index=False,
-        encoding="utf-8-sig",
-    )
+    write_output(processes, "labdoc_manufacturing_processes.csv")
     print(f"  Processes output: {len(processes)} rows")
 
     # Create lookup by product_code
@@ -577,17 +990,15 @@ def prepare_manufacturing():
         process_lookup[row["product_code"]] = row["id"]
 
     # === 2. Manufacturing process steps ===
-    steps_df = pd.read_csv(
-        f"{INPUT_DIR}/10_manufacturing_process_steps.csv", encoding="utf-8-sig"
-    )
+    steps_df = read_input("10_manufacturing_process_steps.csv")
     print(f"  Steps input: {len(steps_df)} rows")
 
     # Fill down product_code for steps that have blank product_code
     steps_df["product_code"] = steps_df["product_code"].ffill()
 
     # Map to process_id
-    steps_df["process_id"] = steps_df["product_code"].apply(
-        lambda x: process_lookup.get(clean_text(x))
+    steps_df["process_id"] = clean_text_series(steps_df["product_code"]).map(
+        process_lookup
     )
 
     # Only keep steps with valid process_id
@@ -596,12 +1007,12 @@ def prepare_manufacturing():
     steps = pd.DataFrame(
         {
             "process_id": steps_df["process_id"],
-            "step_num": steps_df["step_num"].apply(parse_int),
-            "step_type": steps_df["step_type"].apply(clean_text),
-            "step_name": steps_df["step_name"].apply(clean_text),
-            "step_desc": steps_df["step_desc"].apply(clean_text),
-            "work_time": steps_df["work_time"].apply(clean_text),
-            "checker": steps_df["checker"].apply(clean_text),
+            "step_num": parse_int_series(steps_df["step_num"]),
+            "step_type": clean_text_series(steps_df["step_type"]),
+            "step_name": clean_text_series(steps_df["step_name"]),
+            "step_desc": clean_text_series(steps_df["step_desc"]),
+            "work_time": clean_text_series(steps_df["work_time"]),
+            "checker": clean_text_series(steps_df["checker"]),
         }
     )
     steps = steps[steps["step_num"].notna()]
@@ -610,11 +1021,7 @@ def prepare_manufacturing():
     # Convert INT columns to nullable integer
     steps["step_num"] = steps["step_num"].astype("Int64")
 
-    steps.to_csv(
-        f"{OUTPUT_DIR}/labdoc_manufacturing_process_steps.csv",
-        index=False,
-        encoding="utf-8-sig",
-    )
+    write_output(steps, "labdoc_manufacturing_process_steps.csv")
     print(f"  Steps output: {len(steps)} rows")
 
     return processes, steps
@@ -624,69 +1031,404 @@ def prepare_ingredient_specs():
     """Prepare 12_ingredients_specs.csv -> labdoc_ingredient_specs.csv"""
     print("\n[14/14] Preparing labdoc_ingredient_specs.csv...")
 
-    df = pd.read_csv(f"{INPUT_DIR}/12_ingredients_specs.csv", encoding="utf-8-sig")
+    df = read_input("12_ingredients_specs.csv", INGREDIENT_SPEC_CATEGORIES)
     print(f"  Input: {len(df)} rows")
 
     result = pd.DataFrame(
         {
-            "ingredient_code": df["ingredient_code"].apply(clean_text),
-            "ingredient_name": df["ingredient_name"].apply(clean_text),
-            "spec_item": df["spec_item"].apply(clean_text),
-            "spec_standard": df["spec_standard"].apply(clean_text),
-            "result_value": df["result_value"].apply(clean_text),
-            "result_date": df["result_date"].apply(parse_date),
-            "test_method": df["test_method"].apply(clean_text),
-            "remarks": df["remarks"].apply(clean_text),
+            "ingredient_code": clean_category_series(df["ingredient_code"]),
+            "ingredient_name": clean_category_series(df["ingredient_name"]),
+            "spec_item": clean_category_series(df["spec_item"]),
+            "spec_standard": clean_text_series(df["spec_standard"]),
+            "result_value": clean_text_series(df["result_value"]),
+            "result_date": parse_date_series(df["result_date"]),
+            "test_method": clean_category_series(df["test_method"]),
+            "remarks": clean_text_series(df["remarks"]),
         }
     )
 
     result = result[result["ingredient_code"].notna() & result["spec_item"].notna()]
 
-    result.to_csv(
-        f"{OUTPUT_DIR}/labdoc_ingredient_specs.csv", index=False, encoding="utf-8-sig"
-    )
+    write_output(result, "labdoc_ingredient_specs.csv")
     print(f"  Output: {len(result)} rows")
     return result
 
 
+# Prepare stages as a small DAG. inputs are Data_prep tables, outputs are
+# labdoc tables; a stage waits for every stage that writes one of its inputs.
+Stage = namedtuple("Stage", ["name", "func", "inputs", "outputs"])
+
+STAGES = [
+    Stage(
+        "products",
+        prepare_products,
+        ["01_products_master.csv"],
+        ["labdoc_products.csv"],
+    ),
+    Stage(
+        "ingredients",
+        prepare_ingredients,
+        ["11_ingredients_master.csv", "ingredient_files_uploaded_summary.csv"],
+        ["labdoc_ingredients.csv"],
+    ),
+    Stage("bom", prepare_bom, ["02_products_bom.csv"], ["labdoc_product_bom.csv"]),
+    Stage(
+        "qc_specs",
+        prepare_qc_specs,
+        ["03_products_qc_specs.csv"],
+        ["labdoc_product_qc_specs.csv"],
+    ),
+    Stage(
+        "english_specs",
+        prepare_english_specs,
+        ["04_products_english_specs.csv"],
+        ["labdoc_product_english_specs.csv"],
+    ),
+    Stage(
+        "work_specs",
+        prepare_work_specs,
+        ["07_products_work_specs.csv"],
+        ["labdoc_product_work_specs.csv"],
+    ),
+    Stage(
+        "subsidiary_materials",
+        prepare_subsidiary_materials,
+        ["08_products_subsidiary_materials.csv"],
+        ["labdoc_product_subsidiary_materials.csv"],
+    ),
+    Stage(
+        "revisions",
+        prepare_revisions,
+        ["05_products_revisions.csv"],
+        ["labdoc_product_revisions.csv"],
+    ),
+    Stage(
+        "fragrances_allergens",
+        prepare_fragrances_allergens,
+        ["06_allergens_master.csv"],
+        [
+            "labdoc_fragrances.csv",
+            "labdoc_allergens.csv",
+            "labdoc_fragrance_allergens.csv",
+        ],
+    ),
+    Stage(
+        "manufacturing",
+        prepare_manufacturing,
+        [
+            "09_manufacturing_process_headers.csv",
+            "10_manufacturing_process_steps.csv",
+        ],
+        [
+            "labdoc_manufacturing_processes.csv",
+            "labdoc_manufacturing_process_steps.csv",
+        ],
+    ),
+    Stage(
+        "ingredient_specs",
+        prepare_ingredient_specs,
+        ["12_ingredients_specs.csv"],
+        ["labdoc_ingredient_specs.csv"],
+    ),
+]
+STAGE_NAMES = [stage.name for stage in STAGES]
+
+
+def stage_dependencies(name):
+    """Stages that write one of this stage's inputs"""
+    stage = STAGES[STAGE_NAMES.index(name)]
+    return [
+        other.name
+        for other in STAGES
+        if other.name != name and set(stage.inputs) & set(other.outputs)
+    ]
+
+
+def downstream_stages(name):
+    """This stage and every stage that depends on it, directly or through other
+    stages, following the input/output edges (not the order of STAGES)
+    """
+    selected = {name}
+    pending = [name]
+    while pending:
+        current = pending.pop()
+        for other in STAGE_NAMES:
+            if other not in selected and current in stage_dependencies(other):
+                selected.add(other)
+                pending.append(other)
+    return selected
+
+
+def select_stages(only=None, since=None):
+    """Stage names to run: --only names, or --since name and its downstream stages"""
+    if only:
+        return [name for name in STAGE_NAMES if name in only]
+    if since:
+        downstream = downstream_stages(since)
+        return [name for name in STAGE_NAMES if name in downstream]
+    return list(STAGE_NAMES)
+
+
+def run_stage(name, output_format, delta_mode=False, chunk_size=0):
+    """Run one stage (in a worker process).
+    Returns (elapsed seconds, printed log, manifest entries of the tables written).
+    """
+    global OUTPUT_FORMAT, DELTA_MODE, CHUNK_SIZE
+    OUTPUT_FORMAT = output_format
+    DELTA_MODE = delta_mode
+    CHUNK_SIZE = chunk_size
+    _written.clear()
+
+    log = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(log):
+        STAGES[STAGE_NAMES.index(name)].func()
+    return time.perf_counter() - start, log.getvalue(), list(_written)
+
+
+def run_stages(names, workers):
+    """Run the selected stages, each as soon as the stages it depends on are done.
+    Dependencies outside the selection are assumed to be up to date.
+    Returns {name: (elapsed seconds, manifest entries)} for stages that finished,
+    and the failed names.
+    """
+    pending = list(names)
+    timings = {}
+    failed = []
+
+    def finish(name, result=None, error=None):
+        if error is not None:
+            print(f"\n[{name}] FAILED: {error}")
+            failed.append(name)
+            return
+        elapsed, log, entries = result
+        print(log, end="")
+        timings[name] = (elapsed, entries)
+
+    def ready():
+        for name in list(pending):
+            deps = [dep for dep in stage_dependencies(name) if dep in names]
+            if any(dep in failed for dep in deps):
+                pending.remove(name)
+                finish(name, error="skipped, a stage it depends on failed")
+            elif all(dep in timings for dep in deps):
+                pending.remove(name)
+                yield name
+
+    if workers <= 1:
+        while pending:
+            batch = list(ready())
+            if not batch:
+                break
+            for name in batch:
+                try:
+                    finish(
+                        name, run_stage(name, OUTPUT_FORMAT, DELTA_MODE, CHUNK_SIZE)
+                    )
+                except Exception as e:
+                    finish(name, error=e)
+        return timings, failed
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        while pending or running:
+            for name in ready():
+                future = pool.submit(
+                    run_stage, name, OUTPUT_FORMAT, DELTA_MODE, CHUNK_SIZE
+                )
+                running[future] = name
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    finish(name, future.result())
+                except Exception as e:
+                    finish(name, error=e)
+    return timings, failed
+
+
+def update_manifest(timings):
+    """Merge the finished stages into OUTPUT_DIR/manifest.json and return it.
+    Entries of stages that did not run (--only/--since) are kept as they were.
+    """
+    path = Path(OUTPUT_DIR) / MANIFEST_FILENAME
+    manifest = {"stages": {}, "files": {}}
+    if path.exists():
+        try:
+            with open(path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except ValueError:
+            print(f"  Ignoring unreadable {path}")
+
+    now = datetime.now().isoformat(timespec="seconds")
+    for name, (elapsed, entries) in timings.items():
+        manifest["files"] = {
+            file: entry
+            for file, entry in manifest["files"].items()
+            if entry.get("stage") != name
+        }
+        manifest["stages"][name] = {
+            "elapsed": round(elapsed, 3),
+            "finished_at": now,
+            "outputs": [entry["file"] for entry in entries],
+        }
+        for entry in entries:
+            manifest["files"][entry["file"]] = {"stage": name, **entry}
+    manifest["generated_at"] = now
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def write_delta_summary(timings):
+    """Write DELTA_DIR/summary.json with the change counts of each table written"""
+    tables = {
+        entry["file"]: {"stage": name, **entry["delta"]}
+        for name, (_, entries) in timings.items()
+        for entry in entries
+    }
+    summary = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "format": OUTPUT_FORMAT,
+        "tables": tables,
+    }
+    with open(Path(DELTA_DIR) / DELTA_SUMMARY_FILENAME, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2, sort_keys=True)
+    return tables
+
+
 def main():
+    global OUTPUT_FORMAT, DELTA_MODE, CHUNK_SIZE
+
+    parser = argparse.ArgumentParser(description="Prepare Supabase import tables")
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="csv",
+        help="output format (parquet keeps column types, requires pyarrow)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="worker processes for the prepare stages (default: CPU count, 1 = in-process)",
+    )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="also write insert/update/delete files against the last accepted run to delta/",
+    )
+    parser.add_argument(
+        "--accept-delta",
+        action="store_true",
+        help="after applying delta/, make its snapshots the baseline for the next --delta",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=0,
+        help="stream qc_specs/bom/english_specs in chunks of this many rows (bounded memory)",
+    )
+    selector = parser.add_mutually_exclusive_group()
+    selector.add_argument(
+        "--only", nargs="+", choices=STAGE_NAMES, help="run only these stages"
+    )
+    selector.add_argument(
+        "--since",
+        choices=STAGE_NAMES,
+        help="run this stage and every stage that depends on its outputs",
+    )
+    args = parser.parse_args()
+    if args.accept_delta:
+        accepted = accept_delta()
+        if accepted:
+            print(f"Accepted delta snapshots: {', '.join(accepted)}")
+        else:
+            print(f"No delta snapshots to accept in {Path(PENDING_SNAPSHOT_DIR)}")
+        return
+    OUTPUT_FORMAT = args.format
+    DELTA_MODE = args.delta
+    CHUNK_SIZE = args.chunk_size
+    if CHUNK_SIZE and DELTA_MODE:
+        parser.error("--delta needs whole tables, it cannot be combined with --chunk-size")
+
     print("=" * 70)
     print("Supabase Import CSV Preparation")
     print("=" * 70)
+    print(f"Output format: {OUTPUT_FORMAT}")
+    if CHUNK_SIZE:
+        print(f"Chunked stages: qc_specs, bom, english_specs ({CHUNK_SIZE} rows per chunk)")
+
+    # Prepare all CSVs (14 tables); independent stages run in parallel
+    names = select_stages(args.only, args.since)
+    workers = min(args.workers or os.cpu_count() or 1, len(names))
+    print(f"Stages: {', '.join(names)} ({workers} worker(s))")
+
+    if DELTA_MODE:
+        unaccepted = len(list(Path(PENDING_SNAPSHOT_DIR).glob("*.csv")))
+        if unaccepted:
+            # The baseline did not move, so this run's delta still includes its changes
+            print(
+                f"Warning: the previous delta ({unaccepted} tables) was not accepted;"
+                " it is replaced by a delta against the last accepted snapshot"
+            )
+        # Only the tables written by this run get delta files
+        shutil.rmtree(DELTA_DIR, ignore_errors=True)
+        os.makedirs(DELTA_DIR)
 
-    # Prepare all CSVs (14 tables)
-    # Group 1: Basic product tables (1-7)
-    prepare_products()
-    prepare_ingredients()
-    prepare_bom()
-    prepare_qc_specs()
-    prepare_english_specs()
-    prepare_work_specs()
-    prepare_subsidiary_materials()
-
-    # Group 2: Remaining tables (8-14)
-    prepare_revisions()
-    prepare_fragrances_allergens()  # 9-11: fragrances, allergens, links
-    prepare_manufacturing()  # 12-13: processes, steps
-    prepare_ingredient_specs()
-
-    # List output files
+    start = time.perf_counter()
+    timings, failed = run_stages(names, workers)
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "=" * 70)
+    print("STAGE TIMES")
+    print("=" * 70)
+    for name in names:
+        status = f"{timings[name][0]:.2f}s" if name in timings else "FAILED"
+        print(f"  {name}: {status}")
+    print(f"  wall: {elapsed:.2f}s")
+
+    # Record what was written; failed stages keep their previous entries
+    manifest = update_manifest(timings)
+    if failed:
+        print(f"\nFailed stages: {', '.join(failed)}")
+        sys.exit(1)
+
+    # List output files (from the manifest, without re-reading them)
     print("\n" + "=" * 70)
     print("OUTPUT FILES")
     print("=" * 70)
 
     total_rows = 0
     total_size = 0
-    for f in sorted(os.listdir(OUTPUT_DIR)):
-        if f.endswith(".csv"):
-            path = os.path.join(OUTPUT_DIR, f)
-            size = os.path.getsize(path)
-            df = pd.read_csv(path, encoding="utf-8-sig")
-            print(f"  {f}: {len(df)} rows, {size / 1024:.1f} KB")
-            total_rows += len(df)
-            total_size += size
+    for f, entry in sorted(manifest["files"].items()):
+        print(f"  {f}: {entry['rows']} rows, {entry['bytes'] / 1024:.1f} KB")
+        total_rows += entry["rows"]
+        total_size += entry["bytes"]
 
     print(f"\nTOTAL: {total_rows} rows, {total_size / 1024:.1f} KB")
+    print(f"Manifest: {Path(OUTPUT_DIR) / MANIFEST_FILENAME}")
+
+    if DELTA_MODE:
+        print("\n" + "=" * 70)
+        print("DELTA (insert / update / delete)")
+        print("=" * 70)
+        tables = write_delta_summary(timings)
+        for f, delta in sorted(tables.items()):
+            note = " (no previous snapshot)" if delta["baseline"] else ""
+            if delta["duplicate_keys"]:
+                note += f" ({delta['duplicate_keys']} changed duplicate keys)"
+            print(
+                f"  {f}: {delta['insert']} / {delta['update']} / {delta['delete']}{note}"
+            )
+        changed = sum(d["insert"] + d["update"] + d["delete"] for d in tables.values())
+        print(f"\nTOTAL CHANGES: {changed} rows in {Path(DELTA_DIR)}")
+        print("After applying them, run with --accept-delta to move the baseline")
     print("\nDone! Files ready for Supabase import in:", OUTPUT_DIR)
 
 
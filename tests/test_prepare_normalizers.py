@@ -0,0 +1,87 @@
+"""
+The vectorized normalizers in scripts/prepare_import_csv.py must return exactly
+what the scalar clean_text / parse_date / parse_int functions return, on every
+column of the checked-in Data_prep tables and on values that exercise the scalar
+fallbacks.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "scripts"))
+
+import prepare_import_csv as prep  # noqa: E402
+
+NORMALIZERS = [
+    (prep.clean_text, prep.clean_text_series),
+    (prep.clean_text, prep.clean_category_series),
+    (prep.parse_date, prep.parse_date_series),
+    (prep.parse_int, prep.parse_int_series),
+]
+
+EDGE_CASES = [
+    None, "", "   ", " a \u3000 b\xa0", "a\x1cb\u2028c", "\u200bx", "일련번호", "개정년월일",
+    "2021.3.4", " 2021.03.04 ", "2021.02.30", "2021.13.01", "2021.1. 5", "0999.01.01",
+    "1500.01.01", "2300.12.31", "68.12.31", "69.01.01", "2021-1-5", "2021-01-05",
+    "2021/12/31", "２０２１.01.01", "21.5.6", "2021.05.06.", 1.0, 2.5, -0.5, -0.0,
+    0.1 + 0.2, 1e16, 1e20, float("inf"), float("nan"), True, 10**20, "1e3", "1_000",
+    "inf", "nan", " 7 ", "+3", "3.", ".5", "-0", "1234567890", "12345678901234567890",
+    "1.9999999", "１２", "\x1c2021.01.01\x1f", " 2021.01.01\u180e", "\u20282021-01-01",
+]  # fmt: skip
+
+
+@pytest.fixture(scope="module")
+def columns():
+    """(label, series) for the edge cases and every column of every Data_prep table"""
+    input_dir = REPO_ROOT / prep.INPUT_DIR
+    if not input_dir.is_dir():
+        pytest.skip(f"{prep.INPUT_DIR} not found")
+
+    cwd = os.getcwd()
+    os.chdir(REPO_ROOT)
+    try:
+        stems = sorted(
+            {Path(f).stem for f in os.listdir(input_dir) if f.endswith((".csv", ".parquet"))}
+        )
+        result = [("edge cases", pd.Series(EDGE_CASES, dtype=object))]
+        for stem in stems:
+            df = prep.read_input(stem)
+            result += [(f"{stem}:{col}", df[col]) for col in df.columns]
+    finally:
+        os.chdir(cwd)
+    return result
+
+
+def as_list(series):
+    return [None if pd.isna(val) else val for val in series]
+
+
+@pytest.mark.parametrize(
+    "scalar, vectorized",
+    NORMALIZERS,
+    ids=[vectorized.__name__ for _, vectorized in NORMALIZERS],
+)
+def test_vectorized_matches_scalar(columns, scalar, vectorized):
+    mismatches = []
+    for label, series in columns:
+        expected = as_list(series.apply(scalar))
+        actual = as_list(vectorized(series))
+        diffs = [
+            (val, exp, act)
+            for val, exp, act in zip(series, expected, actual)
+            if exp != act
+        ]
+        if diffs:
+            mismatches.append(f"{label}: {len(diffs)} values, e.g. {diffs[:3]!r}")
+    assert not mismatches, "\n".join(mismatches)
+
+
+def test_whitespace_matches_str_isspace():
+    expected = "".join(chr(c) for c in range(sys.maxunicode + 1) if chr(c).isspace())
+    assert prep.WHITESPACE == expected